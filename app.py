@@ -1,21 +1,35 @@
-from flask import Flask, request, render_template_string, send_file
+from flask import (
+    Flask, Response, request, render_template_string, send_file, jsonify, url_for,
+    stream_with_context
+)
 import os
+import json
 import logging
 from datetime import datetime, timedelta
-import zipfile
-import io
 
 from jd_handler import extract_keywords_from_jd
 from data_builder import create_candidates_df_with_ata
 from email_fetch import fetch_cvs_with_static_jd
+import metrics
+from jobs import JobQueue
+from ranking import paginate
+from results_store import ResultsStore, save_results
+from zip_downloads import (
+    list_folder_files, folder_etag, cached_archive_path, iter_zip_with_cache
+)
 from config import (
     CV_FOLDER, FILTERED_FOLDER,
     ATA_SCORE_THRESHOLD,
-    EMAIL_ADDRESS, EMAIL_PASSWORD
+    EMAIL_ADDRESS, EMAIL_PASSWORD,
+    SCREENING_JOB_WORKERS, SCREENING_JOB_HISTORY,
+    DOWNLOAD_CACHE_DIR, RESULTS_PAGE_SIZE, RUN_REPORT_DIR, RESULTS_DB_PATH,
+    RESULTS_API_MAX_LIMIT
 )
 
 app = Flask(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Screening runs in the background; requests only submit and poll
+job_queue = JobQueue(max_workers=SCREENING_JOB_WORKERS, history=SCREENING_JOB_HISTORY)
 
 TEMPLATE = """
 <!doctype html>
@@ -182,139 +196,543 @@ TEMPLATE = """
 
     {{ feedback|safe }}
 
-    {% if show_download %}
-    <div class=\"text-center\">
-      <a href=\"/download_filtered_cvs\" class=\"btn btn-success btn-download\">⬇️ Download Filtered CVs</a>
-      <a href=\"/download_all_cvs\" class=\"btn btn-secondary btn-download\">📥 Download All CVs</a>
-    </div>
+    {% if job_id %}
+    <div id=\"job-status\" class=\"alert alert-info mt-4\">⏳ Screening queued…</div>
+    <div id=\"job-results\"></div>
+    <template id=\"results-template\">
+      <form id=\"results-controls\" class=\"row g-2 align-items-end mt-4\">
+        <div class=\"col-auto\">
+          <select class=\"form-select form-select-sm\" name=\"sort\">
+            <option value=\"rank\">Rank</option>
+            <option value=\"ata_score\">ATA score</option>
+            <option value=\"ml_score\">ML score</option>
+            <option value=\"semantic_score\">Semantic score</option>
+            <option value=\"experience\">Experience</option>
+            <option value=\"name\">Name</option>
+          </select>
+        </div>
+        <div class=\"col-auto\">
+          <select class=\"form-select form-select-sm\" name=\"order\">
+            <option value=\"\">Default order</option>
+            <option value=\"desc\">Descending</option>
+            <option value=\"asc\">Ascending</option>
+          </select>
+        </div>
+        <div class=\"col-auto\">
+          <input class=\"form-control form-control-sm\" type=\"number\" name=\"min_score\" min=\"0\" max=\"100\" step=\"1\">
+        </div>
+        <div class=\"col-auto\">
+          <input class=\"form-control form-control-sm\" type=\"text\" name=\"skill\" placeholder=\"Skill, e.g. python\">
+        </div>
+        <div class=\"col-auto\">
+          <button type=\"submit\" class=\"btn btn-sm btn-light\">Apply</button>
+        </div>
+      </form>
+      <p id=\"results-info\" class=\"mt-3\"></p>
+      <div class=\"scroll-table\">
+        <table class=\"table table-bordered table-striped table-hover table-sm\">
+          <thead id=\"results-head\"></thead>
+          <tbody id=\"results-body\"></tbody>
+        </table>
+      </div>
+      <button type=\"button\" id=\"results-more\" class=\"btn btn-sm btn-outline-light\" hidden>Load more</button>
+      <div class=\"text-center\">
+        <a href=\"/download_filtered_cvs\" class=\"btn btn-success btn-download\">⬇️ Download Filtered CVs</a>
+        <a href=\"/download_all_cvs\" class=\"btn btn-secondary btn-download\">📥 Download All CVs</a>
+      </div>
+    </template>
+    <script>
+      (function () {
+        const jobId = "{{ job_id }}";
+        const statusBox = document.getElementById("job-status");
+        const resultsBox = document.getElementById("job-results");
+
+        function describe(job) {
+          const p = job.progress;
+          let text = "⏳ " + (job.stage || job.state) + " — fetched " + p.fetched +
+                     ", parsed " + p.parsed + "/" + p.total + ", scored " + p.scored;
+          if (job.eta_seconds !== null) {
+            text += " (about " + Math.ceil(job.eta_seconds) + "s left)";
+          }
+          return text;
+        }
+
+        function poll() {
+          fetch("/jobs/" + jobId)
+            .then(function (r) { return r.json(); })
+            .then(function (job) {
+              if (job.state === "done") {
+                statusBox.className = "alert alert-success mt-4";
+                statusBox.textContent = "✅ Screening complete.";
+                return showResults();
+              }
+              if (job.state === "failed") {
+                statusBox.className = "alert alert-danger mt-4";
+                statusBox.textContent = "❌ " + job.error;
+                return;
+              }
+              statusBox.textContent = describe(job);
+              setTimeout(poll, 2000);
+            })
+            .catch(function () { setTimeout(poll, 5000); });
+        }
+
+        // Results come one page at a time from the JSON API, sorted and
+        // filtered on the server; "Load more" appends the next page
+        const columns = ["rank", "name", "email", "ata_score", "ml_score", "semantic_score",
+                         "experience", "matched_keywords", "skills", "filename"];
+        const resultsUrl = "/runs/job-" + jobId + "/results";
+        let nextCursor = null;
+
+        function showFragment() {
+          return fetch("/jobs/" + jobId + "/result?format=html")
+            .then(function (r) { return r.text(); })
+            .then(function (html) { resultsBox.innerHTML = html; });
+        }
+
+        function query() {
+          const form = document.getElementById("results-controls");
+          const params = new URLSearchParams();
+          ["sort", "order", "min_score", "skill"].forEach(function (name) {
+            const value = form.elements[name].value.trim();
+            if (value) {
+              params.set(name, value);
+            }
+          });
+          return params;
+        }
+
+        function appendRows(rows) {
+          const body = document.getElementById("results-body");
+          rows.forEach(function (row) {
+            const tr = document.createElement("tr");
+            columns.forEach(function (name) {
+              const td = document.createElement("td");
+              td.textContent = row[name] === null ? "" : row[name];
+              tr.appendChild(td);
+            });
+            body.appendChild(tr);
+          });
+        }
+
+        function loadPage(reset) {
+          const params = query();
+          if (!reset && nextCursor) {
+            params.set("cursor", nextCursor);
+          }
+          return fetch(resultsUrl + "?" + params.toString())
+            .then(function (r) { return r.json(); })
+            .then(function (page) {
+              if (page.error) {
+                document.getElementById("results-info").textContent = "⚠️ " + page.error;
+                return;
+              }
+              if (reset) {
+                document.getElementById("results-body").innerHTML = "";
+              }
+              appendRows(page.candidates);
+              nextCursor = page.next_cursor;
+              const shown = document.getElementById("results-body").rows.length;
+              let info = "Showing " + shown + " of " + page.matching + " matching (top " +
+                         page.rows + " of " + page.total_candidates + " candidates";
+              info += page.below_cutoff ? ", " + page.below_cutoff + " below the cutoff not shown)" : ")";
+              document.getElementById("results-info").textContent = info;
+              document.getElementById("results-more").hidden = !nextCursor;
+            });
+        }
+
+        function showResults() {
+          return fetch(resultsUrl + "?limit=1").then(function (r) {
+            if (r.status === 404) {
+              return showFragment();  // Results store disabled
+            }
+            return r.json().then(function (first) {
+              resultsBox.innerHTML = document.getElementById("results-template").innerHTML;
+              const form = document.getElementById("results-controls");
+              form.elements["min_score"].placeholder = "≥ " + first.ata_score_threshold + " to filter";
+              document.getElementById("results-head").innerHTML =
+                "<tr>" + columns.map(function (name) { return "<th>" + name + "</th>"; }).join("") + "</tr>";
+              form.addEventListener("submit", function (event) {
+                event.preventDefault();
+                loadPage(true);
+              });
+              document.getElementById("results-more").addEventListener("click", function () {
+                loadPage(false);
+              });
+              return loadPage(true);
+            });
+          });
+        }
+
+        // Pager and view links inside the results load the next fragment in place
+        resultsBox.addEventListener("click", function (event) {
+          const link = event.target.closest("a[data-page-url]");
+          if (!link) {
+            return;
+          }
+          event.preventDefault();
+          fetch(link.dataset.pageUrl)
+            .then(function (r) { return r.text(); })
+            .then(function (html) { resultsBox.innerHTML = html; });
+        });
+
+        poll();
+      })();
+    </script>
     {% endif %}
   </div>
 </body>
 </html>
 """
 
-def fetch_and_screen_cvs(jd_keywords, ata_score):
+def fetch_and_screen_cvs(jd_keywords, ata_score, job=None, jd_text=None):
     since_date = (datetime.today() - timedelta(days=1)).strftime("%d-%b-%Y")
     logging.info("📥 Fetching CVs from email...")
-    fetch_cvs_with_static_jd(EMAIL_ADDRESS, EMAIL_PASSWORD, since_date=since_date)
+    if job:
+        job.update("fetching")
+    with metrics.stage("fetch"):
+        saved_files = fetch_cvs_with_static_jd(EMAIL_ADDRESS, EMAIL_PASSWORD, since_date=since_date)
     logging.info("✅ Email fetch complete.")
 
+    def progress(stage, done, total):
+        if job:
+            job.update("parsing" if stage == "parsed" else "scoring", **{stage: done, "total": total})
+
+    if job:
+        job.update("parsing", fetched=len(saved_files))
+
     logging.info("🧠 Screening CVs...")
     df = create_candidates_df_with_ata(
         cv_folder=CV_FOLDER,
         jd_keywords=jd_keywords,
         filtered_folder=FILTERED_FOLDER,
         ata_score_threshold=ata_score,
-        use_model=True
+        use_model=True,
+        jd_text=jd_text,
+        progress=progress
     )
     logging.info("✅ Screening complete.")
     return df
 
 
+def run_screening_job(job, jd_text, ata_score):
+    """
+    Background job body: JD keyword extraction, email fetch and screening.
+    The ranked table is also saved as run "job-<id>" in the results store,
+    so it outlives the job history.
+    """
+    with metrics.run(f"job-{job.id}"):
+        job.update("extracting_keywords")
+        with metrics.stage("jd_keywords"):
+            keywords = extract_keywords_from_jd(jd_text)
+        if not keywords:
+            raise ValueError("No useful keywords extracted. Check your JD content.")
+        df = fetch_and_screen_cvs(keywords, ata_score, job=job, jd_text=jd_text)
+        save_results(df, f"job-{job.id}", jd_text=jd_text, jd_keywords=keywords, ata_threshold=ata_score)
+        return df
+
+
+def _saved_job_result(job_id):
+    """
+    Returns (ranked table, ATA threshold) of a job saved in the results
+    store, or None (e.g. the job ran before a restart and left the history).
+    """
+    if not RESULTS_DB_PATH or not os.path.exists(RESULTS_DB_PATH):
+        return None
+    with ResultsStore(RESULTS_DB_PATH) as store:
+        run = store.get_run(f"job-{job_id}")
+        if run is None:
+            return None
+        df = store.load_run(run["run_id"])
+    ata_score = run["ata_threshold"] if run["ata_threshold"] is not None else ATA_SCORE_THRESHOLD
+    return df, ata_score
+
+
+def _parse_ata_score(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return ATA_SCORE_THRESHOLD
+
+
+def _page_links(job_id, view, info):
+    """
+    Prev/next links for one results table; the page script loads them in place.
+    """
+    def link(page, label):
+        href = url_for("job_result", job_id=job_id, format="html", view=view,
+                       page=page, per_page=info["per_page"])
+        return f"<a href='#' class='btn btn-sm btn-outline-light' data-page-url='{href}'>{label}</a>"
+
+    prev_link = link(info["page"] - 1, "← Prev") if info["page"] > 1 else ""
+    next_link = link(info["page"] + 1, "Next →") if info["page"] < info["pages"] else ""
+    return f"""
+    <div class='d-flex gap-2 align-items-center mt-2'>
+      {prev_link}<span>Page {info['page']} of {info['pages']} ({info['total']} rows)</span>{next_link}
+    </div>
+    """
+
+
+def render_results(df, ata_score, job_id=None, view="all", page=1, per_page=RESULTS_PAGE_SIZE):
+    """
+    Renders one page of the ranked results and the download buttons.
+
+    Args:
+        view (str): "all" for every kept candidate, "filtered" for those at or
+            above the ATA threshold
+        page (int): 1-based page of the selected view
+    """
+    if df.empty:
+        return "<div class='alert alert-warning mt-4'>⚠️ No candidates matched the given JD.</div>"
+
+    filtered_df = df[df["ata_score"] >= ata_score]
+    table_df = filtered_df if view == "filtered" else df
+    page_df, info = paginate(table_df, page, per_page)
+
+    table_style = """
+    <style>
+        .scroll-table { overflow-x: auto; white-space: nowrap; }
+        .scroll-table table {
+            table-layout: auto;
+            width: max-content;
+            min-width: 100%;
+        }
+        .scroll-table th, .scroll-table td {
+            white-space: nowrap;
+            vertical-align: middle;
+            font-size: 14px;
+            padding: 8px 16px;
+        }
+    </style>
+    """
+
+    below_cutoff = df.attrs.get("below_cutoff", 0)
+    summary = f"Top {len(df)} of {df.attrs.get('total_candidates', len(df))} candidates"
+    if below_cutoff:
+        summary += f" ({below_cutoff} below the cutoff not shown)"
+
+    def view_link(name, label):
+        href = url_for("job_result", job_id=job_id, format="html", view=name, page=1)
+        active = "btn-light" if name == view else "btn-outline-light"
+        return f"<a href='#' class='btn btn-sm {active}' data-page-url='{href}'>{label}</a>"
+
+    title = (f"✅ Filtered Candidates (ATA Score ≥ {ata_score}%):" if view == "filtered"
+             else "🟦 All Candidates:")
+    table_html = f"""
+    {table_style}
+    <div class='mt-4'>
+        <p>{summary}</p>
+        {view_link("all", f"🟦 All ({len(df)})")}
+        {view_link("filtered", f"✅ Filtered ({len(filtered_df)})")}
+    </div>
+    <div class='scroll-table mt-3'>
+        <h4>{title}</h4>
+        {page_df.to_html(classes='table table-bordered table-striped table-hover table-sm', index=False, escape=False)}
+    </div>
+    {_page_links(job_id, view, info) if job_id else ""}
+    """
+
+    download_html = """
+    <div class="text-center">
+      <a href="/download_filtered_cvs" class="btn btn-success btn-download">⬇️ Download Filtered CVs</a>
+      <a href="/download_all_cvs" class="btn btn-secondary btn-download">📥 Download All CVs</a>
+    </div>
+    """
+
+    return table_html + download_html
+
+
 @app.route('/', methods=['GET', 'POST'])
 def upload_jd():
     feedback = ""
-    show_download = False
+    job_id = None
 
     if request.method == 'POST':
         logging.info("📨 Form submitted from UI")
         jd_text = request.form.get('jd_text', '').strip()
-        ata_score_input = request.form.get('ata_score', '40').strip()
+        ata_score = _parse_ata_score(request.form.get('ata_score', '40').strip())
 
         if not jd_text:
             feedback = "<div class='alert alert-danger mt-4'>⚠️ Job Description cannot be empty.</div>"
-            return render_template_string(TEMPLATE, feedback=feedback, show_download=show_download)
-
-        try:
-            ata_score = float(ata_score_input)
-        except ValueError:
-            ata_score = ATA_SCORE_THRESHOLD
-
-        keywords = extract_keywords_from_jd(jd_text)
-        if not keywords:
-            feedback = "<div class='alert alert-danger mt-4'>❌ No useful keywords extracted. Check your JD content.</div>"
-            return render_template_string(TEMPLATE, feedback=feedback, show_download=show_download)
-
+        else:
+            job_id = job_queue.submit(run_screening_job, jd_text=jd_text, ata_score=ata_score).id
+
+    return render_template_string(TEMPLATE, feedback=feedback, job_id=job_id)
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """
+    JSON API: {"jd_text": str, "ata_score": float} → 202 with the job ID.
+    """
+    payload = request.get_json(silent=True) or request.form
+    jd_text = (payload.get("jd_text") or "").strip()
+    if not jd_text:
+        return jsonify({"error": "jd_text is required"}), 400
+
+    ata_score = _parse_ata_score(payload.get("ata_score", ATA_SCORE_THRESHOLD))
+    job = job_queue.submit(run_screening_job, jd_text=jd_text, ata_score=ata_score)
+    return jsonify({
+        "job_id": job.id,
+        "status_url": url_for("job_status", job_id=job.id),
+        "result_url": url_for("job_result", job_id=job.id),
+    }), 202
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    """
+    Ranked table of a finished job: JSON records, or the results HTML
+    fragment with ?format=html. ?page=N (and per_page) returns one page.
+    Jobs no longer in the history are served from the results store.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        saved = _saved_job_result(job_id)
+        if saved is None:
+            return jsonify({"error": "unknown job"}), 404
+        df, ata_score = saved
+    else:
+        status = job.to_dict()
+        if status["state"] != "done":
+            return jsonify(status), 409
+        df = job.result
+        ata_score = job.params["ata_score"]
+
+    page = request.args.get("page", type=int)
+    per_page = min(max(1, request.args.get("per_page", RESULTS_PAGE_SIZE, type=int)),
+                   RESULTS_API_MAX_LIMIT)
+    if request.args.get("format") == "html":
+        return render_results(df, ata_score, job_id=job_id, view=request.args.get("view", "all"),
+                              page=page or 1, per_page=per_page)
+
+    payload = {
+        "job_id": job_id,
+        "ata_score_threshold": ata_score,
+        "total_candidates": df.attrs.get("total_candidates", len(df)),
+        "below_cutoff": df.attrs.get("below_cutoff", 0),
+    }
+    if page:
+        df, payload["page_info"] = paginate(df, page, per_page)
+    payload["candidates"] = json.loads(df.to_json(orient="records"))
+    return jsonify(payload)
+
+
+@app.route("/runs/<run_id>/results")
+def run_results(run_id):
+    """
+    JSON API over a saved run ("job-<id>", a CLI run ID or "latest"): one
+    page of its ranked results, sorted and filtered on the server.
+
+    Query args: sort (see results_store.SORT_KEYS), order (asc/desc),
+    min_score/max_score (on `score`, default ata_score), skill, email,
+    limit and cursor (the previous page's next_cursor).
+    """
+    if not RESULTS_DB_PATH or not os.path.exists(RESULTS_DB_PATH):
+        return jsonify({"error": "results store is disabled or empty"}), 404
+
+    args = request.args
+    order = args.get("order", "").lower()
+    limit = min(max(1, args.get("limit", RESULTS_PAGE_SIZE, type=int)), RESULTS_API_MAX_LIMIT)
+    filters = {
+        "min_score": args.get("min_score", type=float),
+        "max_score": args.get("max_score", type=float),
+        "score": args.get("score", "ata_score"),
+        "skill": args.get("skill"),
+        "email": args.get("email"),
+    }
+    with ResultsStore(RESULTS_DB_PATH) as store:
+        run = store.get_run(run_id)
+        if run is None:
+            return jsonify({"error": "unknown run"}), 404
         try:
-            df = fetch_and_screen_cvs(keywords, ata_score)
-
-            if df.empty:
-                feedback = "<div class='alert alert-warning mt-4'>⚠️ No candidates matched the given JD.</div>"
-            else:
-                show_download = True
-                filtered_df = df[df["ata_score"] >= ata_score]
-
-                table_style = """
-                <style>
-                    .scroll-table { overflow-x: auto; white-space: nowrap; }
-                    .scroll-table table {
-                        table-layout: auto;
-                        width: max-content;
-                        min-width: 100%;
-                    }
-                    .scroll-table th, .scroll-table td {
-                        white-space: nowrap;
-                        vertical-align: middle;
-                        font-size: 14px;
-                        padding: 8px 16px;
-                    }
-                </style>
-                """
-
-                all_table_html = f"""
-                {table_style}
-                <div class='scroll-table mt-4'>
-                    <h4>🟦 All Candidates:</h4>
-                    {df.to_html(classes='table table-bordered table-striped table-hover table-sm', index=False, escape=False)}
-                </div>
-                """
-
-                filtered_table_html = f"""
-                <div class='scroll-table mt-5'>
-                    <h4>✅ Filtered Candidates (ATA Score ≥ {ata_score}%):</h4>
-                    {filtered_df.to_html(classes='table table-bordered table-success table-sm', index=False, escape=False)}
-                </div>
-                """
-
-                feedback = all_table_html + filtered_table_html
-
-        except Exception as e:
-            logging.error(f"❌ Exception during fetch/screening: {e}")
-            feedback = f"<div class='alert alert-danger mt-4'>❌ Server error: {e}</div>"
-
-    return render_template_string(TEMPLATE, feedback=feedback, show_download=show_download)
+            rows, next_cursor = store.page(
+                run["run_id"], sort=args.get("sort", "rank"),
+                descending={"asc": False, "desc": True}.get(order),
+                cursor=args.get("cursor"), limit=limit, **filters
+            )
+            matching = store.count(run_id=run["run_id"], **filters)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "run_id": run["run_id"],
+        "ata_score_threshold": run["ata_threshold"],
+        "total_candidates": run["total_candidates"],
+        "below_cutoff": run["below_cutoff"],
+        "rows": run["rows"],
+        "matching": matching,
+        "candidates": rows,
+        "next_cursor": next_cursor,
+    })
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """
+    Stage timings and run counters in the Prometheus text format.
+    """
+    return Response(metrics.prometheus_text(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/jobs/<job_id>/report")
+def job_report(job_id):
+    """
+    The JSON timing report of a finished job (see metrics.RunMetrics).
+    """
+    path = os.path.join(RUN_REPORT_DIR, f"job-{job_id}.json")
+    if job_queue.get(job_id) is None or not os.path.exists(path):
+        return jsonify({"error": "no report for this job"}), 404
+    return send_file(path, mimetype="application/json")
+
+
+def _zip_download(folder, label):
+    """
+    Sends the folder as a ZIP: 304 if the client's ETag still matches, the
+    cached archive if one exists for the current contents, else a stream.
+    """
+    filenames = list_folder_files(folder)
+    etag = folder_etag(folder, filenames)
+    download_name = f"{label}.zip"
+
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
+
+    cached_path = cached_archive_path(DOWNLOAD_CACHE_DIR, label, etag)
+    if os.path.exists(cached_path):
+        return send_file(
+            cached_path,
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name=download_name,
+            etag=etag
+        )
+
+    response = Response(
+        stream_with_context(iter_zip_with_cache(folder, filenames, DOWNLOAD_CACHE_DIR, label, etag)),
+        mimetype='application/zip',
+        headers={"Content-Disposition": f"attachment; filename={download_name}"}
+    )
+    response.set_etag(etag)
+    return response
 
 
 @app.route("/download_filtered_cvs")
 def download_filtered_cvs():
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filename in os.listdir(FILTERED_FOLDER):
-            filepath = os.path.join(FILTERED_FOLDER, filename)
-            zip_file.write(filepath, arcname=filename)
-    zip_buffer.seek(0)
-    return send_file(
-        zip_buffer,
-        mimetype='application/zip',
-        as_attachment=True,
-        download_name='filtered_cvs.zip'
-    )
+    return _zip_download(FILTERED_FOLDER, "filtered_cvs")
 
 
 @app.route("/download_all_cvs")
 def download_all_cvs():
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filename in os.listdir(CV_FOLDER):
-            filepath = os.path.join(CV_FOLDER, filename)
-            zip_file.write(filepath, arcname=filename)
-    zip_buffer.seek(0)
-    return send_file(
-        zip_buffer,
-        mimetype='application/zip',
-        as_attachment=True,
-        download_name='all_cvs.zip'
-    )
+    return _zip_download(CV_FOLDER, "all_cvs")
 
 
 if __name__ == '__main__':
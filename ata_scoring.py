@@ -0,0 +1,146 @@
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from cv_document import as_document, build_token_matcher, document_of
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a list of JD keywords.
+
+    Keywords are matched case-insensitively as whole tokens, the same way
+    skills are (see cv_document.build_token_matcher): "java" does not match
+    inside "javascript", while overlapping keywords such as "machine learning"
+    and "learning" are all found in the same scan. Each text is scanned once
+    through its normalized view (see cv_document), whatever the keyword
+    count, so keywords split over a line break or extra spaces still match.
+    """
+
+    def __init__(self, jd_keywords):
+        self.keywords = list(jd_keywords)
+        # Lowercased keyword -> its column(s); case variants share a match
+        self._columns = {}
+        for j, keyword in enumerate(self.keywords):
+            key = keyword.strip().lower()
+            if key:
+                self._columns.setdefault(key, []).append(j)
+        self._pattern, self._implied = build_token_matcher(self._columns, flags=0)
+
+    def columns(self, text):
+        """
+        Returns the sorted column indices of the keywords present in the text.
+
+        Args:
+            text (Union[str, CVDocument]): CV text or its document
+        """
+        if not self._columns or not text:
+            return []
+        found = set()
+        for match in self._pattern.finditer(as_document(text).normalized):
+            found.update(self._implied.get(match.group(1), ()))
+        return sorted(j for key in found for j in self._columns[key])
+
+    def matrix(self, texts):
+        """
+        Builds the candidate × keyword presence matrix in one pass over the texts.
+
+        Args:
+            texts (Iterable[Union[str, CVDocument]]): CV texts, one row each
+
+        Returns:
+            scipy.sparse.csr_matrix: Boolean matrix of shape (len(texts), len(keywords))
+        """
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(self.columns(text))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=bool)
+        return sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.keywords))
+        )
+
+
+def ata_scores(matrix):
+    """
+    Derives ATA scores from a presence matrix.
+
+    Returns:
+        tuple: (scores as % rounded to 1 decimal, matched counts), one per row
+    """
+    counts = np.asarray(matrix.sum(axis=1), dtype=np.int64).ravel()
+    total = matrix.shape[1]
+    if not total:
+        return np.zeros(len(counts)), counts
+    return np.round(counts * (100.0 / total), 1), counts
+
+
+def _row_fields(matrix, keywords):
+    """
+    Yields the ATA scoring fields of every row of a presence matrix.
+    """
+    scores, counts = ata_scores(matrix)
+    keywords = np.asarray(keywords, dtype=object)
+    for i in range(matrix.shape[0]):
+        matched = keywords[matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]]
+        yield {
+            'ata_score': float(scores[i]),
+            'matched_count': int(counts[i]),
+            'total_keywords': len(keywords),
+            'matched_keywords': ", ".join(matched)
+        }
+
+
+def score_candidates(candidates, jd_keywords):
+    """
+    Adds ATA scoring fields to every candidate dict in one batched pass.
+
+    Args:
+        candidates (Sequence[dict]): Extracted CV data holding `text`
+        jd_keywords (Union[Sequence[str], KeywordMatcher]): Keywords from the
+            job description, or a matcher already built from them (reused
+            across batches)
+
+    Returns:
+        scipy.sparse.csr_matrix: The candidate × keyword presence matrix
+    """
+    matcher = jd_keywords if isinstance(jd_keywords, KeywordMatcher) else KeywordMatcher(jd_keywords)
+    matrix = matcher.matrix(document_of(c) for c in candidates)
+    for c, fields in zip(candidates, _row_fields(matrix, matcher.keywords)):
+        c.update(fields)
+    return matrix
+
+
+def score_candidates_multi(candidates, jd_keywords_by_name):
+    """
+    Scores the candidates against several JDs with a single pass over the texts.
+
+    One matrix is built over the union of all JD keywords; each JD's scores
+    come from its own column slice.
+
+    Args:
+        candidates (Sequence[dict]): Extracted CV data holding `text`
+        jd_keywords_by_name (Mapping[str, Sequence[str]]): JD name → keywords
+
+    Returns:
+        Dict[str, List[dict]]: JD name → ATA fields per candidate, in candidate order
+    """
+    keyword_lists = {name: list(dict.fromkeys(kws)) for name, kws in jd_keywords_by_name.items()}
+    union = list(dict.fromkeys(kw for kws in keyword_lists.values() for kw in kws))
+    column = {kw: j for j, kw in enumerate(union)}
+
+    matrix = KeywordMatcher(union).matrix(document_of(c) for c in candidates).tocsc()
+    logger.info(f"🧮 ATA matrix: {matrix.shape[0]} CVs × {matrix.shape[1]} keywords "
+                f"for {len(keyword_lists)} JDs, {matrix.nnz} hits")
+
+    scored = {}
+    for name, kws in keyword_lists.items():
+        sub = matrix[:, [column[kw] for kw in kws]].tocsr()
+        sub.sort_indices()
+        scored[name] = list(_row_fields(sub, kws))
+    return scored
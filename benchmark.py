@@ -0,0 +1,419 @@
+"""
+benchmark.py
+
+Benchmarks for the CV processing hot path.
+
+Suites:
+    skills      compiled skill matcher vs the original regex loop
+    pdf         PDF text backends: speed and fidelity
+    extractors  each extractor, ms per CV
+    ata         ATA keyword matching vs the original substring loop, by keyword count
+    text        text extraction per file format
+    pipeline    end-to-end create_candidates_df_with_ata throughput
+    all         extractors + ata + text + pipeline
+
+Usage:
+    python benchmark.py skills [--folder CVs] [--repeat 20]
+    python benchmark.py pdf [--folder CVs] [--repeat 3] [--max-pages 5]
+    python benchmark.py ata --generate 2000
+    python benchmark.py all --generate 1000 --seed 42 --save
+    python benchmark.py all --folder bench_corpus/1000-42 --compare bench_results/<old>.json
+
+Results of the extractors/ata/text/pipeline suites are saved as JSON (--save)
+so runs of different versions can be compared (--compare).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import logging
+import tempfile
+import subprocess
+from datetime import datetime
+from difflib import SequenceMatcher
+
+from config import CV_FOLDER, BASE_DIR
+
+BENCH_CORPUS_DIR = os.path.join(BASE_DIR, "bench_corpus")
+BENCH_RESULTS_DIR = os.path.join(BASE_DIR, "bench_results")
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def load_sample_texts(folder=CV_FOLDER):
+    """
+    Extracts the text of every PDF/DOCX in the folder.
+
+    Returns:
+        List[str]: Extracted CV texts (unreadable files are skipped)
+    """
+    from data_builder import extract_cv_text
+
+    texts = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(('.pdf', '.docx')):
+            text = extract_cv_text(os.path.join(folder, filename))
+            if text:
+                texts.append(text)
+    return texts
+
+
+def _time_per_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def bench_skills(texts, repeat=20):
+    """
+    Compares the compiled skill matcher with the original per-skill regex loop.
+
+    Returns:
+        dict: Mean seconds per CV for both implementations and the number of
+              CVs whose results differ (ignoring duplicates in the old output)
+    """
+    from extractors import skill_list, extract_skills
+
+    def loop_extract_skills(text):
+        found_skills = []
+        for skill in skill_list:
+            if re.search(rf'\b{re.escape(skill)}\b', text, re.IGNORECASE):
+                found_skills.append(skill)
+        return ", ".join(dict.fromkeys(found_skills))
+
+    mismatches = sum(1 for text in texts if extract_skills(text) != loop_extract_skills(text))
+    return {
+        "cvs": len(texts),
+        "loop_ms": _time_per_call(loop_extract_skills, texts, repeat) * 1000,
+        "compiled_ms": _time_per_call(extract_skills, texts, repeat) * 1000,
+        "mismatches": mismatches,
+    }
+
+
+def _normalized_tokens(text):
+    return " ".join(text.split()).lower().split(" ")
+
+
+def bench_pdf_backends(folder=CV_FOLDER, repeat=3, max_pages=None):
+    """
+    Times every available PDF backend over the PDFs in the folder and
+    compares its text with the pdfminer reference (all pages, default layout).
+
+    Returns:
+        List[dict]: Per backend: PDFs/second, pages budget, mean token-level
+                    similarity to the reference (1.0 = identical) and failures
+    """
+    from pdf_backends import available_pdf_backends, extract_pdf_text
+
+    pdfs = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith('.pdf')]
+    if not pdfs:
+        return []
+    reference = {path: extract_pdf_text(path, backends=("pdfminer",), max_pages=None) for path in pdfs}
+
+    results = []
+    for name in available_pdf_backends():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            texts = {path: extract_pdf_text(path, backends=(name,), max_pages=max_pages) for path in pdfs}
+        elapsed = time.perf_counter() - start
+
+        similarities = [
+            SequenceMatcher(None, _normalized_tokens(texts[path]), _normalized_tokens(reference[path])).ratio()
+            for path in pdfs if reference[path]
+        ]
+        results.append({
+            "backend": name,
+            "pdfs": len(pdfs),
+            "max_pages": max_pages,
+            "pdfs_per_sec": len(pdfs) * repeat / elapsed if elapsed else float("inf"),
+            "similarity": sum(similarities) / len(similarities) if similarities else None,
+            "failures": sum(1 for path in pdfs if not texts[path]),
+        })
+    return results
+
+
+def bench_extractors(texts, repeat=3):
+    """
+    Times each extractor over the sample texts.
+
+    Returns:
+        dict: Mean milliseconds per CV for each extractor; NER names are timed
+              as one batched pass (None if spaCy is unavailable)
+    """
+    from extractors import (extract_email, extract_skills, extract_experience,
+                            extract_education, extract_names)
+
+    results = {"cvs": len(texts)}
+    for func in (extract_email, extract_skills, extract_experience, extract_education):
+        results[f"{func.__name__}_ms"] = _time_per_call(func, texts, repeat) * 1000
+    try:
+        extract_names(texts[:1])  # Load the model outside the timing
+        start = time.perf_counter()
+        extract_names(texts)
+        results["extract_names_ms"] = (time.perf_counter() - start) / len(texts) * 1000
+    except Exception as e:
+        logger.warning(f"⚠️ Skipping extract_names - {e}")
+        results["extract_names_ms"] = None
+    return results
+
+
+def bench_ata(texts, keyword_counts=(12, 15, 30, 60, 120, 189), repeat=3, seed=0):
+    """
+    Times ATA keyword matching at realistic JD sizes (jd_handler yields 12
+    KeyBERT phrases plus static skill matches) and beyond.
+
+    Keywords are drawn from the skill list. The original substring loop
+    (`kw in text.lower()`) is the baseline; it also matches inside other
+    words ("java" in "javascript"), counted as mismatches.
+
+    Returns:
+        dict: Per keyword count: ms per CV for both, and CVs whose matched
+              keywords differ
+    """
+    import random
+
+    from ata_scoring import KeywordMatcher
+    from cv_document import CVDocument
+    from extractors import skill_list
+
+    def substring_loop(text, keywords):
+        cv_text = text.lower()
+        return [kw for kw in keywords if kw.lower() in cv_text]
+
+    rng = random.Random(seed)
+    documents = [CVDocument(text) for text in texts]  # Built once per CV by the pipeline
+    results = {"cvs": len(texts)}
+    for count in keyword_counts:
+        keywords = rng.sample(skill_list, min(count, len(skill_list)))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            loop = [substring_loop(text, keywords) for text in texts]
+        loop_s = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            matcher = KeywordMatcher(keywords)
+            matrix = matcher.matrix(documents)
+        matcher_s = (time.perf_counter() - start) / repeat
+
+        matched = [{keywords[j] for j in matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]}
+                   for i in range(len(texts))]
+        results[f"kw{count}_loop_ms"] = loop_s / len(texts) * 1000
+        results[f"kw{count}_matcher_ms"] = matcher_s / len(texts) * 1000
+        results[f"kw{count}_mismatches"] = sum(1 for old, new in zip(loop, matched) if set(old) != new)
+    return results
+
+
+def bench_text_extraction(folder=CV_FOLDER, repeat=1):
+    """
+    Times extract_cv_text per file format.
+
+    Returns:
+        dict: Per format: files, ms per file, MB/s of input and failures
+    """
+    from data_builder import extract_cv_text
+
+    results = {}
+    for ext in (".pdf", ".docx"):
+        paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(ext)]
+        if not paths:
+            continue
+        size = sum(os.path.getsize(p) for p in paths)
+        failures = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            failures = sum(1 for p in paths if not extract_cv_text(p))
+        elapsed = (time.perf_counter() - start) / repeat
+        fmt = ext.lstrip(".")
+        results[f"{fmt}_files"] = len(paths)
+        results[f"{fmt}_ms_per_file"] = elapsed / len(paths) * 1000
+        results[f"{fmt}_mb_per_sec"] = size / elapsed / 1e6 if elapsed else None
+        results[f"{fmt}_failures"] = failures
+    return results
+
+
+def bench_pipeline(folder=CV_FOLDER, workers=1, use_model=False):
+    """
+    Runs create_candidates_df_with_ata over the folder with every cache and
+    store disabled, in a scratch directory.
+
+    Returns:
+        dict: CVs, wall seconds, CVs/second and per-stage seconds
+    """
+    import metrics
+    from data_builder import create_candidates_df_with_ata
+
+    folder = os.path.abspath(folder)
+    cvs = sum(1 for f in os.listdir(folder) if f.endswith(('.pdf', '.docx')))
+    cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="cv-bench-")
+    try:
+        os.chdir(scratch)
+        os.makedirs("rejected_cvs", exist_ok=True)
+        start = time.perf_counter()
+        with metrics.run("benchmark", report_dir=None) as run:
+            create_candidates_df_with_ata(
+                cv_folder=folder, jd_keywords=["python", "sql", "machine learning", "docker", "react"],
+                filtered_folder=os.path.join(scratch, "filtered"), use_model=use_model,
+                workers=workers, cache_dir=None, index_path=None, embeddings_dir=None,
+                blob_dir=None
+            )
+        elapsed = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    results = {"cvs": cvs, "workers": workers, "seconds": elapsed,
+               "cvs_per_sec": cvs / elapsed if elapsed else None}
+    for name, entry in run.to_dict()["stages"].items():
+        results[f"stage_{name}_s"] = entry["seconds"]
+    return results
+
+
+def ensure_corpus(count, seed):
+    """
+    Returns a generated corpus folder of `count` CVs, creating it on first use.
+    """
+    from generate_fake_cvs import generate_corpus
+
+    folder = os.path.join(BENCH_CORPUS_DIR, f"{count}-{seed}")
+    existing = os.listdir(folder) if os.path.isdir(folder) else []
+    if len(existing) < count:
+        logger.info(f"🧪 Generating {count} CVs (seed {seed}) into {folder}")
+        generate_corpus(count, folder, seed=seed, workers=os.cpu_count() or 1)
+    return folder
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, path=None):
+    """
+    Writes benchmark results to path (default: bench_results/<timestamp>-<commit>.json).
+    """
+    if path is None:
+        os.makedirs(BENCH_RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(BENCH_RESULTS_DIR, f"{stamp}-{results['meta']['commit'] or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+    return path
+
+
+def compare_results(old, new):
+    """
+    Returns printable lines comparing two saved result sets metric by metric.
+    """
+    lines = [f"📈 {old['meta'].get('commit')} → {new['meta'].get('commit')}"]
+    for suite, metrics in new["suites"].items():
+        for key, value in metrics.items():
+            before = old.get("suites", {}).get(suite, {}).get(key)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)):
+                continue
+            change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+            lines.append(f"   {suite}.{key:<32} {before:12.3f} → {value:12.3f}  ({change})")
+    return lines
+
+
+def _print_suite(name, metrics):
+    print(f"📊 {name}")
+    for key, value in metrics.items():
+        shown = f"{value:.3f}" if isinstance(value, float) else value
+        print(f"   {key:<32} {shown}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CV automation benchmarks")
+    parser.add_argument("suite", choices=["skills", "pdf", "extractors", "ata", "text", "pipeline", "all"],
+                        help="Benchmark to run")
+    parser.add_argument("--folder", default=CV_FOLDER, help="Folder with sample CVs")
+    parser.add_argument("--generate", type=int, metavar="N",
+                        help="Benchmark a generated corpus of N CVs instead of --folder")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for --generate")
+    parser.add_argument("--repeat", type=int, default=None, help="Passes over the sample")
+    parser.add_argument("--max-pages", type=int, default=None, help="PDF page budget (pdf suite)")
+    parser.add_argument("--workers", type=int, default=1, help="Parser processes (pipeline suite)")
+    parser.add_argument("--with-model", action="store_true", help="Include ML scoring (pipeline suite)")
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH",
+                        help="Save results as JSON (default: bench_results/)")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with saved results")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        args.folder = ensure_corpus(args.generate, args.seed)
+
+    if args.suite == "pdf":
+        results = bench_pdf_backends(args.folder, repeat=args.repeat or 3, max_pages=args.max_pages)
+        if not results:
+            sys.exit(f"❌ No PDFs found in {args.folder}")
+        print(f"📊 PDF text extraction over {results[0]['pdfs']} PDFs (page budget: {args.max_pages or 'all'})")
+        for r in results:
+            similarity = f"{r['similarity']:.3f}" if r['similarity'] is not None else "n/a"
+            print(f"   {r['backend']:<9}: {r['pdfs_per_sec']:8.2f} PDFs/s  "
+                  f"similarity to pdfminer {similarity}  failures {r['failures']}")
+        return
+
+    if args.suite == "skills":
+        args.repeat = args.repeat or 20
+        texts = load_sample_texts(args.folder)
+        if not texts:
+            sys.exit(f"❌ No readable CVs found in {args.folder}")
+        result = bench_skills(texts, repeat=args.repeat)
+        speedup = result["loop_ms"] / result["compiled_ms"] if result["compiled_ms"] else float("inf")
+        print(f"📊 extract_skills over {result['cvs']} CVs x {args.repeat}")
+        print(f"   regex loop : {result['loop_ms']:.3f} ms/CV")
+        print(f"   compiled   : {result['compiled_ms']:.3f} ms/CV  ({speedup:.1f}x)")
+        print(f"   mismatches : {result['mismatches']} (C++/C# at end of token were missed by the loop)")
+        return
+
+    suites = {}
+    if args.suite in ("text", "all"):
+        suites["text"] = bench_text_extraction(args.folder, repeat=args.repeat or 1)
+    if args.suite in ("extractors", "ata", "all"):
+        texts = load_sample_texts(args.folder)
+        if not texts:
+            sys.exit(f"❌ No readable CVs found in {args.folder}")
+        if args.suite != "ata":
+            suites["extractors"] = bench_extractors(texts, repeat=args.repeat or 3)
+        if args.suite != "extractors":
+            suites["ata"] = bench_ata(texts, repeat=args.repeat or 3)
+    if args.suite in ("pipeline", "all"):
+        suites["pipeline"] = bench_pipeline(args.folder, workers=args.workers, use_model=args.with_model)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "folder": os.path.abspath(args.folder),
+            "generated": {"count": args.generate, "seed": args.seed} if args.generate else None,
+        },
+        "suites": suites,
+    }
+    for name, metrics in suites.items():
+        _print_suite(name, metrics)
+
+    if args.save is not None:
+        print(f"💾 Saved results to {save_results(results, args.save or None)}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            print("\n".join(compare_results(json.load(fh), results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+blob_store.py
+
+Content-addressed store holding each unique CV file once.
+
+Blobs live under objects/<first 2 hex>/<sha256> and are read-only. The
+filtered, rejected and archived folders are views made of hardlinks to
+blobs, so placing a CV costs one link instead of a copy. Each screening run
+also writes a manifest (filename → sha256) under manifests/. `gc` drops
+blobs that no view links to and no retained manifest mentions.
+
+Usage:
+    python blob_store.py gc [--keep 10]
+    python blob_store.py absorb <folder> [<folder> ...]
+    python blob_store.py stats
+"""
+
+import os
+import re
+import json
+import stat
+import time
+import shutil
+import logging
+import argparse
+
+from config import BLOB_STORE_DIR, ARCHIVE_KEEP
+from extraction_cache import file_sha256
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore:
+    """
+    Read-only blobs keyed by SHA-256, plus JSON snapshot manifests.
+    """
+
+    def __init__(self, root=BLOB_STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    def blob_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def put(self, filepath, sha256=None):
+        """
+        Stores the file's content unless a blob with the same hash exists.
+
+        The bytes are copied once, never linked: the source may later be
+        rewritten in place (e.g. by a mail re-download).
+
+        Returns:
+            str: The SHA-256 of the content
+        """
+        sha256 = sha256 or file_sha256(filepath)
+        path = self.blob_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.copyfile(filepath, tmp_path)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp_path, path)
+        return sha256
+
+    def link(self, sha256, dest_path):
+        """
+        Makes dest_path a hardlink to the blob, replacing any existing file.
+
+        Falls back to a copy where hardlinks are unsupported (e.g. across
+        filesystems).
+        """
+        src = self.blob_path(sha256)
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest_path)
+
+    def place(self, filepath, dest_folder, sha256=None):
+        """
+        Stores filepath and links it into dest_folder under the same name.
+
+        Returns:
+            str: The SHA-256 of the content
+        """
+        sha256 = self.put(filepath, sha256)
+        self.link(sha256, os.path.join(dest_folder, os.path.basename(filepath)))
+        return sha256
+
+    def write_manifest(self, name, entries):
+        """
+        Saves a snapshot manifest.
+
+        Args:
+            name (str): Manifest name, e.g. "run-20250715-153349"
+            entries (Mapping[str, Mapping[str, str]]): View → {filename: sha256}
+
+        Returns:
+            str: Path of the manifest file
+        """
+        path = os.path.join(self.manifests_dir, f"{name}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"created": time.time(), "views": entries}, fh)
+        os.replace(tmp_path, path)
+        return path
+
+    def manifests(self):
+        """
+        Returns the manifest paths, oldest first.
+        """
+        names = sorted(f for f in os.listdir(self.manifests_dir) if f.endswith(".json"))
+        return [os.path.join(self.manifests_dir, f) for f in names]
+
+    def _manifest_hashes(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                views = json.load(fh).get("views", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable manifest {path} - {e}")
+            return None
+        return {sha256 for entries in views.values() for sha256 in entries.values()}
+
+    def _blobs(self):
+        for prefix in os.listdir(self.objects_dir):
+            folder = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if SHA256_PATTERN.match(name):
+                    yield name, os.path.join(folder, name)
+
+    def gc(self, keep_manifests=ARCHIVE_KEEP):
+        """
+        Drops old manifests, then every blob that is neither linked from a
+        view folder (link count 1) nor listed in a remaining manifest.
+
+        Args:
+            keep_manifests (Optional[int]): Newest manifests to keep; None keeps all
+
+        Returns:
+            dict: {"manifests_removed", "blobs_removed", "bytes_freed"}
+        """
+        manifests = self.manifests()
+        removed_manifests = 0
+        if keep_manifests is not None and len(manifests) > keep_manifests:
+            for path in manifests[:len(manifests) - keep_manifests]:
+                os.remove(path)
+                removed_manifests += 1
+            manifests = manifests[len(manifests) - keep_manifests:]
+
+        referenced = set()
+        for path in manifests:
+            hashes = self._manifest_hashes(path)
+            if hashes is None:
+                # Can't tell what it protects: keep every blob this round
+                logger.warning("⚠️ Skipping blob collection because a manifest is unreadable")
+                return {"manifests_removed": removed_manifests, "blobs_removed": 0, "bytes_freed": 0}
+            referenced |= hashes
+
+        blobs_removed = bytes_freed = 0
+        for sha256, path in self._blobs():
+            info = os.stat(path)
+            if info.st_nlink > 1 or sha256 in referenced:
+                continue
+            os.remove(path)
+            blobs_removed += 1
+            bytes_freed += info.st_size
+
+        logger.info(f"🧹 Blob GC: removed {removed_manifests} manifest(s), "
+                    f"{blobs_removed} blob(s), {bytes_freed} bytes")
+        return {"manifests_removed": removed_manifests, "blobs_removed": blobs_removed,
+                "bytes_freed": bytes_freed}
+
+    def absorb(self, folder):
+        """
+        Replaces the files of an existing folder (e.g. an old full-copy
+        archive) with hardlinks into the store.
+
+        Returns:
+            int: Bytes no longer stored twice
+        """
+        saved = 0
+        for filename in sorted(os.listdir(folder)):
+            filepath = os.path.join(folder, filename)
+            if not os.path.isfile(filepath):
+                continue
+            sha256 = file_sha256(filepath)
+            existed = os.path.exists(self.blob_path(sha256))
+            self.put(filepath, sha256)
+            if os.path.samefile(filepath, self.blob_path(sha256)):
+                continue
+            self.link(sha256, filepath)
+            saved += os.path.getsize(filepath) if existed else 0
+        return saved
+
+    def stats(self):
+        count = size = linked = 0
+        for _, path in self._blobs():
+            info = os.stat(path)
+            count += 1
+            size += info.st_size
+            linked += info.st_nlink > 1
+        return {"blobs": count, "bytes": size, "linked_blobs": linked,
+                "manifests": len(self.manifests())}
+
+
+def prune_archives(filtered_folder, keep=ARCHIVE_KEEP):
+    """
+    Deletes all but the newest `keep` archived filtered folders. Only
+    folders named exactly `<filtered_folder>_YYYYmmdd-HHMMSS` (as
+    directory_utils names them) count as archives; their blobs are freed
+    by the next gc.
+
+    Returns:
+        List[str]: Removed archive folders
+    """
+    parent = os.path.dirname(os.path.abspath(filtered_folder))
+    pattern = re.compile(re.escape(os.path.basename(os.path.abspath(filtered_folder))) + r"_\d{8}-\d{6}")
+    archives = sorted(
+        os.path.join(parent, name) for name in os.listdir(parent)
+        if pattern.fullmatch(name) and os.path.isdir(os.path.join(parent, name))
+    )
+    removed = archives[:max(0, len(archives) - keep)] if keep is not None else []
+    for path in removed:
+        shutil.rmtree(path)
+        logger.info(f"🗑️ Removed old archive: {path}")
+    return removed
+
+
+def main(argv=None):
+    from config import FILTERED_FOLDER
+
+    parser = argparse.ArgumentParser(description="Content-addressed CV store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gc_cmd = sub.add_parser("gc", help="Prune old archives/manifests and unreferenced blobs")
+    gc_cmd.add_argument("--keep", type=int, default=ARCHIVE_KEEP,
+                        help="Archived folders and manifests to keep")
+    absorb_cmd = sub.add_parser("absorb", help="Turn full-copy folders into hardlinks")
+    absorb_cmd.add_argument("folders", nargs="+")
+    sub.add_parser("stats", help="Show store size")
+    args = parser.parse_args(argv)
+
+    store = BlobStore()
+    if args.command == "gc":
+        prune_archives(FILTERED_FOLDER, keep=args.keep)
+        result = store.gc(keep_manifests=args.keep)
+        print(f"🧹 Freed {result['bytes_freed']} bytes "
+              f"({result['blobs_removed']} blobs, {result['manifests_removed']} manifests)")
+    elif args.command == "absorb":
+        for folder in args.folders:
+            print(f"🔗 {folder}: {store.absorb(folder)} duplicate bytes now shared")
+    elif args.command == "stats":
+        for key, value in store.stats().items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,21 @@ import os
 import logging
 from dotenv import load_dotenv
 
+from log_setup import setup_logging
+
 # === Load .env variables ===
 load_dotenv()
 
-# === Logging setup ===
-logging.basicConfig(
-    filename='cv_automation.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# === Logging setup (see log_setup: queued, written by a background thread) ===
+LOG_LEVEL = "INFO"
+LOG_FILE = os.path.join(os.path.dirname(__file__), "cv_automation.log")  # None = console only
+LOG_JSON_FILE = None             # e.g. "cv_automation.jsonl": JSON lines with per-CV fields
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate log files at this size
+LOG_BACKUP_COUNT = 5             # Rotated files kept per log
+LOG_CONSOLE = True               # Also log to stderr
+
+setup_logging(LOG_LEVEL, log_file=LOG_FILE, max_bytes=LOG_MAX_BYTES,
+              backup_count=LOG_BACKUP_COUNT, json_file=LOG_JSON_FILE, console=LOG_CONSOLE)
 
 # === Email Credentials ===
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
@@ -23,6 +29,30 @@ if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
 BASE_DIR = os.path.dirname(__file__)
 CV_FOLDER = os.path.join(BASE_DIR, "CVs")
 FILTERED_FOLDER = os.path.join(BASE_DIR, "filtered_cvs")
+BATCH_OUTPUT_DIR = os.path.join(BASE_DIR, "batch_results")  # main.py --jd-dir output
+RUN_REPORT_DIR = os.path.join(BASE_DIR, "reports")  # JSON timing report per run (None = off)
+RUN_REPORT_MAX_FILES = 1000  # Slowest files whose timings a run keeps (None = all)
+
+# Each unique CV is stored once here; filtered/rejected/archived folders hardlink to it
+BLOB_STORE_DIR = os.path.join(BASE_DIR, "blobs")  # None copies files instead
+ARCHIVE_KEEP = 10  # Archived filtered folders and run manifests kept by `blob_store.py gc`
+
+# Mailbox sync state (UIDVALIDITY + last UID per account/folder)
+MAIL_SYNC_STATE_PATH = os.path.join(BASE_DIR, "state", "mail_sync.json")
+LAST_RUN_STATE_PATH = os.path.join(BASE_DIR, "state", "last_run.json")  # Skips unchanged CLI runs
+
+# Inverted index over every CV ever ingested (None disables indexing)
+CV_INDEX_PATH = os.path.join(BASE_DIR, "state", "cv_index.sqlite3")
+CV_INDEX_MAX_NGRAM = 2  # Longest indexed phrase; longer keywords match on all their n-grams
+
+# Ranked results of every run, queryable by run/score/skill/email (see results_store)
+RESULTS_DB_PATH = os.path.join(BASE_DIR, "state", "results.sqlite3")  # None disables saving
+
+# CV embeddings for the semantic JD score (None disables it)
+CV_EMBEDDING_DIR = os.path.join(BASE_DIR, "state", "cv_embeddings")
+CV_EMBEDDING_DTYPE = "float16"  # "float16" or "int8" (half the disk, slightly coarser)
+CV_EMBEDDING_BATCH_SIZE = 64    # CVs per encoder batch
+CV_EMBEDDING_MAX_CHARS = 4000   # Leading characters embedded per CV
 
 # === Static JD Keywords (used when JD is not provided dynamically) ===
 STATIC_JD_KEYWORDS = {
@@ -32,3 +62,42 @@ STATIC_JD_KEYWORDS = {
 # === Matching & Filtering Parameters ===
 ATA_SCORE_THRESHOLD = 30.0  # Min score to pass filtering
 EMAIL_SUBJECT_KEYWORDS = ["CV", "Application"]  # Used in email_fetch filter
+
+# === Ranked results ===
+RESULTS_TOP_K = 500       # Candidates kept per ranking (None = all); the rest are only counted
+RESULTS_PAGE_SIZE = 50    # Rows per page in the web results view
+RESULTS_API_MAX_LIMIT = 500  # Most rows one /runs/<id>/results page may return
+
+# === spaCy NER batching (name extraction) ===
+NER_BATCH_SIZE = 32   # Texts per nlp.pipe batch
+NER_N_PROCESS = 1     # Processes used by nlp.pipe
+
+# === PDF text extraction ===
+PDF_BACKENDS = ("pdfminer",)  # Tried in order; put "pymupdf" first to opt in (pip install PyMuPDF, AGPL-3.0)
+PDF_MAX_PAGES = None          # Pages read per PDF (None = all)
+PDFMINER_LAPARAMS = {}                  # pdfminer LAParams overrides, e.g. {"all_texts": False}
+
+# === Parallel CV parsing ===
+CV_WORKERS = 1        # Parser processes (1 = parse in the main process)
+
+# === Streaming screening (main.py --stream) ===
+STREAM_BATCH_SIZE = 256   # CVs parsed, scored and written together; bounds peak memory
+STREAM_RESULTS_CSV = os.path.join(BASE_DIR, "filtered_all.csv")  # Every scored CV (None = not written)
+ML_BATCH_SIZE = 256       # CVs per predict_suitability call
+
+# === JD keyword extraction cache ===
+JD_KEYWORD_CACHE_DIR = os.path.join(BASE_DIR, "cache", "jd_keywords")  # None = memory only
+JD_KEYWORD_CACHE_SIZE = 256  # JDs kept in the in-memory LRU
+JD_KEYWORD_CACHE_MAX_FILES = 5000     # JD files kept on disk (least recently used go first)
+JD_KEYWORD_CACHE_MAX_AGE_DAYS = 90    # Disk entries unused this long are removed
+
+# === Web app background screening ===
+SCREENING_JOB_WORKERS = 1    # Concurrent screening jobs (they share the CV folders)
+SCREENING_JOB_HISTORY = 50   # Finished jobs kept for status/result lookups
+DOWNLOAD_CACHE_DIR = os.path.join(BASE_DIR, "cache", "downloads")  # Built ZIP archives
+
+# === Extraction cache (skip re-parsing unchanged CVs) ===
+EXTRACTION_CACHE_DIR = os.path.join(BASE_DIR, "cache")  # None disables the cache
+EXTRACTION_CACHE_MAX_ENTRIES = 50000
+EXTRACTION_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB of cached text/fields
+EXTRACTION_CACHE_MAX_AGE_DAYS = 90
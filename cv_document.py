@@ -0,0 +1,163 @@
+"""
+cv_document.py
+
+One CV's text, normalized once and shared by every consumer.
+
+`CVDocument` holds the raw text and its lowercased, whitespace-collapsed
+view up front; line spans (over the raw text) and word tokens (over the
+normalized view) are computed on first use. Extractors, ATA scoring, the CV
+index and the ML step all read these views instead of re-lowering or
+re-splitting the text themselves. `build_token_matcher` compiles the term
+lists (skills, JD keywords) matched against the normalized view.
+"""
+
+import re
+
+# Word tokens keep trailing "+"/"#" so "C++" and "C#" stay distinct from "C"
+TOKEN_PATTERN = re.compile(r"[^\W_]+[+#]*")
+
+# The line boundaries str.splitlines() uses
+LINE_BREAK_PATTERN = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class CVDocument:
+    """
+    Raw CV text plus the derived views extractors work on.
+
+    Attributes:
+        raw (str): Text as extracted from the file
+        normalized (str): raw lowercased, with every whitespace run collapsed
+            to one space and no leading/trailing whitespace
+    """
+
+    __slots__ = ("raw", "normalized", "_line_spans", "_tokens")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.normalized = " ".join(raw.split()).lower()
+        self._line_spans = None
+        self._tokens = None
+
+    def __getstate__(self):
+        # Lazy views are cheaper to rebuild than to pickle across processes
+        return self.raw, self.normalized
+
+    def __setstate__(self, state):
+        self.raw, self.normalized = state
+        self._line_spans = None
+        self._tokens = None
+
+    def __repr__(self):
+        return f"<CVDocument {len(self.raw)} chars>"
+
+    @property
+    def line_spans(self):
+        """
+        (start, end) offsets of each line of the raw text, without the line
+        break; the same lines as raw.splitlines().
+        """
+        if self._line_spans is None:
+            spans, start = [], 0
+            for match in LINE_BREAK_PATTERN.finditer(self.raw):
+                spans.append((start, match.start()))
+                start = match.end()
+            if start < len(self.raw):
+                spans.append((start, len(self.raw)))
+            self._line_spans = spans
+        return self._line_spans
+
+    def lines(self):
+        """
+        Yields the raw lines one at a time.
+        """
+        raw = self.raw
+        for start, end in self.line_spans:
+            yield raw[start:end]
+
+    @property
+    def tokens(self):
+        """
+        Lowercased word tokens of the text ("CI/CD" → ["ci", "cd"]).
+        """
+        if self._tokens is None:
+            self._tokens = TOKEN_PATTERN.findall(self.normalized)
+        return self._tokens
+
+
+def build_token_matcher(terms, flags=re.IGNORECASE):
+    """
+    Compiles a list of terms (skills, JD keywords) into a single trie-shaped
+    regex, so finding all of them costs one scan of the text however many
+    there are.
+
+    Each term is matched as a whole token: it may not be preceded or followed
+    by a word character, so "C++", "C#" and "CI/CD" match on their own while
+    "Java" does not match inside "JavaScript". The pattern sits inside a
+    lookahead so every start position reports its longest term in one pass;
+    shorter terms sharing that start (e.g. "SQL" in "SQL Server") are
+    recovered from a precomputed prefix table.
+
+    Args:
+        flags (int): Regex flags; pass 0 when only lowercased text (such as
+            CVDocument.normalized) is matched
+
+    Returns:
+        tuple: (compiled pattern, {lowercased term: [lowercased terms it implies]})
+    """
+    canonical = list(dict.fromkeys(term.lower() for term in terms))
+
+    trie = {}
+    for term in canonical:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def to_regex(node):
+        terminal = "" in node
+        branches = [re.escape(char) + to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    pattern = re.compile(r"(?<!\w)(?=(" + to_regex(trie) + r")(?!\w))", flags)
+
+    implied = {}
+    for term in canonical:
+        implied[term] = [
+            other for other in canonical
+            if len(other) <= len(term) and term.startswith(other)
+            and (len(other) == len(term) or not re.match(r"\w", term[len(other)]))
+        ]
+    return pattern, implied
+
+
+def as_document(text):
+    """
+    Returns text as a CVDocument (unchanged if it already is one).
+    """
+    if isinstance(text, CVDocument):
+        return text
+    return CVDocument(str(text))
+
+
+def raw_text(text):
+    """
+    Returns the raw text of a CVDocument or string without normalizing it.
+    """
+    return text.raw if isinstance(text, CVDocument) else text
+
+
+def document_of(data):
+    """
+    Returns the CVDocument of an extracted CV dict, building it from
+    data["text"] on first use (e.g. for extraction-cache hits).
+    """
+    doc = data.get("doc")
+    if doc is None:
+        doc = data["doc"] = CVDocument(data["text"])
+    return doc
@@ -0,0 +1,432 @@
+"""
+cv_index.py
+
+Persistent inverted index over every CV ever ingested.
+
+Terms are lower-cased word tokens and n-grams of them (see `tokenize`),
+each mapped to the sorted IDs of the candidates containing it. Every call
+to `add` writes one new segment; `compact` merges segments and drops
+postings of deleted candidates. ATA scoring a JD against the whole
+history (`search`, the `search` command) is then a lookup of its keywords
+instead of a pass over the files. The screening pipeline adds new CVs here
+and then scores the current CV folder from the index too (`ata_fields`);
+only CVs missing from it are matched against their text.
+
+Usage:
+    python cv_index.py add [--folder CVs]
+    python cv_index.py search [--jd jd.txt] [--limit 20]
+    python cv_index.py delete <sha256>
+    python cv_index.py compact
+    python cv_index.py stats
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import argparse
+from array import array
+from collections import defaultdict
+
+from config import CV_INDEX_PATH, CV_INDEX_MAX_NGRAM
+from cv_document import TOKEN_PATTERN, document_of
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+# Candidate fields stored alongside the postings
+FIELDS = ("filename", "name", "email", "skills", "experience", "education")
+
+# Values per `IN (...)` query, below SQLite's oldest bound-parameter limit (999)
+SQL_IN_CHUNK = 900
+
+
+def tokenize(text):
+    """
+    Splits text into lower-cased word tokens ("CI/CD" → ["ci", "cd"]).
+    """
+    return TOKEN_PATTERN.findall(text.lower())  # Same tokens as CVDocument.tokens
+
+
+def _terms(tokens, max_ngram):
+    terms = set()
+    for n in range(1, max_ngram + 1):
+        for i in range(len(tokens) - n + 1):
+            terms.add(" ".join(tokens[i:i + n]))
+    return terms
+
+
+def keyword_terms(keyword, max_ngram=CV_INDEX_MAX_NGRAM):
+    """
+    Returns the index terms that must all be present for a keyword to match.
+
+    Keywords up to max_ngram tokens map to a single term; longer phrases are
+    approximated by all of their max_ngram-grams.
+    """
+    tokens = tokenize(keyword)
+    if len(tokens) <= max_ngram:
+        return [" ".join(tokens)] if tokens else []
+    return sorted(_terms(tokens, max_ngram) - _terms(tokens, max_ngram - 1))
+
+
+def _pack(ids):
+    return array("I", sorted(ids)).tobytes()
+
+
+def _unpack(blob):
+    ids = array("I")
+    ids.frombytes(blob)
+    return ids
+
+
+class CVIndex:
+    """
+    SQLite-backed inverted index of CV terms to candidate IDs.
+    """
+
+    def __init__(self, path=CV_INDEX_PATH, max_ngram=CV_INDEX_MAX_NGRAM):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_ngram = max_ngram
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                sha256     TEXT NOT NULL UNIQUE,
+                filename   TEXT,
+                name       TEXT,
+                email      TEXT,
+                skills     TEXT,
+                experience TEXT,
+                education  TEXT,
+                added      REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term    TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                ids     BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self._migrate_autoincrement()
+        stored = self.conn.execute("SELECT value FROM meta WHERE key = 'max_ngram'").fetchone()
+        if stored is None:
+            self.conn.execute("INSERT INTO meta VALUES ('max_ngram', ?)", (str(max_ngram),))
+            self.conn.commit()
+        elif int(stored[0]) != max_ngram:
+            logger.warning(f"⚠️ Index built with max_ngram={stored[0]}; using that instead of {max_ngram}")
+            self.max_ngram = int(stored[0])
+
+    def _migrate_autoincrement(self):
+        """
+        Rebuilds a candidates table created without AUTOINCREMENT, whose IDs
+        SQLite could hand out again after a delete while stale postings
+        still carried them. Postings of deleted candidates are dropped first,
+        so no posting outlives its ID.
+        """
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'candidates'"
+        ).fetchone()[0]
+        if "AUTOINCREMENT" in sql.upper():
+            return
+        live = {row[0] for row in self.conn.execute("SELECT id FROM candidates")}
+        with self.conn:
+            for term, segment, blob in list(self.conn.execute("SELECT term, segment, ids FROM postings")):
+                ids = [i for i in _unpack(blob) if i in live]
+                if len(ids) == len(blob) // 4:
+                    continue
+                if ids:
+                    self.conn.execute("UPDATE postings SET ids = ? WHERE term = ? AND segment = ?",
+                                      (_pack(ids), term, segment))
+                else:
+                    self.conn.execute("DELETE FROM postings WHERE term = ? AND segment = ?",
+                                      (term, segment))
+            self.conn.execute("ALTER TABLE candidates RENAME TO candidates_old")
+            self.conn.execute(sql.replace("INTEGER PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT", 1))
+            self.conn.execute("INSERT INTO candidates SELECT * FROM candidates_old")
+            self.conn.execute("DROP TABLE candidates_old")
+        logger.info("🧱 Upgraded CV index IDs to AUTOINCREMENT (deleted IDs are never reused)")
+
+    def contains(self, sha256):
+        row = self.conn.execute("SELECT 1 FROM candidates WHERE sha256 = ?", (sha256,)).fetchone()
+        return row is not None
+
+    def add(self, documents):
+        """
+        Indexes new CVs as one segment. Already indexed hashes are skipped.
+
+        Args:
+            documents (Iterable[Tuple[str, dict]]): (sha256, data) pairs where
+                data holds `text` plus the fields in FIELDS
+
+        Returns:
+            int: Number of CVs added
+        """
+        postings = defaultdict(list)
+        added = 0
+        now = time.time()
+        with self.conn:
+            for sha256, data in documents:
+                if not sha256 or not data or self.contains(sha256):
+                    continue
+                values = [data.get(field) for field in FIELDS]
+                values = [str(v) if v is not None else None for v in values]
+                cursor = self.conn.execute(
+                    f"INSERT INTO candidates (sha256, {', '.join(FIELDS)}, added) "
+                    f"VALUES (?, {', '.join('?' for _ in FIELDS)}, ?)",
+                    [sha256] + values + [now]
+                )
+                for term in _terms(document_of(data).tokens, self.max_ngram):
+                    postings[term].append(cursor.lastrowid)
+                added += 1
+
+            if postings:
+                segment = self.conn.execute(
+                    "SELECT COALESCE(MAX(segment), 0) + 1 FROM postings"
+                ).fetchone()[0]
+                self.conn.executemany(
+                    "INSERT INTO postings (term, segment, ids) VALUES (?, ?, ?)",
+                    ((term, segment, _pack(ids)) for term, ids in postings.items())
+                )
+        if added:
+            logger.info(f"🗂️ Indexed {added} new CV(s)")
+        return added
+
+    def delete(self, sha256):
+        """
+        Removes a candidate; its postings disappear from results at once and
+        from disk at the next `compact`. IDs are never reused, so stale
+        postings cannot match a later candidate.
+        """
+        with self.conn:
+            return self.conn.execute("DELETE FROM candidates WHERE sha256 = ?", (sha256,)).rowcount > 0
+
+    def _term_ids(self, term):
+        ids = set()
+        for (blob,) in self.conn.execute("SELECT ids FROM postings WHERE term = ?", (term,)):
+            ids.update(_unpack(blob))
+        return ids
+
+    def keyword_ids(self, keyword):
+        """
+        Returns the IDs of candidates whose CV contains the keyword.
+        """
+        terms = keyword_terms(keyword, self.max_ngram)
+        if not terms:
+            return set()
+        ids = self._term_ids(terms[0])
+        for term in terms[1:]:
+            if not ids:
+                break
+            ids &= self._term_ids(term)
+        return ids
+
+    def _rows(self, columns, key, values):
+        """
+        Yields `SELECT columns FROM candidates WHERE key IN values` rows,
+        SQL_IN_CHUNK values per query.
+        """
+        values = list(values)
+        for start in range(0, len(values), SQL_IN_CHUNK):
+            chunk = values[start:start + SQL_IN_CHUNK]
+            yield from self.conn.execute(
+                f"SELECT {', '.join(columns)} FROM candidates "
+                f"WHERE {key} IN ({', '.join('?' for _ in chunk)})", chunk
+            )
+
+    def _matches(self, jd_keywords):
+        """
+        Returns {candidate ID: matched keywords, in JD order} for every
+        candidate matching at least one keyword.
+        """
+        matches = defaultdict(list)
+        for keyword in jd_keywords:
+            for candidate_id in self.keyword_ids(keyword):
+                matches[candidate_id].append(keyword)
+        return matches
+
+    def ata_fields(self, jd_keywords, sha256s):
+        """
+        Scores the given indexed CVs against the JD keywords.
+
+        Args:
+            jd_keywords (Sequence[str]): Keywords from the job description
+            sha256s (Iterable[str]): Content hashes of the CVs to score
+
+        Returns:
+            Dict[str, dict]: sha256 → ata_score, matched_count,
+                total_keywords and matched_keywords, for every hash in the
+                index (CVs matching no keyword score 0); others are absent
+        """
+        jd_keywords = list(jd_keywords)
+        ids = dict(self._rows(("id", "sha256"), "sha256", set(sha256s)))
+        matches = self._matches(jd_keywords) if jd_keywords and ids else {}
+        total = len(jd_keywords)
+        fields = {}
+        for candidate_id, sha256 in ids.items():
+            matched = matches.get(candidate_id, [])
+            fields[sha256] = {
+                "ata_score": round(len(matched) / total * 100, 1) if total else 0.0,
+                "matched_count": len(matched),
+                "total_keywords": total,
+                "matched_keywords": ", ".join(matched),
+            }
+        return fields
+
+    def search(self, jd_keywords, min_score=0.0, limit=None):
+        """
+        Ranks every indexed candidate against the JD keywords (ATA score).
+
+        Args:
+            jd_keywords (Iterable[str]): Keywords from the job description
+            min_score (float): Drop candidates below this ATA score
+            limit (Optional[int]): Return at most this many candidates
+
+        Returns:
+            List[dict]: Candidate fields plus ata_score, matched_count,
+                        total_keywords and matched_keywords, best first
+        """
+        jd_keywords = list(jd_keywords)
+        total = len(jd_keywords)
+        if not total:
+            return []
+
+        matches = self._matches(jd_keywords)
+
+        scored = []
+        for candidate_id, matched in matches.items():
+            score = round(len(matched) / total * 100, 1)
+            if score >= min_score:
+                scored.append((score, candidate_id, matched))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        # Candidate rows one IN query per chunk of ranked IDs, stopping once
+        # limit is reached; deleted (not yet compacted) IDs have no row
+        results = []
+        for start in range(0, len(scored), SQL_IN_CHUNK):
+            chunk = scored[start:start + SQL_IN_CHUNK]
+            rows = {row[0]: row[1:] for row in self._rows(("id",) + FIELDS, "id",
+                                                          (item[1] for item in chunk))}
+            for score, candidate_id, matched in chunk:
+                row = rows.get(candidate_id)
+                if row is None:
+                    continue
+                record = dict(zip(FIELDS, row))
+                record.update({
+                    "ata_score": score,
+                    "matched_count": len(matched),
+                    "total_keywords": total,
+                    "matched_keywords": ", ".join(matched),
+                })
+                results.append(record)
+                if limit and len(results) >= limit:
+                    return results
+        return results
+
+    def compact(self):
+        """
+        Merges all segments into one and drops postings of deleted candidates.
+
+        Returns:
+            int: Number of posting rows after compaction
+        """
+        live = {row[0] for row in self.conn.execute("SELECT id FROM candidates")}
+        merged = defaultdict(set)
+        for term, blob in self.conn.execute("SELECT term, ids FROM postings"):
+            merged[term].update(i for i in _unpack(blob) if i in live)
+
+        with self.conn:
+            self.conn.execute("DELETE FROM postings")
+            self.conn.executemany(
+                "INSERT INTO postings (term, segment, ids) VALUES (?, 0, ?)",
+                ((term, _pack(ids)) for term, ids in merged.items() if ids)
+            )
+        self.conn.execute("VACUUM")
+        rows = self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        logger.info(f"🧱 Compacted index: {len(live)} candidates, {rows} terms")
+        return rows
+
+    def stats(self):
+        conn = self.conn
+        return {
+            "candidates": conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0],
+            "posting_rows": conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            "segments": conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0],
+            "max_ngram": self.max_ngram,
+        }
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    from config import CV_FOLDER
+
+    parser = argparse.ArgumentParser(description="Inverted index over ingested CVs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add_cmd = sub.add_parser("add", help="Index the CVs in a folder")
+    add_cmd.add_argument("--folder", default=CV_FOLDER)
+    search_cmd = sub.add_parser("search", help="Rank indexed CVs against a JD")
+    search_cmd.add_argument("--jd", default=os.path.join(os.path.dirname(__file__), "jd.txt"))
+    search_cmd.add_argument("--limit", type=int, default=20)
+    delete_cmd = sub.add_parser("delete", help="Remove a CV by content hash")
+    delete_cmd.add_argument("sha256")
+    sub.add_parser("compact", help="Merge segments and drop deleted postings")
+    sub.add_parser("stats", help="Show index size")
+    args = parser.parse_args(argv)
+
+    with CVIndex() as index:
+        if args.command == "add":
+            from data_builder import extract_cv_data
+            from extraction_cache import file_sha256
+
+            documents = []
+            for filename in sorted(os.listdir(args.folder)):
+                if not filename.endswith(('.pdf', '.docx')):
+                    continue
+                filepath = os.path.join(args.folder, filename)
+                sha256 = file_sha256(filepath)
+                if index.contains(sha256):
+                    continue
+                data = extract_cv_data(filepath)
+                if data:
+                    data["filename"] = filename
+                    documents.append((sha256, data))
+            print(f"🗂️ Added {index.add(documents)} CV(s)")
+
+        elif args.command == "search":
+            from jd_handler import load_jd_text, extract_keywords_from_jd
+
+            keywords = extract_keywords_from_jd(load_jd_text(args.jd))
+            start = time.perf_counter()
+            results = index.search(keywords, limit=args.limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"🔍 {len(results)} candidate(s) in {elapsed_ms:.1f} ms for {sorted(keywords)}")
+            for r in results:
+                print(f"   {r['ata_score']:5.1f}%  {r['name']}  <{r['email']}>  {r['filename']}")
+
+        elif args.command == "delete":
+            print("🗑️ Deleted" if index.delete(args.sha256) else "⚠️ Not found")
+
+        elif args.command == "compact":
+            index.compact()
+
+        elif args.command == "stats":
+            for key, value in index.stats().items():
+                print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
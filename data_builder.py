@@ -1,23 +1,38 @@
 import os
 import logging
 import shutil
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from docx import Document
-from pdfminer.high_level import extract_text
 
+import extractors
+import cv_document
+import log_setup
+import pdf_backends
+from pdf_backends import extract_pdf_text, resolve_pdf_backend
+from extraction_cache import ExtractionCache, file_sha256, code_version
+from cv_document import CVDocument, document_of
+from metrics import timer, stage, record_file
+from log_setup import cv_fields
 from extractors import (
     extract_name,
+    extract_names,
     extract_email,
     extract_skills,
     extract_experience,
     extract_education
 )
-from config import CV_FOLDER, FILTERED_FOLDER, STATIC_JD_KEYWORDS, ATA_SCORE_THRESHOLD
+from config import (
+    CV_FOLDER, FILTERED_FOLDER, STATIC_JD_KEYWORDS, ATA_SCORE_THRESHOLD,
+    NER_BATCH_SIZE, NER_N_PROCESS, CV_WORKERS,
+    PDF_BACKENDS, PDF_MAX_PAGES, PDFMINER_LAPARAMS,
+    EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_MAX_BYTES, EXTRACTION_CACHE_MAX_AGE_DAYS,
+    CV_INDEX_PATH, CV_EMBEDDING_DIR, RESULTS_TOP_K, BLOB_STORE_DIR,
+    STREAM_BATCH_SIZE, ML_BATCH_SIZE
+)
 
 # Set up logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 os.makedirs("rejected_cvs", exist_ok=True)  # Save rejected CVs separately
 
@@ -25,11 +40,15 @@ os.makedirs("rejected_cvs", exist_ok=True)  # Save rejected CVs separately
 def extract_cv_text(filepath):
     """
     Extracts plain text from PDF or DOCX file.
+
+    PDFs go through the configured backends (see pdf_backends), reading at
+    most PDF_MAX_PAGES pages.
     """
     try:
         if filepath.endswith('.pdf'):
-            return extract_text(filepath)
+            return extract_pdf_text(filepath, backends=PDF_BACKENDS, max_pages=PDF_MAX_PAGES)
         elif filepath.endswith('.docx'):
+            from docx import Document
             doc = Document(filepath)
             return "\n".join(para.text for para in doc.paragraphs)
         else:
@@ -40,110 +59,802 @@ def extract_cv_text(filepath):
         return None
 
 
-def extract_cv_data(filepath):
+def extract_cv_data(filepath, with_name=True):
     """
     Extracts structured fields from the CV using NLP and regex.
+
+    Args:
+        filepath (str): Path to the PDF/DOCX file
+        with_name (bool): Run spaCy NER for the name; pass False when names
+            are extracted later in one batch with `extract_names`
+
+    Returns:
+        Optional[dict]: The fields plus `text`, its normalized `doc` (see
+            cv_document) and `timings` (seconds per step, see
+            metrics.record_file); None if no text was extracted
     """
-    text = extract_cv_text(filepath)
+    timings = {}
+    with timer(timings, f"extract_text.{os.path.splitext(filepath)[1].lstrip('.').lower()}"):
+        text = extract_cv_text(filepath)
     if not text:
         return None
 
-    return {
-        'name': extract_name(text),
-        'email': extract_email(text),
-        'skills': extract_skills(text),
-        'experience': extract_experience(text),
-        'education': extract_education(text),
-        'text': text  # Needed for ML and scoring
-    }
+    with timer(timings, "normalize"):
+        doc = CVDocument(text)
 
+    data = {'name': None}
+    if with_name:
+        with timer(timings, "extract_name"):
+            data['name'] = extract_name(doc)
+    for field, func in (('email', extract_email), ('skills', extract_skills),
+                        ('experience', extract_experience), ('education', extract_education)):
+        with timer(timings, f"extract_{field}"):
+            data[field] = func(doc)
+    data['text'] = text  # Needed for ML and scoring
+    data['doc'] = doc    # Shared by ATA scoring, the CV index and the ML step
+    data['timings'] = timings
+    return data
 
-def create_candidates_df_with_ata(cv_folder=CV_FOLDER,
-                                  jd_keywords=STATIC_JD_KEYWORDS,
-                                  filtered_folder=FILTERED_FOLDER,
-                                  ata_score_threshold=ATA_SCORE_THRESHOLD,
-                                  use_model=True):
+
+# Cache entries are only reused while the extraction code is unchanged and
+# PDFs are read by the same backend (installing PyMuPDF switches it) and
+# page limit
+EXTRACTOR_VERSION = code_version(
+    extractors, cv_document, pdf_backends, extract_cv_text, extract_cv_data,
+    PDF_BACKENDS, resolve_pdf_backend(PDF_BACKENDS), PDF_MAX_PAGES, PDFMINER_LAPARAMS
+)
+
+
+def open_extraction_cache(cache_dir=EXTRACTION_CACHE_DIR):
     """
-    Processes CVs from the specified folder, extracts data, calculates ATA score,
-    predicts ML score (if enabled), and saves results into a filtered folder.
+    Opens the persistent extraction cache, or returns None if disabled/unavailable.
+    """
+    if not cache_dir:
+        return None
+    try:
+        return ExtractionCache(
+            cache_dir, EXTRACTOR_VERSION,
+            max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+            max_bytes=EXTRACTION_CACHE_MAX_BYTES,
+            max_age_days=EXTRACTION_CACHE_MAX_AGE_DAYS
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Extraction cache unavailable, parsing without it - {e}")
+        return None
+
+
+def _content_hash(filepath):
+    try:
+        return file_sha256(filepath)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not hash {filepath} - {e}")
+        return None
+
+
+def calculate_ata_score(data, jd_keywords):
+    """
+    Adds ATA scoring fields (score, matched keywords) to extracted CV data.
+
+    Keywords match whole tokens only (see ata_scoring); to score many CVs,
+    use `ata_scoring.score_candidates` on all of them at once.
+
+    Args:
+        data (dict): Output of `extract_cv_data`
+        jd_keywords (Sequence[str]): Keywords from the job description
 
     Returns:
-        pd.DataFrame: Ranked candidate data
+        dict: The same dict, updated in place
     """
-    from ml_model import predict_suitability  # Avoid circular imports
+    from ata_scoring import score_candidates
 
-    os.makedirs(filtered_folder, exist_ok=True)
-    candidates = []
+    score_candidates([data], jd_keywords)
+    return data
 
-    for filename in os.listdir(cv_folder):
-        if not filename.endswith(('.pdf', '.docx')):
-            continue
 
-        filepath = os.path.join(cv_folder, filename)
-        data = extract_cv_data(filepath)
+def _open_index(index_path):
+    """
+    Opens the CV index for ATA scoring, or returns None if disabled/unavailable.
+    """
+    if not index_path:
+        return None
+    try:
+        from cv_index import CVIndex
+
+        return CVIndex(index_path)
+    except Exception as e:
+        logger.warning(f"⚠️ CV index unavailable, matching CV texts instead - {e}")
+        return None
+
+
+def _score_ata(candidates, matcher, index=None):
+    """
+    Sets the ATA fields of every candidate.
+
+    CVs already in the CV index (extraction adds new ones first) are answered
+    from its postings; the rest (unhashed, or when the index is disabled or
+    failed to update) are matched against their text.
+
+    Args:
+        matcher (KeywordMatcher): Matcher built from the JD keywords
+        index (Optional[CVIndex]): Open index, or None
+    """
+    from ata_scoring import score_candidates
+
+    indexed = {}
+    if index is not None:
+        try:
+            hashes = [c["sha256"] for c in candidates if c.get("sha256")]
+            indexed = index.ata_fields(matcher.keywords, hashes)
+        except Exception as e:
+            logger.warning(f"⚠️ CV index lookup failed, matching CV texts instead - {e}")
+    unindexed = []
+    for c in candidates:
+        fields = indexed.get(c.get("sha256"))
+        if fields is None:
+            unindexed.append(c)
+        else:
+            c.update(fields)
+    if unindexed:
+        score_candidates(unindexed, matcher)
+
+
+def _init_worker(log_queue=None, log_level=logging.INFO):
+    """
+    Process pool initializer: routes logging to the parent's writer. Workers
+    do not load spaCy; names come from the parent's batched NER pass.
+    """
+    if log_queue is not None:
+        log_setup.init_worker_logging(log_queue, log_level)
+
+
+def _parse(filepath):
+    # Names are left to the parent's single batched NER pass (extract_names)
+    return extract_cv_data(filepath, with_name=False)
+
 
+def _parser_pool(workers):
+    """
+    Returns a process pool whose workers log to this process.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(log_setup.worker_queue(), logging.getLogger().level))
+
+
+def _parse_all(filepaths, workers, on_result=None, pool=None):
+    """
+    Parses every file, in parallel when workers > 1.
+
+    Args:
+        on_result (Optional[Callable[[], None]]): Called after each file
+        pool (Optional[ProcessPoolExecutor]): Pool to reuse (see _parser_pool)
+            instead of starting one for this call
+
+    Returns:
+        List[Optional[dict]]: One result per filepath, in the same order
+    """
+    def collect(results):
+        collected = []
+        for data in results:
+            collected.append(data)
+            if on_result:
+                on_result()
+        return collected
+
+    if pool is None and (workers <= 1 or len(filepaths) <= 1):
+        return collect(_parse(fp) for fp in filepaths)
+
+    workers = min(workers, len(filepaths)) or 1
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    if pool is not None:
+        return collect(pool.map(_parse, filepaths, chunksize=chunksize))
+    logger.info(f"⚙️ Parsing {len(filepaths)} CVs with {workers} worker processes")
+    with _parser_pool(workers) as pool:
+        return collect(pool.map(_parse, filepaths, chunksize=chunksize))
+
+
+def extract_candidates(cv_folder=CV_FOLDER,
+                       workers=CV_WORKERS,
+                       cache_dir=EXTRACTION_CACHE_DIR,
+                       index_path=CV_INDEX_PATH,
+                       progress=None):
+    """
+    Extracts every CV in the folder once, independent of any JD.
+
+    Cached extractions of unchanged files are reused, the rest are parsed
+    (in parallel when workers > 1) and names filled in with one NER batch.
+    New CVs are written to the extraction cache and the CV index.
+
+    Args:
+        workers (int): Parser processes; 1 parses in this process, more uses a
+            process pool for text and field extraction
+        cache_dir (Optional[str]): Extraction cache folder; None disables it
+        index_path (Optional[str]): CV index (see cv_index) that new CVs are
+            added to; None disables indexing
+        progress (Optional[Callable[[str, int, int], None]]): Called as
+            progress("parsed", done, total)
+
+    Returns:
+        Tuple[List[dict], dict]: Extracted CV data (plus `filename`, `filepath`
+            and `sha256` when hashed) in filename order, and cache stats
+            {"hits", "misses"}
+    """
+    filenames = _cv_filenames(cv_folder)
+    filepaths = [os.path.join(cv_folder, f) for f in filenames]
+    report = progress or (lambda stage, done, total: None)
+    done = 0
+
+    def on_done(count):
+        nonlocal done
+        done += count
+        report("parsed", done, len(filepaths))
+
+    cache = open_extraction_cache(cache_dir)
+    need_hashes = cache is not None or bool(index_path)
+    try:
+        candidates = _extract_files(filenames, filepaths, cache, index_path, need_hashes,
+                                    workers, on_done=on_done)
+    finally:
+        if cache:
+            cache.close()
+
+    stats = {"hits": cache.hits, "misses": cache.misses} if cache else {"hits": 0, "misses": 0}
+    return candidates, stats
+
+
+def _cv_filenames(cv_folder):
+    return sorted(f for f in os.listdir(cv_folder) if f.endswith(('.pdf', '.docx')))
+
+
+def _extract_files(filenames, filepaths, cache, index_path, need_hashes, workers,
+                   pool=None, on_done=None):
+    """
+    Extracts a list of CV files: reuses cached extractions of unchanged
+    files, parses the rest, fills in names with one NER batch, and writes new
+    CVs to the extraction cache and the CV index.
+
+    Args:
+        cache (Optional[ExtractionCache]): Open cache, or None
+        need_hashes (bool): Hash the files even without a cache/index
+        pool (Optional[ProcessPoolExecutor]): Parser pool to reuse
+        on_done (Optional[Callable[[int], None]]): Called with the number of
+            files just finished
+
+    Returns:
+        List[dict]: Extracted CV data plus `filename`, `filepath` and
+            `sha256` (None when not hashed), in input order
+    """
+    on_done = on_done or (lambda count: None)
+
+    with stage("hash_files", items=len(filepaths)):
+        hashes = [_content_hash(fp) for fp in filepaths] if need_hashes else [None] * len(filepaths)
+    with stage("cache_lookup", items=len(filepaths)):
+        results = [cache.get(h) if h else None for h in hashes] if cache else [None] * len(filepaths)
+
+    misses = [i for i, data in enumerate(results) if data is None]
+    on_done(len(filepaths) - len(misses))
+
+    with stage("parse", items=len(misses)):
+        parsed = _parse_all([filepaths[i] for i in misses], workers,
+                            on_result=lambda: on_done(1), pool=pool)
+    log_parsed = logger.isEnabledFor(logging.DEBUG)
+    for i, data in zip(misses, parsed):
+        if data:
+            timings = data.pop('timings', {})
+            record_file(filenames[i], timings)
+            if log_parsed:
+                logger.debug(f"📄 Parsed → {filenames[i]}",
+                             extra=cv_fields(filenames[i], "parse", duration=round(sum(timings.values()), 4)))
+        results[i] = data
+
+    candidates = []
+    for filename, filepath, h, data in zip(filenames, filepaths, hashes, results):
         if not data:
             logger.warning(f"⚠️ Skipping unreadable file: {filename}")
             continue
+        data['filename'] = filename
+        data['filepath'] = filepath
+        data['sha256'] = h
+        candidates.append(data)
 
-        # ATA Scoring
-        cv_text = data['text'].lower()
-        matched_keywords = [kw for kw in jd_keywords
-                            if kw.lower() in cv_text.lower()]
+    # Name extraction: one batched NER pass here, for parsed and cached CVs alike
+    pending = [c for c in candidates if c["name"] is None]
+    with stage("extract_names", items=len(pending)):
+        names = extract_names([document_of(c) for c in pending],
+                              batch_size=NER_BATCH_SIZE, n_process=NER_N_PROCESS)
+    for c, name in zip(pending, names):
+        c["name"] = name
 
-        matched_count = len(matched_keywords)
-        total_keywords = len(jd_keywords)
-        ata_score = round((matched_count / total_keywords) * 100, 1) if total_keywords > 0 else 0
+    if cache:
+        for i in misses:
+            if results[i] and hashes[i]:
+                cache.put(hashes[i], results[i])
 
-        data.update({
-            'filename': filename,
-            'ata_score': ata_score,
-            'matched_count': matched_count,
-            'total_keywords': total_keywords,
-            'matched_keywords': ", ".join(matched_keywords)
-        })
+    # Grow the historical index with CVs it has not seen yet
+    if index_path:
+        try:
+            from cv_index import CVIndex
 
-        candidates.append(data)
+            with stage("index_update"), CVIndex(index_path) as index:
+                index.add((h, data) for h, data in zip(hashes, results) if h and data)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update CV index - {e}")
 
-        # Save or Reject CV
-        if ata_score >= ata_score_threshold:
-            shutil.copy(filepath, os.path.join(filtered_folder, filename))
-            logger.info(f"✅ Matched (ATA Score: {ata_score}%) → {filename}")
-        else:
-            shutil.copy(filepath, os.path.join("rejected_cvs", filename))
-            logger.info(f"🗄️ Archived (ATA Score: {ata_score}%) → {filename}")
+    return candidates
 
-    # ML Prediction (Optional)
-    if use_model:
-        all_texts = [c["text"].lower() for c in candidates if "text" in c]
-        predictions = predict_suitability(all_texts)
-        for i, pred in enumerate(predictions):
-            candidates[i]["ml_score"] = round(pred * 100, 1)
-    else:
+
+def iter_candidate_batches(cv_folder=CV_FOLDER,
+                           batch_size=STREAM_BATCH_SIZE,
+                           workers=CV_WORKERS,
+                           cache_dir=EXTRACTION_CACHE_DIR,
+                           index_path=CV_INDEX_PATH,
+                           need_hashes=False,
+                           progress=None):
+    """
+    Extracts the CVs of a folder batch by batch, as a generator.
+
+    Like extract_candidates, but only one batch of CV texts is in memory at
+    a time: the next batch is read once the caller asks for it. The cache,
+    index and parser pool are opened once for the whole folder.
+
+    Args:
+        batch_size (int): Files per batch
+        need_hashes (bool): Hash the files even without a cache/index (e.g.
+            for the embedding store)
+        progress (Optional[Callable[[str, int, int], None]]): Called as
+            progress("parsed", done, total)
+
+    Yields:
+        List[dict]: Extracted CV data of one batch, in filename order
+    """
+    filenames = _cv_filenames(cv_folder)
+    report = progress or (lambda stage, done, total: None)
+    done = 0
+
+    def on_done(count):
+        nonlocal done
+        done += count
+        report("parsed", done, len(filenames))
+
+    cache = open_extraction_cache(cache_dir)
+    need_hashes = need_hashes or cache is not None or bool(index_path)
+    pool = _parser_pool(min(workers, len(filenames))) if workers > 1 and len(filenames) > 1 else None
+    if pool:
+        logger.info(f"⚙️ Parsing {len(filenames)} CVs with {workers} worker processes")
+    try:
+        for start in range(0, len(filenames), batch_size):
+            names = filenames[start:start + batch_size]
+            yield _extract_files(names, [os.path.join(cv_folder, f) for f in names], cache,
+                                 index_path, need_hashes, workers, pool=pool, on_done=on_done)
+    finally:
+        if pool:
+            pool.shutdown()
+        if cache:
+            logger.info(f"🗃️ Extraction cache: {cache.hits} hits, {cache.misses} misses")
+            cache.close()
+
+
+_logged_model_version = None
+
+
+def add_ml_scores(candidates, use_model=True, progress=None, batch_size=ML_BATCH_SIZE):
+    """
+    Sets `ml_score` on every candidate (None when the model is disabled).
+
+    The model sees batch_size CVs per call, so no list of every CV's text is
+    built.
+    """
+    global _logged_model_version
+
+    if not use_model:
         for c in candidates:
             c["ml_score"] = None
+        return
 
-    # Final processing
+    from ml_model import predict_suitability, model_info  # Avoid circular imports
+
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        with stage("ml_prediction", items=len(batch)):
+            predictions = predict_suitability([document_of(c).normalized for c in batch])
+        for c, pred in zip(batch, predictions):
+            c["ml_score"] = round(pred * 100, 1)
+    if progress:
+        progress("scored", len(candidates), len(candidates))
+    info = model_info()
+    if info and info["version"] != _logged_model_version:
+        _logged_model_version = info["version"]
+        logger.info(f"🤖 ML scores from model version {info['version']} (loaded {info['loaded_at']})")
+
+
+def add_semantic_scores(candidates, jd_text, embeddings_dir=CV_EMBEDDING_DIR):
+    """
+    Sets `semantic_score` (JD/CV embedding similarity × 100) on every candidate.
+
+    New CVs are embedded into the store at embeddings_dir first; the score is
+    None when the store is disabled or the encoder is unavailable.
+    """
+    scores = [None] * len(candidates)
+    if embeddings_dir and jd_text and candidates:
+        try:
+            from embedding_store import semantic_scores
+
+            for c in candidates:
+                if not c.get("sha256"):
+                    c["sha256"] = _content_hash(c["filepath"])
+            with stage("semantic_scoring", items=len(candidates)):
+                scores = semantic_scores(candidates, jd_text, directory=embeddings_dir)
+        except Exception as e:
+            logger.warning(f"⚠️ Semantic scoring unavailable - {e}")
+    for c, score in zip(candidates, scores):
+        c["semantic_score"] = score
+
+
+def place_files(candidates, filtered_folder, ata_score_threshold, blob_dir=BLOB_STORE_DIR,
+                placed=None):
+    """
+    Puts every scored CV into the filtered or the rejected folder.
+
+    With a blob store each file is stored once by content hash and the
+    folders get hardlinks to it; a manifest of the placement is saved per run.
+    Without one (or if the store fails) the files are copied.
+
+    Args:
+        placed (Optional[dict]): Collects the placement ({view: {filename:
+            sha256}}) across calls instead of writing a manifest now; the
+            caller writes it (see write_run_manifest)
+    """
+    store = None
+    if blob_dir:
+        try:
+            from blob_store import BlobStore
+
+            store = BlobStore(blob_dir)
+        except Exception as e:
+            logger.warning(f"⚠️ Blob store unavailable, copying files - {e}")
+
+    write_manifest = placed is None
+    if placed is None:
+        placed = {}
+    placed.setdefault("filtered", {})
+    placed.setdefault("rejected", {})
     for c in candidates:
-        if "text" in c:
-            del c["text"]
+        filename, ata_score = c['filename'], c['ata_score']
+        view, folder = (("filtered", filtered_folder) if ata_score >= ata_score_threshold
+                        else ("rejected", "rejected_cvs"))
+
+        # Save or Reject CV
+        if store:
+            c['sha256'] = store.place(c['filepath'], folder, sha256=c.get('sha256'))
+            placed[view][filename] = c['sha256']
+        else:
+            shutil.copy(c['filepath'], os.path.join(folder, filename))
+        fields = cv_fields(filename, "file_placement", score=ata_score, view=view)
+        if view == "filtered":
+            logger.info(f"✅ Matched (ATA Score: {ata_score}%) → {filename}", extra=fields)
+        else:
+            logger.info(f"🗄️ Archived (ATA Score: {ata_score}%) → {filename}", extra=fields)
+
+    if store and write_manifest:
+        write_run_manifest(placed, blob_dir)
+
+
+def write_run_manifest(placed, blob_dir=BLOB_STORE_DIR):
+    """
+    Saves a run's placement ({view: {filename: sha256}}) as a blob store manifest.
+    """
+    if not blob_dir or not any(placed.values()):
+        return
+    try:
+        from blob_store import BlobStore
+
+        BlobStore(blob_dir).write_manifest(f"run-{datetime.now():%Y%m%d-%H%M%S-%f}", placed)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write run manifest - {e}")
+
+
+# Column order of ranked results
+RESULT_COLUMNS = [
+    "filename", "name", "email", "skills", "experience", "education",
+    "ata_score", "ml_score", "semantic_score",
+    "matched_count", "total_keywords", "matched_keywords"
+]
+
+
+def rank_candidates(records):
+    """
+    Builds the ranked results table: best ATA score first, one row per person.
+
+    Args:
+        records (Iterable[dict]): Candidate fields plus ATA/ML scores
 
-    df = pd.DataFrame(candidates)
+    Returns:
+        pd.DataFrame: Ranked candidate data (empty if there were no records)
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([{k: v for k, v in r.items() if k in RESULT_COLUMNS} for r in records])
     if df.empty:
-        logger.warning("⚠️ No valid CVs were matched after processing.")
         return df
 
     df["ata_score"] = pd.to_numeric(df["ata_score"], errors='coerce')
     df = df.sort_values(by="ata_score", ascending=False)
     df.drop_duplicates(subset=["email", "name"], inplace=True)
     df["education"] = df["education"].str.replace(";", "\n")
+    return df[[col for col in RESULT_COLUMNS if col in df.columns]]
+
+
+def create_candidates_df_with_ata(cv_folder=CV_FOLDER,
+                                  jd_keywords=STATIC_JD_KEYWORDS,
+                                  filtered_folder=FILTERED_FOLDER,
+                                  ata_score_threshold=ATA_SCORE_THRESHOLD,
+                                  use_model=True,
+                                  workers=CV_WORKERS,
+                                  cache_dir=EXTRACTION_CACHE_DIR,
+                                  index_path=CV_INDEX_PATH,
+                                  jd_text=None,
+                                  embeddings_dir=CV_EMBEDDING_DIR,
+                                  top_k=RESULTS_TOP_K,
+                                  blob_dir=BLOB_STORE_DIR,
+                                  progress=None):
+    """
+    Processes CVs from the specified folder, extracts data, calculates ATA score,
+    predicts ML score (if enabled), and saves results into a filtered folder.
+
+    Args:
+        workers (int): Parser processes; 1 parses in this process, more uses a
+            process pool for text and field extraction
+        cache_dir (Optional[str]): Extraction cache folder; None disables it
+        index_path (Optional[str]): CV index (see cv_index) that new CVs are
+            added to and ATA scores are looked up in; None disables indexing
+            and matches every CV's text
+        jd_text (Optional[str]): JD for the semantic score; defaults to the
+            keywords joined
+        embeddings_dir (Optional[str]): CV embedding store (see
+            embedding_store); None disables the semantic score
+        top_k (Optional[int]): Only the k best candidates by ATA score are
+            ML-scored and returned; None returns everyone
+        blob_dir (Optional[str]): Content-addressed store (see blob_store) the
+            filtered/rejected folders hardlink into; None copies the files
+        progress (Optional[Callable[[str, int, int], None]]): Called as
+            progress(stage, done, total) with stage "parsed" or "scored"
+
+    Returns:
+        pd.DataFrame: Ranked candidate data; df.attrs["total_candidates"] and
+            df.attrs["below_cutoff"] count everyone, including those not returned
+    """
+    from ata_scoring import KeywordMatcher
+    from ranking import select_top_candidates
+
+    os.makedirs(filtered_folder, exist_ok=True)
+    candidates, cache_stats = extract_candidates(cv_folder, workers=workers, cache_dir=cache_dir,
+                                                 index_path=index_path, progress=progress)
 
-    # Column ordering
-    expected_cols = [
-        "filename", "name", "email", "skills", "experience", "education",
-        "ata_score", "ml_score", "matched_count", "total_keywords", "matched_keywords"
-    ]
-    df = df[[col for col in expected_cols if col in df.columns]]
+    # ATA scoring: looked up in the CV index, which extraction just updated
+    index = _open_index(index_path)
+    try:
+        with stage("ata_scoring", items=len(candidates)):
+            _score_ata(candidates, KeywordMatcher(list(jd_keywords)), index)
+    finally:
+        if index:
+            index.close()
+
+    # Keep the top k, picked from the ATA score array; the rest are only
+    # counted, so their texts are released as soon as they are scored
+    with stage("ranking", items=len(candidates)):
+        ranked, below_cutoff = select_top_candidates(candidates, top_k)
+        winners = {id(c) for c in ranked}
+        for c in candidates:
+            if id(c) not in winners:
+                c.pop("text", None)
+                c.pop("doc", None)
+
+    with stage("file_placement", items=len(candidates)):
+        place_files(candidates, filtered_folder, ata_score_threshold, blob_dir=blob_dir)
+    processed = len(candidates)
+    del candidates
+
+    # ML Prediction (Optional)
+    add_ml_scores(ranked, use_model=use_model, progress=progress)
+
+    # Semantic similarity to the JD (one matrix-vector product over the store)
+    add_semantic_scores(ranked, jd_text or ", ".join(sorted(jd_keywords)),
+                        embeddings_dir=embeddings_dir)
+
+    # Final processing
+    df = rank_candidates(ranked)
+    df.attrs["total_candidates"] = len(ranked) + below_cutoff
+    df.attrs["below_cutoff"] = below_cutoff
+    if df.empty:
+        logger.warning("⚠️ No valid CVs were matched after processing.")
+        return df
+
+    logger.info(f"📊 Summary: {processed} CVs processed, {len(df)} matched and saved"
+                f"{f' ({below_cutoff} below the top {top_k} not kept)' if below_cutoff else ''}. "
+                f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+    return df
+
+
+def _semantic_batch_scorer(jd_text, embeddings_dir=CV_EMBEDDING_DIR):
+    """
+    Returns a function that embeds a batch of candidates into the store and
+    sets their `semantic_score`, or None when semantic scoring is unavailable.
+    The store is opened and the JD encoded once.
+    """
+    if not embeddings_dir or not jd_text:
+        return None
+    try:
+        from embedding_store import EmbeddingStore, encode
+
+        store = EmbeddingStore(embeddings_dir)
+        query = encode([jd_text])[0]
+    except Exception as e:
+        logger.warning(f"⚠️ Semantic scoring unavailable - {e}")
+        return None
+
+    def score(batch):
+        scores = [None] * len(batch)
+        try:
+            with stage("semantic_scoring", items=len(batch)):
+                store.add((c.get("sha256"), c["filename"], c["text"]) for c in batch)
+                similarities = store.scores_for(query, [c.get("sha256") for c in batch])
+            scores = [None if s != s else round(float(s) * 100, 1) for s in similarities]
+        except Exception as e:
+            logger.warning(f"⚠️ Semantic scoring failed for a batch - {e}")
+        for c, value in zip(batch, scores):
+            c["semantic_score"] = value
+
+    return score
+
+
+def screen_cvs_streaming(cv_folder=CV_FOLDER,
+                         jd_keywords=STATIC_JD_KEYWORDS,
+                         filtered_folder=FILTERED_FOLDER,
+                         ata_score_threshold=ATA_SCORE_THRESHOLD,
+                         use_model=True,
+                         workers=CV_WORKERS,
+                         cache_dir=EXTRACTION_CACHE_DIR,
+                         index_path=CV_INDEX_PATH,
+                         jd_text=None,
+                         embeddings_dir=CV_EMBEDDING_DIR,
+                         top_k=RESULTS_TOP_K,
+                         blob_dir=BLOB_STORE_DIR,
+                         batch_size=STREAM_BATCH_SIZE,
+                         results_csv=None,
+                         progress=None):
+    """
+    Streaming form of create_candidates_df_with_ata whose peak memory does
+    not grow with the number of CVs.
 
-    logger.info(f"📊 Summary: {len(candidates)} CVs processed, {len(df)} matched and saved.")
+    CVs go through extraction, ATA scoring, file placement, ML and semantic
+    scoring one batch at a time; a batch's texts are dropped as soon as it is
+    scored. Every scored CV is appended to results_csv when its batch
+    finishes, and only the top_k candidates (without text) are held for the
+    returned table. What still grows per CV is small metadata: the run's
+    blob manifest entry and the file list.
+
+    Unlike create_candidates_df_with_ata, every CV is ML- and semantically
+    scored (the final top k is not known while streaming), and below_cutoff
+    counts CVs rather than distinct people.
+
+    Args:
+        batch_size (int): CVs per batch, which is also the ML micro-batch
+        results_csv (Optional[str]): CSV receiving one row per scored CV
+            (RESULT_COLUMNS, in filename order, unsorted); None writes nothing
+        Others: As for create_candidates_df_with_ata
+
+    Returns:
+        pd.DataFrame: Ranked top-k candidate data, with df.attrs
+            "total_candidates" and "below_cutoff"
+    """
+    import csv
+    from ata_scoring import KeywordMatcher
+    from ranking import StreamingTopK
+
+    os.makedirs(filtered_folder, exist_ok=True)
+    matcher = KeywordMatcher(list(jd_keywords))
+    top = StreamingTopK(top_k)
+    placed = {}
+    semantic = _semantic_batch_scorer(jd_text or ", ".join(sorted(jd_keywords)), embeddings_dir)
+    total = len(_cv_filenames(cv_folder))
+    scored = 0
+
+    out = open(results_csv, "w", newline="", encoding="utf-8") if results_csv else None
+    index = _open_index(index_path)
+    try:
+        writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS, extrasaction="ignore") if out else None
+        if writer:
+            writer.writeheader()
+        for batch in iter_candidate_batches(cv_folder, batch_size=batch_size, workers=workers,
+                                            cache_dir=cache_dir, index_path=index_path,
+                                            need_hashes=semantic is not None, progress=progress):
+            with stage("ata_scoring", items=len(batch)):
+                _score_ata(batch, matcher, index)
+            with stage("file_placement", items=len(batch)):
+                place_files(batch, filtered_folder, ata_score_threshold, blob_dir=blob_dir, placed=placed)
+            add_ml_scores(batch, use_model=use_model, batch_size=batch_size)
+            if semantic:
+                semantic(batch)
+
+            with stage("ranking", items=len(batch)):
+                for c in batch:
+                    c.setdefault("semantic_score", None)
+                    del c["text"]
+                    c.pop("doc", None)
+                    top.push(c)
+            if writer:
+                writer.writerows(batch)
+                out.flush()
+            scored += len(batch)
+            if progress:
+                progress("scored", scored, total)
+    finally:
+        if index:
+            index.close()
+        if out:
+            out.close()
+
+    write_run_manifest(placed, blob_dir)
+    kept, below_cutoff = top.result()
+    df = rank_candidates(kept)
+    df.attrs["total_candidates"] = len(kept) + below_cutoff
+    df.attrs["below_cutoff"] = below_cutoff
+    if df.empty:
+        logger.warning("⚠️ No valid CVs were matched after processing.")
+        return df
+
+    logger.info(f"📊 Summary: {scored} CVs streamed in batches of {batch_size}, "
+                f"top {len(df)} kept{f' ({below_cutoff} below the cutoff)' if below_cutoff else ''}"
+                f"{f'; all rows in {results_csv}' if results_csv else ''}.")
     return df
+
+
+def screen_multiple_jds(jd_keywords_by_name,
+                        cv_folder=CV_FOLDER,
+                        use_model=True,
+                        workers=CV_WORKERS,
+                        cache_dir=EXTRACTION_CACHE_DIR,
+                        index_path=CV_INDEX_PATH,
+                        top_k=RESULTS_TOP_K):
+    """
+    Screens one CV folder against several job descriptions.
+
+    Every CV is parsed (and ML-scored) once; ATA scores for all JDs come from
+    a single keyword matrix over the corpus. No files are copied.
+
+    Args:
+        jd_keywords_by_name (Mapping[str, Iterable[str]]): JD name → keywords
+        top_k (Optional[int]): Candidates kept per JD ranking; None keeps all
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], pd.DataFrame]: Ranked candidates per JD,
+            and a combined table with one `ata_<JD name>` score column per JD
+    """
+    import pandas as pd
+    from ata_scoring import score_candidates_multi
+    from ranking import select_top_candidates
+
+    jd_keywords_by_name = {name: list(kws) for name, kws in jd_keywords_by_name.items()}
+    candidates, cache_stats = extract_candidates(cv_folder, workers=workers,
+                                                 cache_dir=cache_dir, index_path=index_path)
+    add_ml_scores(candidates, use_model=use_model)
+    with stage("ata_scoring", items=len(candidates) * len(jd_keywords_by_name)):
+        scored = score_candidates_multi(candidates, jd_keywords_by_name)
+
+    ranked = {
+        name: rank_candidates(select_top_candidates(
+            [{**c, **fields} for c, fields in zip(candidates, rows)], top_k
+        )[0])
+        for name, rows in scored.items()
+    }
+
+    combined = pd.DataFrame({
+        "filename": [c["filename"] for c in candidates],
+        "name": [c["name"] for c in candidates],
+        "email": [c["email"] for c in candidates],
+        "ml_score": [c["ml_score"] for c in candidates],
+        **{f"ata_{name}": [fields["ata_score"] for fields in rows] for name, rows in scored.items()},
+    })
+
+    logger.info(f"📊 Summary: {len(candidates)} CVs screened against {len(scored)} JDs. "
+                f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+    return ranked, combined
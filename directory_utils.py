@@ -5,11 +5,10 @@ import logging
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # === Configuration flags ===
-CLEAN_BEFORE_RUN = True         # Delete previous CVs before run
-ARCHIVE_OLD_FILTERED = True     # Backup filtered CVs before deletion
+CLEAN_BEFORE_RUN = False        # Delete previous CVs before run (incremental mail sync keeps them)
+ARCHIVE_OLD_FILTERED = True     # Keep the previous filtered CVs as a timestamped folder
 
 
 def manage_directories(cv_folder="CVs", filtered_folder="filtered_cvs"):
@@ -18,7 +17,8 @@ def manage_directories(cv_folder="CVs", filtered_folder="filtered_cvs"):
 
     Actions:
     - Removes old CVs if CLEAN_BEFORE_RUN is True
-    - Archives previous filtered CVs if ARCHIVE_OLD_FILTERED is True
+    - Archives previous filtered CVs if ARCHIVE_OLD_FILTERED is True (the
+      folder is renamed, not copied; its files are hardlinks into the blob store)
     - Recreates empty 'CVs' and 'filtered_cvs' folders
 
     Args:
@@ -45,10 +45,11 @@ def manage_directories(cv_folder="CVs", filtered_folder="filtered_cvs"):
         if ARCHIVE_OLD_FILTERED:
             timestamp = time.strftime("%Y%m%d-%H%M%S")
             archive_path = f"{filtered_folder}_{timestamp}"
-            shutil.copytree(filtered_folder, archive_path)
+            os.rename(filtered_folder, archive_path)
             logger.info(f"📦 Archived old filtered CVs to: {archive_path}")
-        shutil.rmtree(filtered_folder)
-        logger.info(f"🗑️ Removed old filtered folder: {filtered_folder}")
+        else:
+            shutil.rmtree(filtered_folder)
+            logger.info(f"🗑️ Removed old filtered folder: {filtered_folder}")
 
     os.makedirs(filtered_folder)
     logger.info(f"📁 Created new filtered folder: {filtered_folder}")
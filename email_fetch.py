@@ -1,26 +1,227 @@
 import os
+import json
+import base64
+import quopri
 import logging
+from email.header import decode_header, make_header
+from email.utils import decode_rfc2231
+from urllib.parse import unquote
 import imapclient
-import pyzmail
 import ssl, certifi
 ssl_context = ssl.create_default_context(cafile=certifi.where())
 
-from config import EMAIL_SUBJECT_KEYWORDS  # Optional: move subject filters to config
+from config import EMAIL_SUBJECT_KEYWORDS, MAIL_SYNC_STATE_PATH  # Optional: move subject filters to config
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
 
+# Partial fetch tuning
+STRUCTURE_BATCH_SIZE = 200       # Messages per BODYSTRUCTURE fetch
+PART_CHUNK_SIZE = 1024 * 1024    # Octets per BODY.PEEK[section] request
 
-def fetch_cvs_with_static_jd(email, password, folder='INBOX', since_date=None):
+
+def _to_str(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value or ""
+
+
+def _decode_rfc2231_value(value):
+    parts = decode_rfc2231(value)
+    if isinstance(parts, str):
+        return unquote(parts)
+    charset, _, text = parts
+    return unquote(text, encoding=charset or 'utf-8', errors='replace')
+
+
+def _decode_filename(params):
+    """
+    Returns the filename from a flat BODYSTRUCTURE parameter list
+    (name, value, name, value, ...), handling RFC 2047 encoded words and
+    RFC 2231 extended/continued parameters.
+    """
+    if not params:
+        return None
+    values = {_to_str(k).lower(): _to_str(v) for k, v in zip(params[::2], params[1::2])}
+
+    for key in ("filename", "name"):
+        if key in values:
+            return str(make_header(decode_header(values[key])))
+        if key + "*" in values:
+            return _decode_rfc2231_value(values[key + "*"])
+
+        pieces = []
+        for k, v in values.items():
+            index = k[len(key) + 1:].rstrip("*")
+            if k.startswith(key + "*") and index.isdigit():
+                pieces.append((int(index), k.endswith("*"), v))
+        if pieces:
+            pieces.sort()
+            joined = "".join(v for _, _, v in pieces)
+            if pieces[0][1]:
+                return _decode_rfc2231_value(joined)
+            return joined
+    return None
+
+
+def _multipart_children(body):
+    # IMAPClient nests top-level parts in a list; nested bodies stay raw tuples
+    if isinstance(body[0], list):
+        return body[0]
+    if isinstance(body[0], tuple):
+        children = []
+        for part in body:
+            if not isinstance(part, tuple):
+                break
+            children.append(part)
+        return children
+    return None
+
+
+def find_attachment_parts(body, prefix=""):
+    """
+    Walks a BODYSTRUCTURE and yields the attachment parts worth downloading.
+
+    Yields:
+        Tuple[str, str, str]: (section number, filename, transfer encoding)
+        for every part whose filename has an allowed extension
+    """
+    children = _multipart_children(body)
+    if children is not None:
+        for i, part in enumerate(children, 1):
+            yield from find_attachment_parts(part, f"{prefix}.{i}" if prefix else str(i))
+        return
+
+    section = prefix or "1"
+    main_type = _to_str(body[0]).lower()
+    sub_type = _to_str(body[1]).lower()
+
+    if main_type == "message" and sub_type == "rfc822" and len(body) > 8:
+        # Forwarded message: its parts are numbered below this section
+        inner = body[8]
+        inner_prefix = section if _multipart_children(inner) is not None else f"{section}.1"
+        yield from find_attachment_parts(inner, inner_prefix)
+        return
+
+    disposition_index = 9 if main_type == "text" else 8
+    filename = None
+    if len(body) > disposition_index and isinstance(body[disposition_index], tuple):
+        disposition = body[disposition_index]
+        if len(disposition) > 1:
+            filename = _decode_filename(disposition[1])
+    if not filename:
+        filename = _decode_filename(body[2])
+
+    if filename and os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS:
+        yield section, filename, _to_str(body[5]).lower()
+
+
+def download_part(server, msg_id, section, encoding, dest_path, chunk_size=PART_CHUNK_SIZE):
+    """
+    Streams one MIME part to disk with BODY.PEEK[section]<offset.size>
+    requests, decoding base64 chunk by chunk so memory stays bounded.
+    Nothing appears at dest_path unless every chunk was fetched and decoded.
+
+    Returns:
+        int: Number of decoded bytes written
+    """
+    prefix = f"BODY[{section}]".encode()
+    offset = 0
+    written = 0
+    pending = b""
+    qp_chunks = []
+
+    # Decoded into a temp file that replaces dest_path only once the whole
+    # part has arrived, so a failed download never leaves a truncated CV
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as fh:
+            while True:
+                response = server.fetch([msg_id], [f"BODY.PEEK[{section}]<{offset}.{chunk_size}>"])
+                fields = response.get(msg_id, {})
+                chunk = next((v for k, v in fields.items() if k.startswith(prefix)), None)
+                if not chunk:
+                    break
+                offset += len(chunk)
+
+                if encoding == "base64":
+                    data = pending + b"".join(chunk.split())
+                    cut = len(data) - len(data) % 4
+                    decoded = base64.b64decode(data[:cut])
+                    pending = data[cut:]
+                elif encoding == "quoted-printable":
+                    qp_chunks.append(chunk)  # Soft line breaks may straddle chunks
+                    decoded = b""
+                else:
+                    decoded = chunk
+                fh.write(decoded)
+                written += len(decoded)
+
+                if len(chunk) < chunk_size:
+                    break
+
+            if pending:
+                decoded = base64.b64decode(pending + b"=" * (-len(pending) % 4))
+                fh.write(decoded)
+                written += len(decoded)
+            if qp_chunks:
+                decoded = quopri.decodestring(b"".join(qp_chunks))
+                fh.write(decoded)
+                written += len(decoded)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return written
+
+
+def load_sync_state(state_path=MAIL_SYNC_STATE_PATH):
+    """
+    Loads the per-account/folder sync state: {key: {"uidvalidity", "last_uid"}}.
+    """
+    try:
+        with open(state_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Ignoring unreadable sync state {state_path} - {e}")
+        return {}
+
+
+def save_sync_state(state, state_path=MAIL_SYNC_STATE_PATH):
+    """
+    Writes the sync state atomically (temp file + rename).
+    """
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def fetch_cvs_with_static_jd(email, password, folder='INBOX', since_date=None,
+                             incremental=True, state_path=MAIL_SYNC_STATE_PATH):
     """
     Connects to Gmail via IMAP, searches for emails containing CVs or Applications
     since the given date, downloads attachments with allowed extensions (.pdf/.docx),
     and saves them to the 'CVs' folder.
 
+    Only BODYSTRUCTURE is fetched for each message (in batches); the matching
+    attachment parts are then downloaded on their own, in bounded chunks.
+
+    With incremental=True the UIDVALIDITY and highest UID processed are kept
+    per account and folder, and later runs only search messages above that
+    UID. since_date then only applies to the first sync, or to a full resync
+    after the server changes UIDVALIDITY.
+
     Returns:
         List of saved filenames.
     """
@@ -28,22 +229,33 @@ def fetch_cvs_with_static_jd(email, password, folder='INBOX', since_date=None):
         logger.info("📡 Connecting to Gmail IMAP...")
         server = imapclient.IMAPClient('imap.gmail.com', ssl=True, ssl_context=ssl_context)
         server.login(email, password)
-        server.select_folder(folder, readonly=True)
+        folder_info = server.select_folder(folder, readonly=True)
         logger.info("✅ Logged in and folder selected.")
     except Exception as e:
         logger.error(f"Login failed: {e}")
         return []
 
-    search_criteria = [
-        'SINCE', since_date,
-        'OR',
-        ['SUBJECT', 'CV'],
-        ['SUBJECT', 'Application']
-    ]
+    uidvalidity = folder_info.get(b'UIDVALIDITY')
+    state_key = f"{email}/{folder}"
+    sync_state = load_sync_state(state_path) if incremental else {}
+    previous = sync_state.get(state_key)
+    last_uid = 0
+
+    search_criteria = ['OR', ['SUBJECT', 'CV'], ['SUBJECT', 'Application']]
+    if previous and previous.get("uidvalidity") == uidvalidity:
+        last_uid = previous["last_uid"]
+        search_criteria = ['UID', f"{last_uid + 1}:*"] + search_criteria
+        logger.info(f"🔁 Incremental sync from UID {last_uid + 1}")
+    else:
+        if previous:
+            logger.warning(f"⚠️ UIDVALIDITY changed for {folder}; running a full resync")
+        if since_date:
+            search_criteria = ['SINCE', since_date] + search_criteria
     logger.info(f"🔍 Email search criteria: {search_criteria}")
 
     try:
-        messages = server.search(search_criteria)
+        # "UID n:*" always matches the newest message, even below n
+        messages = [uid for uid in server.search(search_criteria) if uid > last_uid]
         logger.info(f"📬 Found {len(messages)} email(s) with CV/Application.")
     except Exception as e:
         logger.warning(f"⚠️ Email search failed: {e}")
@@ -52,28 +264,44 @@ def fetch_cvs_with_static_jd(email, password, folder='INBOX', since_date=None):
 
     os.makedirs("CVs", exist_ok=True)
     saved_files = []
+    failed_uids = []
+    completed = False
 
     try:
-        for msg_id, message_data in server.fetch(messages, ['RFC822']).items():
-            message = pyzmail.PyzMessage.factory(message_data[b'RFC822'])
-
-            for part in message.mailparts:
-                filename = part.filename
-                if filename:
-                    ext = os.path.splitext(filename)[1].lower()
-                    if ext in ALLOWED_EXTENSIONS:
-                        unique_name = f"{msg_id}_{filename}"
-                        cv_path = os.path.join("CVs", unique_name)
-                        try:
-                            with open(cv_path, 'wb') as f:
-                                f.write(part.get_payload())
-                            saved_files.append(unique_name)
-                            logger.info(f"✅ Downloaded: {unique_name}")
-                        except Exception as e:
-                            print(f"Failed to save attachment: {filename}", e)
+        messages = sorted(messages)
+        for start in range(0, len(messages), STRUCTURE_BATCH_SIZE):
+            batch = messages[start:start + STRUCTURE_BATCH_SIZE]
+            structures = server.fetch(batch, ['BODYSTRUCTURE'])
+
+            for msg_id in batch:
+                body = structures.get(msg_id, {}).get(b'BODYSTRUCTURE')
+                if not body:
+                    continue
+
+                for section, filename, encoding in find_attachment_parts(body):
+                    unique_name = f"{msg_id}_{os.path.basename(filename)}"
+                    cv_path = os.path.join("CVs", unique_name)
+                    try:
+                        download_part(server, msg_id, section, encoding, cv_path)
+                        saved_files.append(unique_name)
+                        logger.info(f"✅ Downloaded: {unique_name}")
+                    except Exception as e:
+                        failed_uids.append(msg_id)
+                        logger.error(f"❌ Failed to save attachment: {filename} - {e}")
+        completed = True
     except Exception as e:
         logger.error(f"❌ Failed while fetching attachments: {e}")
 
+    # Advance the sync point, stopping short of any message that failed
+    if incremental and completed and uidvalidity is not None:
+        # Everything below UIDNEXT at SELECT time has been searched
+        uidnext = folder_info.get(b'UIDNEXT')
+        new_last_uid = max(messages + ([uidnext - 1] if uidnext else []), default=last_uid)
+        if failed_uids:
+            new_last_uid = min(failed_uids) - 1
+        sync_state[state_key] = {"uidvalidity": uidvalidity, "last_uid": max(new_last_uid, last_uid)}
+        save_sync_state(sync_state, state_path)
+
     if not saved_files:
         logger.warning("⚠️ No CVs downloaded.")
     else:
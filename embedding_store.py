@@ -0,0 +1,332 @@
+"""
+embedding_store.py
+
+Persistent store of one sentence embedding per CV, for semantic JD matching.
+
+Vectors are L2-normalized, quantized to float16 (or int8) and appended to a
+flat file that is memory-mapped for reads; `ids.tsv` maps each row to the
+CV's content hash and filename. Appends hold an exclusive lock on the
+store's `.lock` file, so the web app and the CLI can share one store.
+Scoring a JD is a matrix-vector product over the mapped rows, one block at
+a time, so the corpus is never re-encoded nor copied to float32 as a whole.
+
+Usage:
+    python embedding_store.py search [--jd jd.txt] [--limit 20]
+    python embedding_store.py stats
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import (
+    CV_EMBEDDING_DIR, CV_EMBEDDING_DTYPE,
+    CV_EMBEDDING_BATCH_SIZE, CV_EMBEDDING_MAX_CHARS
+)
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# int8 vectors hold round(x * INT8_SCALE) of the unit vector
+INT8_SCALE = 127.0
+DTYPES = {"float16": np.float16, "int8": np.int8}
+
+# Rows converted to float32 at a time when scoring (bounds the temporary)
+SCORE_BLOCK_ROWS = 8192
+
+
+def get_encoder():
+    """
+    Returns the SentenceTransformer behind jd_handler's KeyBERT model, so
+    CVs and JDs are embedded by the model that is already loaded.
+    """
+    from jd_handler import get_kw_model
+
+    return get_kw_model().model.embedding_model
+
+
+def encode(texts, batch_size=CV_EMBEDDING_BATCH_SIZE, max_chars=CV_EMBEDDING_MAX_CHARS):
+    """
+    Embeds texts in batches on CPU.
+
+    Args:
+        texts (Sequence[str]): Texts to embed; only the first max_chars are used
+            (the model truncates long inputs anyway)
+
+    Returns:
+        np.ndarray: float32 array of shape (len(texts), dim), L2-normalized rows
+    """
+    encoder = get_encoder()
+    texts = [text[:max_chars] if max_chars else text for text in texts]
+    vectors = encoder.encode(texts, batch_size=batch_size, device="cpu",
+                             convert_to_numpy=True, normalize_embeddings=True,
+                             show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+@contextmanager
+def _exclusive_lock(path):
+    """
+    Holds an exclusive inter-process lock on path for the block.
+    """
+    with open(path, "a+b") as fh:
+        if fcntl:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingStore:
+    """
+    Append-only, memory-mapped matrix of CV embeddings keyed by content hash.
+    """
+
+    def __init__(self, directory=CV_EMBEDDING_DIR, dtype=CV_EMBEDDING_DTYPE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._ids_path = os.path.join(directory, "ids.tsv")
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._lock_path = os.path.join(directory, ".lock")
+
+        self.meta = self._read_meta() or {"dtype": dtype, "dim": None}
+        if self.meta["dtype"] != dtype:
+            logger.warning(f"⚠️ Embedding store uses {self.meta['dtype']}; ignoring dtype={dtype}")
+        self.dtype = DTYPES[self.meta["dtype"]]
+        self._load_ids()
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            return meta if "dtype" in meta and "dim" in meta else None
+        except (OSError, ValueError):
+            return None
+
+    def _load_ids(self):
+        """
+        (Re)reads the row → hash/filename map, picking up rows other
+        processes appended since this store was opened.
+        """
+        self.ids, self.filenames = [], []
+        self._ids_bytes = 0
+        if os.path.exists(self._ids_path):
+            with open(self._ids_path, "rb") as fh:
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break  # Torn last line of an interrupted append
+                    self._ids_bytes += len(line)
+                    sha256, _, filename = line.decode("utf-8").rstrip("\n").partition("\t")
+                    self.ids.append(sha256)
+                    self.filenames.append(filename)
+        self._rows = {sha256: i for i, sha256 in enumerate(self.ids)}
+        self._vectors = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, sha256):
+        return sha256 in self._rows
+
+    @property
+    def vectors(self):
+        """
+        The stored rows as a read-only memory map (empty array if none).
+        """
+        if self._vectors is None:
+            dim = self.meta["dim"]
+            if not self.ids or not dim:
+                return np.zeros((0, dim or 0), dtype=self.dtype)
+            self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r",
+                                      shape=(len(self.ids), dim))
+        return self._vectors
+
+    def _quantize(self, vectors):
+        if self.dtype == np.int8:
+            return np.clip(np.rint(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+        return vectors.astype(self.dtype)
+
+    def add(self, items, batch_size=CV_EMBEDDING_BATCH_SIZE):
+        """
+        Embeds and stores CVs that are not in the store yet.
+
+        Args:
+            items (Iterable[Tuple[str, str, str]]): (sha256, filename, text)
+
+        Returns:
+            int: Number of CVs added
+        """
+        pending = {}
+        for sha256, filename, text in items:
+            if sha256 and text and sha256 not in self._rows:
+                pending.setdefault(sha256, (filename, text))
+        if not pending:
+            return 0
+
+        start = time.perf_counter()
+        hashes = list(pending)
+        added = 0
+        for i in range(0, len(hashes), batch_size):
+            batch = hashes[i:i + batch_size]
+            vectors = encode([pending[h][1] for h in batch], batch_size=batch_size)
+            self._append(batch, [pending[h][0] for h in batch], vectors)
+            added += len(batch)
+
+        logger.info(f"🧭 Embedded {added} new CV(s) in {time.perf_counter() - start:.1f}s")
+        return added
+
+    def _append(self, hashes, filenames, vectors):
+        with _exclusive_lock(self._lock_path):
+            # Another process may have appended since this store was opened
+            self.meta = self._read_meta() or self.meta
+            self._load_ids()
+            keep = [i for i, h in enumerate(hashes) if h not in self._rows]
+            if not keep:
+                return
+            hashes = [hashes[i] for i in keep]
+            filenames = [filenames[i] for i in keep]
+            vectors = vectors[keep]
+
+            if self.meta["dim"] is None:
+                self.meta["dim"] = int(vectors.shape[1])
+                with open(self._meta_path, "w", encoding="utf-8") as fh:
+                    json.dump(self.meta, fh)
+            elif vectors.shape[1] != self.meta["dim"]:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} does not match store dim {self.meta['dim']}")
+
+            # Vectors first: a row only counts once its ID line is written, and
+            # rows left over from an interrupted append are cut off here
+            row_bytes = self.meta["dim"] * np.dtype(self.dtype).itemsize
+            with open(self._vectors_path, "ab") as fh:
+                fh.truncate(len(self.ids) * row_bytes)
+                fh.write(self._quantize(vectors).tobytes())
+            with open(self._ids_path, "ab") as fh:
+                fh.truncate(self._ids_bytes)
+                fh.write("".join(f"{h}\t{name}\n" for h, name in zip(hashes, filenames)).encode("utf-8"))
+
+            for h, name in zip(hashes, filenames):
+                self._rows[h] = len(self.ids)
+                self.ids.append(h)
+                self.filenames.append(name)
+            self._vectors = None  # Re-map with the new length
+
+    def _dot(self, rows, query):
+        """
+        rows @ query in float32, converting SCORE_BLOCK_ROWS rows at a time
+        so the quantized matrix is never upcast as a whole.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCORE_BLOCK_ROWS):
+            block = np.asarray(rows[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            np.dot(block, query, out=scores[start:start + len(block)])
+        if self.dtype == np.int8:
+            scores = np.clip(scores / INT8_SCALE, -1.0, 1.0)  # Rounding can overshoot
+        return scores
+
+    def similarities(self, query):
+        """
+        Cosine similarity of a unit query vector with every stored CV.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.float32)
+        return self._dot(self.vectors, query)
+
+    def scores_for(self, query, hashes):
+        """
+        Returns the similarity for each hash (NaN for CVs not in the store).
+
+        Only the requested rows are read, so scoring a batch costs the same
+        however large the store is.
+        """
+        rows = np.array([self._rows.get(h, -1) for h in hashes], dtype=np.int64)
+        result = np.full(len(rows), np.nan, dtype=np.float32)
+        known = rows >= 0
+        if known.any():
+            result[known] = self._dot(self.vectors[rows[known]], query)
+        return result
+
+    def top_k(self, query, k=20):
+        """
+        Returns the k most similar CVs as (sha256, filename, similarity), best first.
+        """
+        scores = self.similarities(query)
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], self.filenames[i], float(scores[i])) for i in top]
+
+
+def semantic_scores(candidates, jd_text, directory=CV_EMBEDDING_DIR):
+    """
+    Scores candidates by embedding similarity to the JD, embedding new CVs first.
+
+    Args:
+        candidates (Sequence[dict]): Extracted CV data holding `sha256`,
+            `filename` and `text`
+        jd_text (str): Job description (or its keywords joined)
+
+    Returns:
+        List[Optional[float]]: Similarity × 100 per candidate, rounded to 1
+            decimal; None when the CV could not be embedded
+    """
+    store = EmbeddingStore(directory)
+    store.add((c.get("sha256"), c["filename"], c["text"]) for c in candidates)
+    query = encode([jd_text])[0]
+    scores = store.scores_for(query, [c.get("sha256") for c in candidates])
+    return [None if np.isnan(s) else round(float(s) * 100, 1) for s in scores]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CV embedding store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search_cmd = sub.add_parser("search", help="Rank embedded CVs against a JD")
+    search_cmd.add_argument("--jd", default=os.path.join(os.path.dirname(__file__), "jd.txt"))
+    search_cmd.add_argument("--limit", type=int, default=20)
+    sub.add_parser("stats", help="Show store size")
+    args = parser.parse_args(argv)
+
+    store = EmbeddingStore()
+    if args.command == "search":
+        from jd_handler import load_jd_text
+
+        query = encode([load_jd_text(args.jd)])[0]
+        start = time.perf_counter()
+        results = store.top_k(query, k=args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"🔍 Top {len(results)} of {len(store)} CV(s) in {elapsed_ms:.1f} ms")
+        for sha256, filename, score in results:
+            print(f"   {score * 100:5.1f}  {filename}  {sha256[:12]}")
+
+    elif args.command == "stats":
+        size = os.path.getsize(store._vectors_path) if os.path.exists(store._vectors_path) else 0
+        print(f"cvs: {len(store)}")
+        print(f"dim: {store.meta['dim']}")
+        print(f"dtype: {store.meta['dtype']}")
+        print(f"bytes: {size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Fields persisted per CV (everything extract_cv_data produces)
+CACHED_FIELDS = ("name", "email", "skills", "experience", "education", "text")
+
+
+def file_sha256(filepath, chunk_size=1 << 20):
+    """
+    Returns the hex SHA-256 of a file's bytes.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(*objects):
+    """
+    Derives a version string from the source code of modules/functions.
+
+    Any edit to the given code yields a new version, which invalidates
+    cache entries written by the old code.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(repr(obj).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ExtractionCache:
+    """
+    SQLite-backed cache of extracted CV fields, keyed by file content hash
+    and extractor version.
+
+    Entries written by another extractor version are dropped when the cache
+    is opened. `evict` trims entries by age, then by count and total payload
+    size (least recently used first). Hit/miss counters cover the lifetime
+    of the instance.
+    """
+
+    def __init__(self, cache_dir, version, max_entries=None, max_bytes=None, max_age_days=None):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "extraction_cache.sqlite3")
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                sha256   TEXT NOT NULL,
+                version  TEXT NOT NULL,
+                created  REAL NOT NULL,
+                accessed REAL NOT NULL,
+                size     INTEGER NOT NULL,
+                payload  TEXT NOT NULL,
+                PRIMARY KEY (sha256, version)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON extractions (accessed)")
+        stale = self.conn.execute(
+            "DELETE FROM extractions WHERE version != ?", (version,)
+        ).rowcount
+        self.conn.commit()
+        if stale:
+            logger.info(f"♻️ Extraction cache: dropped {stale} entries from older extractor versions")
+
+    def get(self, sha256):
+        """
+        Returns the cached fields for a content hash, or None on a miss.
+        """
+        row = self.conn.execute(
+            "SELECT payload FROM extractions WHERE sha256 = ? AND version = ?",
+            (sha256, self.version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE extractions SET accessed = ? WHERE sha256 = ? AND version = ?",
+            (time.time(), sha256, self.version)
+        )
+        return json.loads(row[0])
+
+    def put(self, sha256, data):
+        """
+        Stores the extracted fields of one CV.
+        """
+        payload = json.dumps({field: data.get(field) for field in CACHED_FIELDS})
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO extractions (sha256, version, created, accessed, size, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (sha256, self.version, now, now, len(payload), payload)
+        )
+
+    def evict(self):
+        """
+        Removes entries older than max_age_days, then the least recently used
+        entries beyond max_entries or past max_bytes of payload.
+
+        Returns:
+            int: Number of removed entries
+        """
+        removed = 0
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += self.conn.execute(
+                "DELETE FROM extractions WHERE accessed < ?", (cutoff,)
+            ).rowcount
+        if self.max_entries:
+            removed += self.conn.execute("""
+                DELETE FROM extractions WHERE rowid IN (
+                    SELECT rowid FROM extractions ORDER BY accessed DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+        if self.max_bytes:
+            removed += self.conn.execute("""
+                DELETE FROM extractions WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, SUM(size) OVER (ORDER BY accessed DESC, rowid) AS running
+                        FROM extractions
+                    ) WHERE running > ?
+                )
+            """, (self.max_bytes,)).rowcount
+        self.conn.commit()
+        if removed:
+            logger.info(f"🧹 Extraction cache: evicted {removed} entries")
+        return removed
+
+    def close(self):
+        self.evict()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,22 +1,48 @@
 import re
 from datetime import datetime
-import spacy
 import logging
 from dateutil.relativedelta import relativedelta
 
+from cv_document import as_document, build_token_matcher, raw_text
+
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# Load spaCy model once
-nlp = spacy.load("en_core_web_md")
+# spaCy model, loaded on first use (see get_nlp)
+_nlp = None
+
+# Names sit at the top of a CV, so NER only looks at the first N characters
+NAME_HEADER_CHARS = 1000
 
 
-def extract_name(text):
+def get_nlp():
     """
-    Extracts person's name using spaCy NER.
+    Returns the spaCy model, loading it once on first use.
+    """
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load("en_core_web_md")
+    return _nlp
+
+
+def _ner_disabled_pipes():
+    """
+    Returns the pipeline components that name extraction can skip.
+
+    Everything except NER is disabled, keeping the shared tok2vec only if
+    the NER component listens to it.
     """
-    doc = nlp(text)
+    nlp = get_nlp()
+    keep = {"ner"}
+    if "tok2vec" in nlp.pipe_names:
+        tok2vec = nlp.get_pipe("tok2vec")
+        if "ner" in getattr(tok2vec, "listening_components", []):
+            keep.add("tok2vec")
+    return [name for name in nlp.pipe_names if name not in keep]
+
+
+def _first_person(doc):
     for entity in doc.ents:
         if entity.label_ == "PERSON":
             name = entity.text.strip().split('\n')[0].strip()
@@ -24,11 +50,40 @@ def extract_name(text):
     return "Unknown"
 
 
+def extract_names(texts, batch_size=32, n_process=1, header_chars=NAME_HEADER_CHARS):
+    """
+    Extracts a person's name from each text in one batched spaCy NER pass.
+
+    Args:
+        texts (Iterable[Union[str, CVDocument]]): CV texts
+        batch_size (int): Texts per nlp.pipe batch
+        n_process (int): Worker processes used by nlp.pipe
+        header_chars (Optional[int]): Only the first N characters are analysed;
+            None runs NER over the whole text
+
+    Returns:
+        List[str]: One name per text, "Unknown" when none was found
+    """
+    texts = [raw_text(text)[:header_chars] if header_chars else raw_text(text) for text in texts]
+    if not texts:
+        return []  # Don't load the model for nothing
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process,
+                    disable=_ner_disabled_pipes())
+    return [_first_person(doc) for doc in docs]
+
+
+def extract_name(text, header_chars=NAME_HEADER_CHARS):
+    """
+    Extracts person's name using spaCy NER.
+    """
+    return extract_names([text], header_chars=header_chars)[0]
+
+
 def extract_email(text):
     """
     Extracts the first email address found in the text.
     """
-    email = re.search(r'[\w\.-]+@[\w\.-]+', text)
+    email = re.search(r'[\w\.-]+@[\w\.-]+', raw_text(text))
     return email.group(0) if email else ""
 
 
@@ -88,14 +143,23 @@ skill_list = [
 ]
 
 
+# Matched against CVDocument.normalized, which is already lowercased
+_SKILL_PATTERN, _SKILL_PREFIXES = build_token_matcher(skill_list, flags=0)
+_SKILL_ORDER = [(skill, skill.lower()) for skill in dict.fromkeys(skill_list)]
+
+
 def extract_skills(text):
     """
     Extracts listed skills from the text using keyword matching.
+
+    Scans the document's normalized view once with the precompiled skill
+    matcher and returns the matches in `skill_list` order, without duplicates.
     """
-    found_skills = []
-    for skill in skill_list:
-        if re.search(rf'\b{re.escape(skill)}\b', text, re.IGNORECASE):
-            found_skills.append(skill)
+    found = set()
+    for match in _SKILL_PATTERN.finditer(as_document(text).normalized):
+        found.update(_SKILL_PREFIXES.get(match.group(1), ()))
+
+    found_skills = [skill for skill, key in _SKILL_ORDER if key in found]
     return ", ".join(found_skills)
 
 
@@ -110,7 +174,7 @@ def extract_experience(text):
         float (years), 'N/A' for vague experience, or 0 if no info
     """
     try:
-        text = " ".join(str(text).split()).lower()
+        text = as_document(text).normalized
 
         # Check if experience section exists
         experience_keywords = r'(?:^|\s)(work|employment|professional|experience)(?:\s*(?:history|background|section))?(?:\s|$)'
@@ -170,9 +234,11 @@ def extract_experience(text):
         logger.error(f"❌ Error processing experience: {str(e)}")
         return None
 
-def extract_education(text: str) -> str:
+def extract_education(text) -> str:
     """
     Extract degree lines; skips lines with bad or informal keywords.
+
+    Works on the raw lines of the document, so degrees keep their casing.
     """
     degree_keywords = re.compile(r"""
         \b(
@@ -208,7 +274,7 @@ def extract_education(text: str) -> str:
     """, re.I | re.VERBOSE)
 
     results = []
-    for line in text.splitlines():
+    for line in as_document(text).lines():
         line = line.strip().rstrip(".;")
         if 15 <= len(line) <= 150 \
            and degree_keywords.search(line) \
@@ -1,43 +1,281 @@
-from faker import Faker
-import random
-from docx import Document
+"""
+generate_fake_cvs.py
+
+Synthetic CV corpus generator for testing and benchmarks.
+
+Writes N CVs as PDF and/or DOCX with skill mixes drawn from
+`extractors.skill_list`, dated work history, education lines and varying
+length. The same seed (and --base-year) always produces the same corpus.
+
+Usage:
+    python generate_fake_cvs.py --count 1000 --out generated_cvs --seed 42
+    python generate_fake_cvs.py --count 50000 --formats pdf --workers 8
+    python generate_fake_cvs.py --count 200 --copy-to CVs
+"""
+
 import os
+import random
 import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-fake = Faker()
-output_dir = "generated_cvs"
-os.makedirs(output_dir, exist_ok=True)
+from faker import Faker
 
-skills_pool = ["Communication", "Teamwork", "Leadership"]
+from extractors import skill_list
+
+# Skills that go together, so CVs look like real profiles rather than noise
+PROFILES = {
+    "backend": ["Python", "Java", "Go", "SQL", "Flask", "Django", "FastAPI", "Spring Boot",
+                "PostgreSQL", "MySQL", "Redis", "Docker", "Kubernetes", "REST API", "Git", "Linux"],
+    "frontend": ["JavaScript", "TypeScript", "HTML", "CSS", "React", "Angular", "Vue.js",
+                 "Next.js", "Webpack", "Babel", "Tailwind CSS", "Figma", "Git", "GraphQL"],
+    "data": ["Python", "R", "SQL", "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch",
+             "Machine Learning", "Deep Learning", "NLP", "Data Analysis", "Tableau", "Power BI",
+             "Spark", "Hadoop", "BigQuery", "Statistical Analysis", "Data Visualization"],
+    "devops": ["AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins",
+               "CI/CD", "Linux", "Bash", "Nginx", "CloudWatch", "EC2", "S3", "Lambda", "Git"],
+    "security": ["Cybersecurity", "Network Security", "Penetration Testing", "VAPT", "Wireshark",
+                 "Firewalls", "OWASP", "SSL", "TLS", "VPN", "Linux", "Python", "Bash"],
+    "hr": ["HRIS", "HR Analytics", "Talent Acquisition", "Recruiting", "Onboarding", "Payroll",
+           "Compensation", "Employee Engagement", "ATS", "Excel", "Advanced Excel", "Pivot Tables"],
+    "business": ["Project Management", "Business Strategy", "Market Research", "Salesforce",
+                 "CRM", "ERP", "SAP", "Excel", "Power BI", "Agile", "Scrum", "Jira"],
+}
+SOFT_SKILLS = ["Communication", "Leadership", "Teamwork", "Problem Solving", "Critical Thinking",
+               "Time Management", "Collaboration", "Adaptability", "Presentation", "Negotiation"]
+TITLES = {
+    "backend": ["Backend Engineer", "Software Engineer", "Python Developer", "Java Developer"],
+    "frontend": ["Frontend Developer", "UI Engineer", "Web Developer"],
+    "data": ["Data Scientist", "Data Analyst", "Machine Learning Engineer", "Data Engineer"],
+    "devops": ["DevOps Engineer", "Site Reliability Engineer", "Cloud Engineer"],
+    "security": ["Security Analyst", "Penetration Tester", "Security Engineer"],
+    "hr": ["HR Generalist", "Talent Acquisition Specialist", "HR Business Partner"],
+    "business": ["Project Manager", "Business Analyst", "Product Manager"],
+}
+DEGREES = ["BSc", "BS", "MSc", "MS", "BE", "BTech", "MBA", "PhD", "Bachelor of Science",
+           "Master of Science"]
+FIELDS = ["Computer Science", "Software Engineering", "Information Technology", "Data Science",
+          "Electrical Engineering", "Business Administration", "Human Resources", "Mathematics"]
+
+# Latest year in generated work histories; fixed so a seed gives the same
+# corpus in any year
+BASE_YEAR = 2025
+
+# Only skills the extractor knows about
+_KNOWN = set(skill_list)
+PROFILES = {name: [s for s in skills if s in _KNOWN] for name, skills in PROFILES.items()}
+SOFT_SKILLS = [s for s in SOFT_SKILLS if s in _KNOWN]
+
+
+# One Faker per process, reseeded for every CV (building one is slow)
+_fake = None
+
+
+def _faker(seed):
+    global _fake
+    if _fake is None:
+        _fake = Faker()
+    _fake.seed_instance(seed)
+    return _fake
+
+
+def build_cv(index, seed, base_year=BASE_YEAR):
+    """
+    Builds the content of one CV deterministically from (seed, index).
+
+    Args:
+        base_year (int): Year the most recent jobs end in
+
+    Returns:
+        dict: name, email and a list of (style, text) blocks where style is
+              "title", "heading" or "text"
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    fake = _faker(seed * 1_000_003 + index)
+
+    profile = rng.choice(list(PROFILES))
+    core = PROFILES[profile]
+    skills = rng.sample(core, k=rng.randint(min(3, len(core)), len(core)))
+    skills += rng.sample(SOFT_SKILLS, k=rng.randint(0, 4))
+    skills += rng.sample(skill_list, k=rng.randint(0, 3))  # Odd extras
+    skills = list(dict.fromkeys(skills))
 
-def generate_cv(index):
-    doc = Document()
     name = fake.name()
-    email = fake.email()
-    selected_skills = ", ".join(random.sample(skills_pool, k=random.randint(0, 2)))
-    education = f"{random.choice(['BSc', 'BS', 'MSc'])} in {random.choice(['Computer Science', 'Software Engineering', 'Information Technology'])} from {fake.company()} University"
-    experience = f"{random.randint(1, 10)}+ years experience in backend and cloud systems."
+    email = f"{name.lower().replace(' ', '.').replace('..', '.')}{index}@{fake.free_email_domain()}"
+    blocks = [
+        ("title", name),
+        ("text", f"Email: {email} | Phone: {fake.phone_number()} | {fake.city()}"),
+        ("heading", "Summary"),
+        ("text", " ".join(fake.sentences(nb=rng.randint(2, 6)))),
+        ("heading", "Skills"),
+        ("text", ", ".join(skills)),
+        ("heading", "Work Experience"),
+    ]
+
+    # Back-to-back jobs ending in base_year or a few years before
+    year = base_year - rng.choice([0, 0, 0, 1, 2, 4])
+    for job in range(rng.randint(1, 5)):
+        start = year - rng.randint(1, 5)
+        end = "Present" if job == 0 and rng.random() < 0.7 else str(year)
+        blocks.append(("text", f"{rng.choice(TITLES[profile])} at {fake.company()} | {start} – {end}"))
+        for _ in range(rng.randint(1, 6)):
+            used = ", ".join(rng.sample(skills, k=min(len(skills), rng.randint(1, 3))))
+            blocks.append(("text", f"- {fake.sentence(nb_words=rng.randint(8, 20))} Used {used}."))
+        year = start
+
+    blocks.append(("heading", "Education"))
+    for _ in range(rng.randint(1, 2)):
+        blocks.append(("text", f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)}, "
+                               f"{fake.last_name()} University, {year - rng.randint(0, 2)}"))
+        year -= rng.randint(2, 4)
+
+    if rng.random() < 0.3:  # Some CVs run long
+        blocks.append(("heading", "Projects"))
+        blocks += [("text", fake.paragraph(nb_sentences=rng.randint(3, 8)))
+                   for _ in range(rng.randint(2, 10))]
+
+    return {"name": name, "email": email, "blocks": blocks}
+
+
+def write_docx(cv, path):
+    from docx import Document
+
+    doc = Document()
+    for style, text in cv["blocks"]:
+        if style == "title":
+            doc.add_heading(text, 0)
+        elif style == "heading":
+            doc.add_heading(text, 1)
+        else:
+            doc.add_paragraph(text)
+    doc.save(path)
+
+
+def _pdf_escape(text):
+    text = text.encode("cp1252", errors="replace").decode("cp1252")  # WinAnsiEncoding
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text, width):
+    line = ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            yield line
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    yield line
+
+
+def write_pdf(cv, path):
+    """
+    Writes a plain text PDF (Helvetica, A4, as many pages as needed) without
+    any PDF library.
+    """
+    sizes = {"title": 18, "heading": 13, "text": 10}
+    pages, lines, y = [], [], 800
+    for style, text in cv["blocks"]:
+        size = sizes[style]
+        for line in _wrap(text, 95 if style == "text" else 60):
+            if y < 50:
+                pages.append(lines)
+                lines, y = [], 800
+            lines.append(f"BT /F1 {size} Tf 50 {y} Td ({_pdf_escape(line)}) Tj ET")
+            y -= size + 4
+        y -= 4
+    pages.append(lines)
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for lines in pages:
+        stream = "\n".join(lines).encode("cp1252")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        body = body if isinstance(body, bytes) else body.encode("latin-1")
+        out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as fh:
+        fh.write(out)
+
+
+def _write_one(args):
+    index, seed, base_year, output_dir, fmt = args
+    path = os.path.join(output_dir, f"CV_{index:06d}.{fmt}")
+    cv = build_cv(index, seed, base_year)
+    (write_pdf if fmt == "pdf" else write_docx)(cv, path)
+    return path
+
+
+def generate_corpus(count, output_dir="generated_cvs", formats=("pdf", "docx"),
+                    pdf_ratio=0.5, seed=42, workers=1, base_year=BASE_YEAR):
+    """
+    Generates `count` CVs into output_dir.
+
+    Args:
+        formats (Sequence[str]): "pdf" and/or "docx"
+        pdf_ratio (float): Share of PDFs when both formats are requested
+        seed (int): Same seed → same files
+        workers (int): Writer processes
+        base_year (int): Year the most recent jobs end in
+
+    Returns:
+        List[str]: Paths of the written files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    picker = random.Random(seed)
+    jobs = []
+    for index in range(count):
+        if len(formats) == 1:
+            fmt = formats[0]
+        else:
+            fmt = "pdf" if picker.random() < pdf_ratio else "docx"
+        jobs.append((index, seed, base_year, output_dir, fmt))
+
+    if workers <= 1:
+        return [_write_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_write_one, jobs, chunksize=max(1, count // (workers * 8))))
 
-    doc.add_heading(name, 0)
-    doc.add_paragraph(f"Email: {email}")
-    doc.add_paragraph(f"\nSkills:\n{selected_skills}")
-    doc.add_paragraph(f"\nExperience:\n{experience}")
-    doc.add_paragraph(f"\nEducation:\n{education}")
 
-    filename = f"CV_{index + 400}.docx"
-    doc.save(os.path.join(output_dir, filename))
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic CV corpus")
+    parser.add_argument("--count", type=int, default=200, help="Number of CVs (default: 200)")
+    parser.add_argument("--out", default="generated_cvs", help="Output folder")
+    parser.add_argument("--formats", default="pdf,docx", help="Comma-separated: pdf, docx")
+    parser.add_argument("--pdf-ratio", type=float, default=0.5, help="Share of PDFs with both formats")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Writer processes")
+    parser.add_argument("--base-year", type=int, default=BASE_YEAR,
+                        help=f"Year the most recent jobs end in (default: {BASE_YEAR})")
+    parser.add_argument("--copy-to", help="Also copy the CVs into this folder (e.g. CVs)")
+    args = parser.parse_args(argv)
 
-# Generate 200 CVs
-for i in range(200):
-    generate_cv(i)
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    if not formats or set(formats) - {"pdf", "docx"}:
+        parser.error("--formats must list pdf and/or docx")
 
-print(f"✅ Generated 200 fake CVs in: {output_dir}")
+    paths = generate_corpus(args.count, args.out, formats=formats, pdf_ratio=args.pdf_ratio,
+                            seed=args.seed, workers=args.workers, base_year=args.base_year)
+    print(f"✅ Generated {len(paths)} fake CVs in: {args.out}")
 
-# Move to CVs folder
-dest_dir = "CVs"
-os.makedirs(dest_dir, exist_ok=True)
+    if args.copy_to:
+        os.makedirs(args.copy_to, exist_ok=True)
+        for path in paths:
+            shutil.copy(path, os.path.join(args.copy_to, os.path.basename(path)))
+        print(f"📥 Copied all fake CVs to {args.copy_to}")
 
-for file in os.listdir(output_dir):
-    shutil.copy(os.path.join(output_dir, file), os.path.join(dest_dir, file))
 
-print(f"📥 Copied all fake CVs to {dest_dir} (your system's default folder)")
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,59 @@
+import json
+import hashlib
 import logging
 import os
-from typing import Set, List
+import time
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, Optional, Set, List
 
-import spacy
-from keybert import KeyBERT  # contextual keyword extractor
+from config import (
+    JD_KEYWORD_CACHE_DIR, JD_KEYWORD_CACHE_SIZE,
+    JD_KEYWORD_CACHE_MAX_FILES, JD_KEYWORD_CACHE_MAX_AGE_DAYS,
+)
+from extraction_cache import code_version
 
 # ---------------------------------------------------------------------------
 # Logging configuration
 # ---------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # ---------------------------------------------------------------------------
-# SpaCy model loading (download on‑the‑fly if missing)
+# Lazily loaded models – nothing heavy happens at import time
 # ---------------------------------------------------------------------------
-import spacy.cli
+_nlp = None
+_kw_model = None
+_model_lock = threading.Lock()
 
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    logger.info("SpaCy model 'en_core_web_md' not found. Downloading now …")
-    spacy.cli.download("en_core_web_md")
-    nlp = spacy.load("en_core_web_md")
 
-# ---------------------------------------------------------------------------
-# Instantiate KeyBERT once (Sentence‑Transformers MiniLM by default)
-# ---------------------------------------------------------------------------
-kw_model = KeyBERT()
+def get_nlp():
+    """Return the spaCy model, loading it (and downloading if missing) on first use."""
+    global _nlp
+    if _nlp is None:
+        with _model_lock:
+            if _nlp is None:
+                import spacy
+                import spacy.cli
+
+                try:
+                    _nlp = spacy.load("en_core_web_md")
+                except OSError:
+                    logger.info("SpaCy model 'en_core_web_md' not found. Downloading now …")
+                    spacy.cli.download("en_core_web_md")
+                    _nlp = spacy.load("en_core_web_md")
+    return _nlp
+
+
+def get_kw_model():
+    """Return the KeyBERT instance (Sentence‑Transformers MiniLM), created on first use."""
+    global _kw_model
+    if _kw_model is None:
+        with _model_lock:
+            if _kw_model is None:
+                from keybert import KeyBERT  # contextual keyword extractor
+
+                _kw_model = KeyBERT()
+    return _kw_model
 
 # ---------------------------------------------------------------------------
 # Static skill lexicon – extend freely or load from a YAML / DB later
@@ -55,7 +82,7 @@ def load_jd_text(filepath: str) -> str:
         with open(filepath, "r", encoding="utf-8") as fh:
             return fh.read()
     except Exception as exc:
-        logger.error("❌ Failed to load JD file %s – %s", filepath, exc)
+        logger.error(f"❌ Failed to load JD file {filepath} – {exc}")
         return ""
 
 
@@ -63,7 +90,7 @@ def load_jd_text(filepath: str) -> str:
 # Core keyword‑extraction routine – *Option B*: KeyBERT‑centric
 # ===========================================================================
 
-def extract_keywords_from_jd(
+def _extract_keywords_uncached(
     jd_text: str,
     *,
     top_n: int = 12,
@@ -90,7 +117,7 @@ def extract_keywords_from_jd(
         return set()
 
     jd_lower = jd_text.lower()
-    doc = nlp(jd_lower) if (include_static or include_noun_chunks) else None
+    doc = get_nlp()(jd_lower) if (include_static or include_noun_chunks) else None
 
     extracted: Set[str] = set()
 
@@ -112,7 +139,7 @@ def extract_keywords_from_jd(
     # -------------------------------------------------------------------
     # (3) KeyBERT contextual keyphrases
     # -------------------------------------------------------------------
-    kb_phrases: List[tuple[str, float]] = kw_model.extract_keywords(
+    kb_phrases: List[tuple[str, float]] = get_kw_model().extract_keywords(
         jd_text,
         keyphrase_ngram_range=(1, 3),
         stop_words="english",
@@ -123,6 +150,146 @@ def extract_keywords_from_jd(
     return extracted
 
 
+# ===========================================================================
+# Result cache – in‑memory LRU backed by one JSON file per key on disk
+# ===========================================================================
+
+# Bumps automatically when the extraction code or lexicon changes
+KEYWORD_CACHE_VERSION = code_version(_extract_keywords_uncached, sorted(KNOWN_SKILLS))
+
+_keyword_cache: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+_keyword_cache_lock = threading.Lock()
+
+
+def _normalize_jd(jd_text: str) -> str:
+    return " ".join(jd_text.split()).lower()
+
+
+def _keyword_cache_key(jd_text: str, top_n: int, include_static: bool, include_noun_chunks: bool) -> str:
+    raw = json.dumps(
+        [KEYWORD_CACHE_VERSION, _normalize_jd(jd_text), top_n, include_static, include_noun_chunks]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _read_disk_cache(key: str) -> Optional[FrozenSet[str]]:
+    if not JD_KEYWORD_CACHE_DIR:
+        return None
+    path = os.path.join(JD_KEYWORD_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            keywords = frozenset(json.load(fh))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning(f"⚠️ Ignoring unreadable JD keyword cache entry {key} – {exc}")
+        return None
+    try:
+        os.utime(path)  # The file's mtime is its last use, for eviction
+    except OSError:
+        pass
+    return keywords
+
+
+def _write_disk_cache(key: str, keywords: FrozenSet[str]) -> None:
+    if not JD_KEYWORD_CACHE_DIR:
+        return
+    try:
+        os.makedirs(JD_KEYWORD_CACHE_DIR, exist_ok=True)
+        path = os.path.join(JD_KEYWORD_CACHE_DIR, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(sorted(keywords), fh)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning(f"⚠️ Could not persist JD keywords {key} – {exc}")
+        return
+    _evict_disk_cache()
+
+
+def _evict_disk_cache() -> int:
+    """Trim the disk cache the way the extraction cache is trimmed.
+
+    Entries unused for ``JD_KEYWORD_CACHE_MAX_AGE_DAYS`` are removed, then
+    the least recently used beyond ``JD_KEYWORD_CACHE_MAX_FILES``. Entries
+    of older extractor versions are never read again, so they age out.
+
+    Returns:
+        Number of removed entries.
+    """
+    try:
+        with os.scandir(JD_KEYWORD_CACHE_DIR) as it:
+            entries = [(entry.stat().st_mtime, entry.path)
+                       for entry in it if entry.name.endswith(".json")]
+    except OSError:
+        return 0
+    entries.sort(reverse=True)  # Most recently used first
+
+    max_age = JD_KEYWORD_CACHE_MAX_AGE_DAYS
+    cutoff = time.time() - max_age * 86400 if max_age else None
+    removed = 0
+    for rank, (mtime, path) in enumerate(entries):
+        over_count = JD_KEYWORD_CACHE_MAX_FILES and rank >= JD_KEYWORD_CACHE_MAX_FILES
+        if over_count or (cutoff and mtime < cutoff):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    if removed:
+        logger.info(f"🧹 JD keyword cache: evicted {removed} entries")
+    return removed
+
+
+def _remember(key: str, keywords: FrozenSet[str]) -> None:
+    with _keyword_cache_lock:
+        _keyword_cache[key] = keywords
+        _keyword_cache.move_to_end(key)
+        while len(_keyword_cache) > JD_KEYWORD_CACHE_SIZE:
+            _keyword_cache.popitem(last=False)
+
+
+def extract_keywords_from_jd(
+    jd_text: str,
+    *,
+    top_n: int = 12,
+    include_static: bool = True,
+    include_noun_chunks: bool = True,
+) -> Set[str]:
+    """Cached front end to the keyword extractor (same arguments and result).
+
+    Results are keyed by a hash of the whitespace/case‑normalized JD plus
+    ``top_n``, ``include_static`` and ``include_noun_chunks``. Lookups go
+    to the in‑memory LRU first, then to ``JD_KEYWORD_CACHE_DIR``; only a
+    miss in both loads the models and runs extraction.
+
+    Returns:
+        A new set of lower‑cased keyword strings (safe to mutate).
+    """
+    if not jd_text:
+        return set()
+
+    key = _keyword_cache_key(jd_text, top_n, include_static, include_noun_chunks)
+
+    with _keyword_cache_lock:
+        cached = _keyword_cache.get(key)
+        if cached is not None:
+            _keyword_cache.move_to_end(key)
+            return set(cached)
+
+    cached = _read_disk_cache(key)
+    if cached is None:
+        cached = frozenset(_extract_keywords_uncached(
+            jd_text,
+            top_n=top_n,
+            include_static=include_static,
+            include_noun_chunks=include_noun_chunks,
+        ))
+        _write_disk_cache(key, cached)
+    _remember(key, cached)
+    return set(cached)
+
+
 # ---------------------------------------------------------------------------
 # Quick CLI sanity check (python -m jd_handler)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,138 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Progress counters reported by a screening job
+PROGRESS_KEYS = ("fetched", "parsed", "scored", "total")
+
+
+class Job:
+    """
+    State of one background job: lifecycle, progress counters and result.
+
+    The worker thread writes through `update`/`finish`; request handlers read
+    through `to_dict`. Both sides go through the same lock.
+    """
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.state = "queued"        # queued → running → done | failed
+        self.stage = None
+        self.progress = {key: 0 for key in PROGRESS_KEYS}
+        self.created_at = time.time()
+        self.started_at = None
+        self.stage_started_at = None
+        self.finished_at = None
+        self.error = None
+        self.result = None
+        self._lock = threading.Lock()
+
+    def update(self, stage=None, **counts):
+        """
+        Records the current stage and any progress counters (fetched, parsed, ...).
+        """
+        with self._lock:
+            if stage and stage != self.stage:
+                self.stage = stage
+                self.stage_started_at = time.time()
+            for key, value in counts.items():
+                if key in self.progress:
+                    self.progress[key] = value
+
+    def eta_seconds(self):
+        """
+        Estimates the remaining time from the parse rate of the current run.
+        """
+        parsed, total = self.progress["parsed"], self.progress["total"]
+        if self.state != "running" or self.stage != "parsing" or not parsed or not total:
+            return None
+        elapsed = time.time() - self.stage_started_at
+        return round(elapsed / parsed * (total - parsed), 1)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "state": self.state,
+                "stage": self.stage,
+                "progress": dict(self.progress),
+                "eta_seconds": self.eta_seconds(),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "error": self.error,
+            }
+
+
+class JobQueue:
+    """
+    In-process job runner: a bounded thread pool plus a registry of the most
+    recent jobs. Only finished jobs are dropped from the registry, so a
+    queued or running job can always be polled. No external broker is
+    involved, so status is only visible to the process that accepted the job.
+    """
+
+    def __init__(self, max_workers=1, history=50):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._history = history
+        self._lock = threading.Lock()
+
+    def submit(self, func, **params):
+        """
+        Queues func(job, **params); its return value becomes job.result.
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(uuid.uuid4().hex, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func)
+        logger.info(f"🧾 Queued job {job.id}")
+        return job
+
+    def _prune(self):
+        """
+        Drops the oldest finished jobs beyond the history size (caller holds
+        self._lock).
+        """
+        excess = len(self._jobs) - self._history
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.state in ("done", "failed")][:excess]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func):
+        with job._lock:
+            job.state = "running"
+            job.started_at = time.time()
+        try:
+            result = func(job, **job.params)
+            with job._lock:
+                job.result = result
+                job.state = "done"
+            logger.info(f"✅ Job {job.id} finished")
+        except Exception as e:
+            logger.error(f"❌ Job {job.id} failed: {e}")
+            with job._lock:
+                job.error = str(e)
+                job.state = "failed"
+        finally:
+            with job._lock:
+                job.finished_at = time.time()
+            with self._lock:
+                self._prune()
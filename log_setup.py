@@ -0,0 +1,172 @@
+"""
+log_setup.py
+
+Central logging for every entry point (config.py calls setup_logging once).
+
+Log calls only put the record on an in-memory queue; a background listener
+thread formats it and writes it to the console and to a size-rotated log
+file, plus an optional JSON-lines file for aggregation. Parser processes log
+through a multiprocessing queue into the same listener (see worker_queue and
+init_worker_logging), so only one process ever writes the files and lines
+never interleave.
+
+Per-CV records carry their fields via `extra=cv_fields(...)`:
+
+    logger.info(f"✅ Matched → {name}", extra=cv_fields(name, "file_placement", score=82.5))
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_listeners = []        # Running QueueListeners, stopped (flushed) at exit
+_handlers = []         # Output handlers shared by all listeners
+_worker_queue = None   # multiprocessing queue for parser processes
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, message and any
+    per-CV fields passed as `extra=cv_fields(...)`.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "cv", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues the record as is: formatting happens on the listener thread,
+    not in the code that logged.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def cv_fields(filename, stage, duration=None, score=None, **fields):
+    """
+    Builds the `extra` for a per-CV log record.
+
+    Args:
+        filename (str): CV file name
+        stage (str): Pipeline stage, e.g. "parse" or "file_placement"
+        duration (Optional[float]): Seconds the stage took for this CV
+        score (Optional[float]): Score the stage produced
+
+    Returns:
+        dict: {"cv": {...}} without the fields that are None
+    """
+    values = {"filename": filename, "stage": stage, "duration": duration, "score": score, **fields}
+    return {"cv": {k: v for k, v in values.items() if v is not None}}
+
+
+def setup_logging(level="INFO", log_file=None, max_bytes=5 * 1024 * 1024, backup_count=5,
+                  json_file=None, console=True):
+    """
+    Routes the root logger through a queue to a background writer.
+
+    Calling it again is a no-op, so every entry point can import config
+    (which calls it) without stacking handlers.
+
+    Args:
+        level (str): Root log level
+        log_file (Optional[str]): Text log, rotated at max_bytes with
+            backup_count old files kept; None disables it
+        json_file (Optional[str]): JSON-lines log, rotated the same way;
+            None disables it
+        console (bool): Also write text lines to stderr
+    """
+    if _listeners:
+        return
+
+    if console:
+        _handlers.append(logging.StreamHandler(sys.stderr))
+    for path, formatter in ((log_file, logging.Formatter(TEXT_FORMAT)), (json_file, JsonLinesFormatter())):
+        if not path:
+            continue
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        handler.setFormatter(formatter)
+        _handlers.append(handler)
+    for handler in _handlers:
+        if handler.formatter is None:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(level)
+
+    _start_listener(records)
+    atexit.register(stop_logging)
+
+
+def _start_listener(records):
+    listener = logging.handlers.QueueListener(records, *_handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def worker_queue():
+    """
+    Returns the queue parser processes log into (pass it to
+    init_worker_logging in the pool initializer), starting its listener on
+    first use.
+    """
+    global _worker_queue
+    if _worker_queue is None:
+        import multiprocessing
+
+        _worker_queue = multiprocessing.Queue()
+        if _listeners:
+            _start_listener(_worker_queue)
+    return _worker_queue
+
+
+def init_worker_logging(records, level="INFO"):
+    """
+    Process pool initializer: sends this process's log records to the
+    parent's listener instead of writing anywhere itself.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level)
+
+
+def stop_logging():
+    """
+    Writes out queued records and stops the listener threads.
+    """
+    while _listeners:
+        _listeners.pop().stop()
+    for handler in _handlers:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            pass  # Stream already closed at exit (e.g. a replaced sys.stderr)
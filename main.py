@@ -1,81 +1,332 @@
+import sys
+
+# Must run before the imports below so their cost is measured
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    from startup_profile import PROFILER
+    PROFILER.install()
+
+import argparse
+import glob
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta
 from time import time
 import os
-import sys
 
 from config import (
     EMAIL_ADDRESS, EMAIL_PASSWORD,
     ATA_SCORE_THRESHOLD,
-    CV_FOLDER, FILTERED_FOLDER
+    CV_FOLDER, FILTERED_FOLDER,
+    CV_WORKERS, LAST_RUN_STATE_PATH, BATCH_OUTPUT_DIR, STREAM_BATCH_SIZE, STREAM_RESULTS_CSV,
+    RESULTS_DB_PATH
 )
-from email_fetch import fetch_cvs_with_static_jd
-from data_builder import create_candidates_df_with_ata
+import config
+import metrics
 from directory_utils import manage_directories
 from jd_handler import load_jd_text, extract_keywords_from_jd
+from results_store import ResultsStore, save_results
+from startup_profile import PROFILER
+from zip_downloads import list_folder_files, folder_etag
+
+# Heavy stages (IMAP, spaCy, pandas, the ML model) are imported inside
+# run_pipeline, only once a run actually needs them; jd_handler loads its
+# models lazily.
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+
+GENERIC_STOPWORDS = {
+    "cloud", "backend", "frontend", "software", "development",
+    "technology", "engineering", "team", "project", "experience"
+}
+
+
+def _code_and_config_version():
+    """
+    Hashes this project's Python sources and the settings in config, so an
+    edit to the code (skills list, extractors, scoring) or to a setting
+    (STATIC_JD_KEYWORDS, RESULTS_TOP_K, ...) counts as a changed input.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(path, "rb") as fh:
+            digest.update(os.path.basename(path).encode("utf-8") + b"\0" + fh.read())
+    settings = {name: getattr(config, name) for name in dir(config)
+                if name.isupper() and "PASSWORD" not in name}
+    digest.update(json.dumps(
+        settings, sort_keys=True,
+        default=lambda v: sorted(map(str, v)) if isinstance(v, (set, frozenset)) else str(v)
+    ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _run_fingerprint(jd_text):
+    """
+    Identifies a run's inputs: JD text, threshold, CV folder contents, model
+    files, and the code and config version.
+    """
+    digest = hashlib.sha256()
+    digest.update(jd_text.encode("utf-8"))
+    digest.update(str(ATA_SCORE_THRESHOLD).encode("utf-8"))
+    digest.update(_code_and_config_version().encode("utf-8"))
+    for folder in (CV_FOLDER, MODEL_DIR):
+        digest.update(folder_etag(folder, list_folder_files(folder)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load_last_run():
+    """
+    Returns the last completed run's state ({"fingerprint", "run_id", ...}), or {}.
+    """
+    try:
+        with open(LAST_RUN_STATE_PATH, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
 
 
-def run_pipeline():
+def _save_last_run(fingerprint, run_id):
+    os.makedirs(os.path.dirname(LAST_RUN_STATE_PATH), exist_ok=True)
+    with open(LAST_RUN_STATE_PATH, "w", encoding="utf-8") as fh:
+        json.dump({"fingerprint": fingerprint, "run_id": run_id,
+                   "completed_at": datetime.now().isoformat()}, fh)
+
+
+def _fetch_cvs():
+    with PROFILER.stage("fetch"), metrics.stage("fetch"):
+        try:
+            from email_fetch import fetch_cvs_with_static_jd
+
+            since_date = (datetime.today() - timedelta(days=14)).strftime("%d-%b-%Y")
+            fetch_cvs_with_static_jd(
+                EMAIL_ADDRESS, EMAIL_PASSWORD, since_date=since_date
+            )
+        except Exception as e:
+            logging.error(f"❌ Failed to fetch CVs via IMAP: {e}")
+
+
+def _jd_keywords(jd_text):
+    with PROFILER.stage("jd_keywords"), metrics.stage("jd_keywords"):
+        jd_keywords = extract_keywords_from_jd(jd_text)
+    return {kw for kw in jd_keywords if kw not in GENERIC_STOPWORDS}
+
+
+def run_pipeline(workers=CV_WORKERS, force=False, stream=False, batch_size=STREAM_BATCH_SIZE,
+                 csv_path=None, stream_csv=STREAM_RESULTS_CSV):
+    """
+    Fetches, screens and saves the ranked results as a run in the results
+    store (see results_store); timings go to a run report under the same ID.
+
+    With stream=True, CVs are screened in batches of batch_size with flat
+    memory use and every scored CV is appended to stream_csv as it goes (None
+    writes no such file). csv_path also exports the ranked results to that
+    CSV file.
+    """
+    with metrics.run():
+        _run_pipeline(workers=workers, force=force, stream=stream, batch_size=batch_size,
+                      csv_path=csv_path, stream_csv=stream_csv)
+
+
+def _has_saved_results(run_id):
+    if not run_id or not RESULTS_DB_PATH or not os.path.exists(RESULTS_DB_PATH):
+        return False
+    with ResultsStore(RESULTS_DB_PATH) as store:
+        return store.get_run(run_id) is not None
+
+
+def _run_pipeline(workers, force, stream=False, batch_size=STREAM_BATCH_SIZE, csv_path=None,
+                  stream_csv=STREAM_RESULTS_CSV):
     start_time = time()
     logging.info("🚀 CV Automation Pipeline Started")
 
-    # === Step 0: Clean folders ===
-    manage_directories(cv_folder=CV_FOLDER, filtered_folder=FILTERED_FOLDER)
-
     # === Step 1: Fetch CVs from email ===
-    try:
-        since_date = (datetime.today() - timedelta(days=14)).strftime("%d-%b-%Y")
-        fetch_cvs_with_static_jd(
-            EMAIL_ADDRESS, EMAIL_PASSWORD, since_date=since_date
-        )
-    except Exception as e:
-        logging.error(f"❌ Failed to fetch CVs via IMAP: {e}")
+    _fetch_cvs()
 
-    # === Step 2: Load JD and extract keywords ===
-    GENERIC_STOPWORDS = {
-        "cloud", "backend", "frontend", "software", "development",
-        "technology", "engineering", "team", "project", "experience"
-    }
+    # === Step 2: Skip when nothing changed since the last completed run ===
     jd_path = os.path.join(os.path.dirname(__file__), "jd.txt")
     jd_text = load_jd_text(jd_path)
-    jd_keywords = extract_keywords_from_jd(jd_text)
-    jd_keywords = {kw for kw in jd_keywords if kw not in GENERIC_STOPWORDS}
+    fingerprint = _run_fingerprint(jd_text)
+    last_run = _load_last_run()
+    if not force and fingerprint == last_run.get("fingerprint") and _has_saved_results(last_run.get("run_id")):
+        msg = ("💤 No new CVs, JD, code, config or model changes since the last run; keeping its "
+               f"results (python results_store.py query --run {last_run['run_id']}).")
+        logging.info(msg)
+        print("\n" + msg)
+        logging.info(f"✅ Pipeline Completed in {round(time() - start_time, 2)} seconds")
+        return
+
+    # === Step 3: Prepare folders ===
+    manage_directories(cv_folder=CV_FOLDER, filtered_folder=FILTERED_FOLDER)
+
+    # === Step 4: Extract JD keywords ===
+    jd_keywords = _jd_keywords(jd_text)
     if not jd_keywords:
         logging.error("❌ No keywords extracted from jd.txt. Check file content.")
         sys.exit("❌ No keywords found in JD. Terminating.")
 
-    # === Step 3: Process CVs and rank ===
+    # === Step 5: Process CVs and rank ===
     try:
-        df = create_candidates_df_with_ata(
-            cv_folder=CV_FOLDER,
-            jd_keywords=jd_keywords,
-            filtered_folder=FILTERED_FOLDER,
-            ata_score_threshold=ATA_SCORE_THRESHOLD,
-            use_model=True
-        )
+        with PROFILER.stage("screening"):
+            from data_builder import create_candidates_df_with_ata, screen_cvs_streaming
+
+            if stream:
+                df = screen_cvs_streaming(
+                    cv_folder=CV_FOLDER,
+                    jd_keywords=jd_keywords,
+                    filtered_folder=FILTERED_FOLDER,
+                    ata_score_threshold=ATA_SCORE_THRESHOLD,
+                    use_model=True,
+                    workers=workers,
+                    jd_text=jd_text,
+                    batch_size=batch_size,
+                    results_csv=stream_csv
+                )
+            else:
+                df = create_candidates_df_with_ata(
+                    cv_folder=CV_FOLDER,
+                    jd_keywords=jd_keywords,
+                    filtered_folder=FILTERED_FOLDER,
+                    ata_score_threshold=ATA_SCORE_THRESHOLD,
+                    use_model=True,
+                    workers=workers,
+                    jd_text=jd_text
+                )
     except Exception as e:
         logging.error(f"❌ Failed during CV processing: {e}")
         df = None
 
-    # === Step 4: Display or Save Output ===
+    # === Step 6: Display or Save Output ===
     if df is None or df.empty:
         msg = "⚠️ No candidates matched or no CVs were processed."
         logging.warning(msg)
         print("\n" + msg)
     else:
-        df["ata_score"] = df["ata_score"].astype(str) + "%"
-        df.to_csv("filtered.csv", index=False)
-        output_path = os.path.abspath("filtered.csv")
-        logging.info(f"✅ Results saved to filtered.csv at {output_path}")
+        run_id = save_results(df, metrics.current_run().run_id, jd_text=jd_text,
+                              jd_keywords=jd_keywords, ata_threshold=ATA_SCORE_THRESHOLD)
 
         print(f"\n✅ Extracted CV Information with Ranking:\n")
         print(df[["name", "email", "ata_score", "matched_keywords"]])
-        print(f"\n📁 Saved filtered.csv to: {output_path}")
+        if run_id:
+            print(f"\n🗂️ Saved as run {run_id} (export: python results_store.py export filtered.csv)")
+        if csv_path:
+            df.to_csv(csv_path, index=False)
+            output_path = os.path.abspath(csv_path)
+            logging.info(f"✅ Results exported to {output_path}")
+            print(f"📁 Saved {csv_path} to: {output_path}")
+        if run_id:
+            _save_last_run(fingerprint, run_id)
 
     end_time = time()
     duration = round(end_time - start_time, 2)
     logging.info(f"✅ Pipeline Completed in {duration} seconds")
 
 
+def run_batch(jd_dir, output_dir=BATCH_OUTPUT_DIR, workers=CV_WORKERS):
+    """
+    Screens the CV folder against every JD (*.txt) in jd_dir.
+
+    CVs are fetched and parsed once. Writes one ranked CSV per JD plus
+    combined_scores.csv (candidate × JD ATA scores) to output_dir, and saves
+    each JD's ranking as run "<batch run ID>-<JD name>" in the results store.
+    """
+    with metrics.run(f"batch-{datetime.now():%Y%m%d-%H%M%S}"):
+        _run_batch(jd_dir, output_dir, workers)
+
+
+def _run_batch(jd_dir, output_dir, workers):
+    start_time = time()
+    logging.info(f"🚀 CV Automation Batch Started for JDs in {jd_dir}")
+
+    jd_files = sorted(f for f in os.listdir(jd_dir) if f.endswith(".txt"))
+    jd_keywords_by_name = {}
+    jd_texts = {}
+    for filename in jd_files:
+        jd_text = load_jd_text(os.path.join(jd_dir, filename))
+        keywords = _jd_keywords(jd_text)
+        if keywords:
+            jd_keywords_by_name[os.path.splitext(filename)[0]] = keywords
+            jd_texts[os.path.splitext(filename)[0]] = jd_text
+        else:
+            logging.warning(f"⚠️ No keywords extracted from {filename}; skipping it.")
+    if not jd_keywords_by_name:
+        sys.exit(f"❌ No usable JDs found in {jd_dir}. Terminating.")
+
+    _fetch_cvs()
+
+    with PROFILER.stage("screening"):
+        from data_builder import screen_multiple_jds
+
+        ranked, combined = screen_multiple_jds(
+            jd_keywords_by_name, cv_folder=CV_FOLDER, use_model=True, workers=workers
+        )
+
+    os.makedirs(output_dir, exist_ok=True)
+    batch_id = metrics.current_run().run_id
+    for name, df in ranked.items():
+        save_results(df, f"{batch_id}-{name}", jd_text=jd_texts[name],
+                     jd_keywords=jd_keywords_by_name[name], ata_threshold=ATA_SCORE_THRESHOLD)
+        output_path = os.path.join(output_dir, f"{name}.csv")
+        df.to_csv(output_path, index=False)  # Numeric scores (%), like every other export
+        matched = int((combined[f"ata_{name}"] >= ATA_SCORE_THRESHOLD).sum()) if len(combined) else 0
+        print(f"📁 {name}: {matched} of {len(combined)} CVs ≥ {ATA_SCORE_THRESHOLD}% → {output_path}")
+    combined_path = os.path.join(output_dir, "combined_scores.csv")
+    combined.to_csv(combined_path, index=False)
+    print(f"\n📊 Saved candidate × JD scores to: {os.path.abspath(combined_path)}")
+
+    logging.info(f"✅ Batch Completed for {len(ranked)} JDs in {round(time() - start_time, 2)} seconds")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CV automation pipeline")
+    parser.add_argument(
+        "--workers", type=int, default=CV_WORKERS,
+        help=f"Processes used to parse CVs (default: {CV_WORKERS})"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Screen even if nothing changed since the last run"
+    )
+    parser.add_argument(
+        "--csv", metavar="PATH",
+        help="Also export the ranked results to this CSV file (e.g. filtered.csv)"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Screen in batches with flat memory use, appending every CV to --stream-csv"
+    )
+    parser.add_argument(
+        "--stream-csv", metavar="PATH", default=STREAM_RESULTS_CSV,
+        help=f"CSV receiving every scored CV with --stream (default: {STREAM_RESULTS_CSV})"
+    )
+    parser.add_argument(
+        "--no-stream-csv", dest="stream_csv", action="store_const", const=None,
+        help="Do not write the per-CV CSV with --stream"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=STREAM_BATCH_SIZE,
+        help=f"CVs per batch with --stream (default: {STREAM_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--jd-dir",
+        help="Screen against every *.txt JD in this folder (batch mode)"
+    )
+    parser.add_argument(
+        "--output-dir", default=BATCH_OUTPUT_DIR,
+        help="Where batch mode writes its CSVs"
+    )
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="Print import and stage timings when the run finishes"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    run_pipeline()
+    args = parse_args()
+    if args.jd_dir:
+        run_batch(args.jd_dir, output_dir=args.output_dir, workers=args.workers)
+    else:
+        run_pipeline(workers=args.workers, force=args.force, stream=args.stream,
+                     batch_size=args.batch_size, csv_path=args.csv, stream_csv=args.stream_csv)
+    if args.startup_profile:
+        print("\n" + PROFILER.report())
@@ -0,0 +1,241 @@
+"""
+metrics.py
+
+Wall-time and count instrumentation for screening runs.
+
+Code under `stage(name)` is timed into the active run (if any) and into
+process-wide totals. A run also keeps per-file timings, so slow CVs stand
+out (the slowest RUN_REPORT_MAX_FILES of them, so long runs stay bounded),
+and is written as a JSON report when it ends. `prometheus_text()`
+renders the totals for the web app's /metrics route.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from config import RUN_REPORT_DIR, RUN_REPORT_MAX_FILES
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+_local = threading.local()      # Active RunMetrics of this thread
+_totals_lock = threading.Lock()
+_totals = {}                    # stage -> [calls, seconds, items]
+_runs = {"count": 0, "failed": 0, "last": None}
+
+
+@contextmanager
+def timer(timings, key):
+    """
+    Adds the elapsed seconds of the block to timings[key].
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[key] = timings.get(key, 0.0) + time.perf_counter() - start
+
+
+class RunMetrics:
+    """
+    Stage and per-file timings of one screening run.
+    """
+
+    def __init__(self, run_id, max_files=RUN_REPORT_MAX_FILES):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stages = {}     # stage -> {"calls", "seconds", "items"}
+        self.files = {}      # filename -> {stage: seconds}, the slowest max_files
+        self.files_timed = 0
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, items=1):
+        with self._lock:
+            entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "items": 0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["items"] += items
+        _add_total(name, seconds, items)
+
+    def add_file(self, filename, timings):
+        """
+        Records one file's per-stage seconds (they also count towards the stages).
+        """
+        with self._lock:
+            if filename not in self.files:
+                self.files_timed += 1
+            entry = self.files.setdefault(filename, {})
+            for name, seconds in timings.items():
+                entry[name] = entry.get(name, 0.0) + seconds
+            if self.max_files is not None and len(self.files) > 2 * self.max_files:
+                slowest = sorted(self.files.items(), key=lambda item: sum(item[1].values()), reverse=True)
+                self.files = dict(slowest[:self.max_files])
+        for name, seconds in timings.items():
+            self.add(name, seconds)
+
+    def to_dict(self, slowest=20):
+        with self._lock:
+            files = sorted(self.files.items(), key=lambda item: sum(item[1].values()), reverse=True)
+            files = files[:self.max_files] if self.max_files is not None else files
+            finished = self.finished_at or time.time()
+            return {
+                "run_id": self.run_id,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration_seconds": round(finished - self.started_at, 3),
+                "stages": {name: {**entry, "seconds": round(entry["seconds"], 4)}
+                           for name, entry in self.stages.items()},
+                "files_timed": self.files_timed,
+                "slowest_files": [
+                    {"filename": name, "seconds": round(sum(t.values()), 4),
+                     "stages": {k: round(v, 4) for k, v in t.items()}}
+                    for name, t in files[:slowest]
+                ],
+                "files": {name: {k: round(v, 4) for k, v in t.items()} for name, t in files},
+            }
+
+    def write_report(self, report_dir=RUN_REPORT_DIR):
+        """
+        Saves the run as <report_dir>/<run_id>.json.
+
+        Returns:
+            Optional[str]: The report path (None if report_dir is disabled)
+        """
+        if not report_dir:
+            return None
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"{self.run_id}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def _add_total(name, seconds, items):
+    with _totals_lock:
+        entry = _totals.setdefault(name, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += items
+
+
+def current_run():
+    """
+    Returns the RunMetrics active in this thread, or None.
+    """
+    return getattr(_local, "run", None)
+
+
+@contextmanager
+def run(run_id=None, report_dir=RUN_REPORT_DIR):
+    """
+    Makes a new RunMetrics active for the block and writes its report at the end.
+    """
+    metrics = RunMetrics(run_id or f"run-{datetime.now():%Y%m%d-%H%M%S}")
+    previous, _local.run = current_run(), metrics
+    failed = False
+    try:
+        yield metrics
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _local.run = previous
+        metrics.finished_at = time.time()
+        with _totals_lock:
+            _runs["count"] += 1
+            _runs["failed"] += failed
+            _runs["last"] = {"duration": metrics.finished_at - metrics.started_at,
+                             "files": metrics.files_timed, "finished_at": metrics.finished_at}
+        try:
+            path = metrics.write_report(report_dir)
+            if path:
+                logger.info(f"⏱️ Run report saved to {path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write run report - {e}")
+
+
+@contextmanager
+def stage(name, items=1):
+    """
+    Times the block as one call of `name` covering `items` items.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        active = current_run()
+        if active:
+            active.add(name, seconds, items)
+        else:
+            _add_total(name, seconds, items)
+
+
+def record_file(filename, timings):
+    """
+    Records per-file stage timings (e.g. returned by a parser worker).
+    """
+    active = current_run()
+    if active:
+        active.add_file(filename, timings)
+    else:
+        for name, seconds in timings.items():
+            _add_total(name, seconds, 1)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """
+    Renders process-wide totals in the Prometheus text exposition format.
+    """
+    with _totals_lock:
+        totals = {name: list(entry) for name, entry in _totals.items()}
+        runs = dict(_runs)
+
+    lines = [
+        "# HELP cv_stage_seconds_total Wall time spent per pipeline stage.",
+        "# TYPE cv_stage_seconds_total counter",
+    ]
+    lines += [f'cv_stage_seconds_total{{stage="{_escape(n)}"}} {e[1]:.6f}' for n, e in sorted(totals.items())]
+    lines += [
+        "# HELP cv_stage_calls_total Timed calls per pipeline stage.",
+        "# TYPE cv_stage_calls_total counter",
+    ]
+    lines += [f'cv_stage_calls_total{{stage="{_escape(n)}"}} {e[0]}' for n, e in sorted(totals.items())]
+    lines += [
+        "# HELP cv_stage_items_total Items (files, candidates) processed per stage.",
+        "# TYPE cv_stage_items_total counter",
+    ]
+    lines += [f'cv_stage_items_total{{stage="{_escape(n)}"}} {e[2]}' for n, e in sorted(totals.items())]
+    lines += [
+        "# HELP cv_runs_total Screening runs finished.",
+        "# TYPE cv_runs_total counter",
+        f"cv_runs_total {runs['count']}",
+        "# HELP cv_runs_failed_total Screening runs that raised.",
+        "# TYPE cv_runs_failed_total counter",
+        f"cv_runs_failed_total {runs['failed']}",
+    ]
+    if runs["last"]:
+        lines += [
+            "# HELP cv_last_run_duration_seconds Wall time of the last run.",
+            "# TYPE cv_last_run_duration_seconds gauge",
+            f"cv_last_run_duration_seconds {runs['last']['duration']:.6f}",
+            "# HELP cv_last_run_files Files timed in the last run.",
+            "# TYPE cv_last_run_files gauge",
+            f"cv_last_run_files {runs['last']['files']}",
+            "# HELP cv_last_run_timestamp_seconds When the last run finished.",
+            "# TYPE cv_last_run_timestamp_seconds gauge",
+            f"cv_last_run_timestamp_seconds {runs['last']['finished_at']:.3f}",
+        ]
+    return "\n".join(lines) + "\n"
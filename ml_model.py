@@ -1,17 +1,28 @@
 # ml_model.py
 
 import os
+import time
 import joblib
 import logging
+import threading
+from datetime import datetime
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # === Paths to model and vectorizer ===
 BASE_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(BASE_DIR, "models", "ml_model.pkl")
 VECTORIZER_PATH = os.path.join(BASE_DIR, "models", "tfidf_vectorizer.pkl")
+VERSION_PATH = os.path.join(BASE_DIR, "models", "VERSION")  # Written last by train_model.py
+
+# === Model registry settings ===
+MMAP_MODE = "r"               # Memory-map numpy arrays so processes share pages
+RELOAD_CHECK_INTERVAL = 5.0   # Seconds between checks for new artifacts
+
+_registry_lock = threading.Lock()
+_current = None               # {"model", "vectorizer", "version", "loaded_at"}
+_last_check = 0.0
 
 
 def load_model_and_vectorizer():
@@ -26,25 +37,93 @@ def load_model_and_vectorizer():
         FileNotFoundError or joblib loading errors
     """
     try:
-        model = joblib.load(MODEL_PATH)
-        vectorizer = joblib.load(VECTORIZER_PATH)
+        model = joblib.load(MODEL_PATH, mmap_mode=MMAP_MODE)
+        vectorizer = joblib.load(VECTORIZER_PATH, mmap_mode=MMAP_MODE)
         return model, vectorizer
     except Exception as e:
         logger.error(f"❌ Failed to load ML model/vectorizer: {e}")
         raise
 
 
+def _artifact_version():
+    """
+    Identifies the artifacts on disk: the VERSION file if present,
+    otherwise the modification times of both pickles.
+    """
+    try:
+        with open(VERSION_PATH, "r", encoding="utf-8") as fh:
+            version = fh.read().strip()
+        if version:
+            return version
+    except OSError:
+        pass
+    mtimes = [os.stat(path).st_mtime_ns for path in (MODEL_PATH, VECTORIZER_PATH)]
+    return "mtime-" + "-".join(str(m) for m in mtimes)
+
+
+def get_model_and_vectorizer():
+    """
+    Returns the process-wide model and vectorizer, loading them on first use
+    and reloading when new artifacts appear on disk.
+
+    The pair is swapped in as a whole, so predictions already running keep
+    the objects they started with. If a reload fails, the previously loaded
+    model keeps serving.
+
+    Returns:
+        model: Trained scikit-learn model
+        vectorizer: TF-IDF vectorizer
+    """
+    global _current, _last_check
+
+    current = _current
+    if current is not None and time.monotonic() - _last_check < RELOAD_CHECK_INTERVAL:
+        return current["model"], current["vectorizer"]
+
+    with _registry_lock:
+        _last_check = time.monotonic()
+        try:
+            version = _artifact_version()
+            if _current is None or _current["version"] != version:
+                model, vectorizer = load_model_and_vectorizer()
+                _current = {
+                    "model": model,
+                    "vectorizer": vectorizer,
+                    "version": version,
+                    "loaded_at": datetime.now().isoformat(timespec="seconds"),
+                }
+                logger.info(f"🤖 Loaded ML model version {version}")
+        except Exception as e:
+            if _current is None:
+                raise
+            logger.error(f"❌ Model reload failed, keeping version {_current['version']}: {e}")
+        return _current["model"], _current["vectorizer"]
+
+
+def model_info():
+    """
+    Returns the version and load time of the model currently in use.
+
+    Returns:
+        dict: {"version": str, "loaded_at": ISO timestamp}, or None if not loaded yet
+    """
+    current = _current
+    if current is None:
+        return None
+    return {"version": current["version"], "loaded_at": current["loaded_at"]}
+
+
 def predict_suitability(cv_texts):
     """
     Predicts suitability score (probability) for each CV using the ML model.
 
     Args:
-        cv_texts (List[str]): Preprocessed CV texts
+        cv_texts (List[str]): Preprocessed CV texts (e.g. CVDocument.normalized)
 
     Returns:
         List[float]: Probabilities for positive class (suitability)
     """
-    model, vectorizer = load_model_and_vectorizer()
+    model, vectorizer = get_model_and_vectorizer()
     X = vectorizer.transform(cv_texts)
     predictions = model.predict_proba(X)[:, 1]  # probability for class 1
     return predictions
@@ -0,0 +1,116 @@
+import logging
+import importlib.util
+
+from config import PDF_BACKENDS, PDF_MAX_PAGES, PDFMINER_LAPARAMS
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# name -> (callable(filepath, max_pages) -> str, importable modules)
+_BACKENDS = {}
+_UNAVAILABLE = set()
+
+
+def register_pdf_backend(name, requires=()):
+    """
+    Decorator that registers a PDF text extractor under the given name.
+
+    The function receives (filepath, max_pages) and returns the text.
+    `requires` lists alternative top-level modules, any one of which makes
+    the backend usable; the function may still raise ImportError.
+    """
+    def decorator(func):
+        _BACKENDS[name] = (func, tuple(requires))
+        return func
+    return decorator
+
+
+@register_pdf_backend("pdfminer", requires=("pdfminer",))
+def _pdfminer_backend(filepath, max_pages):
+    """Reference implementation: pdfminer layout analysis."""
+    from pdfminer.high_level import extract_text
+    from pdfminer.layout import LAParams
+
+    return extract_text(filepath, maxpages=max_pages or 0, laparams=LAParams(**PDFMINER_LAPARAMS))
+
+
+@register_pdf_backend("pymupdf", requires=("fitz",))
+def _pymupdf_backend(filepath, max_pages):
+    """MuPDF text extraction (C library, no layout analysis pass)."""
+    import fitz
+
+    with fitz.open(filepath) as doc:
+        pages = range(min(len(doc), max_pages) if max_pages else len(doc))
+        return "\n".join(doc[i].get_text() for i in pages)
+
+
+@register_pdf_backend("pypdf", requires=("pypdf", "PyPDF2"))
+def _pypdf_backend(filepath, max_pages):
+    """pypdf / PyPDF2 content-stream text extraction."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+
+    reader = PdfReader(filepath)
+    pages = reader.pages[:max_pages] if max_pages else reader.pages
+    return "\n".join(page.extract_text() or "" for page in pages)
+
+
+def available_pdf_backends():
+    """
+    Returns the names of registered backends whose library can be imported.
+    """
+    names = []
+    for name, (_, requires) in _BACKENDS.items():
+        if name in _UNAVAILABLE:
+            continue
+        if requires and not any(importlib.util.find_spec(module) for module in requires):
+            continue
+        names.append(name)
+    return names
+
+
+def resolve_pdf_backend(backends=PDF_BACKENDS):
+    """
+    Returns the first of the backends whose library can be imported (the one
+    that will normally extract the text), or None if none can.
+    """
+    available = set(available_pdf_backends())
+    return next((name for name in backends if name in available), None)
+
+
+def extract_pdf_text(filepath, backends=PDF_BACKENDS, max_pages=PDF_MAX_PAGES):
+    """
+    Extracts text from a PDF with the first backend that succeeds.
+
+    Backends are tried in order; one that is not installed, raises, or
+    returns no text hands over to the next.
+
+    Args:
+        filepath (str): Path to the PDF
+        backends (Sequence[str]): Backend names in order of preference
+        max_pages (Optional[int]): Only the first N pages are read; None/0 reads all
+
+    Returns:
+        str: Extracted text ("" if every backend failed)
+    """
+    for name in backends:
+        if name not in _BACKENDS:
+            logger.warning(f"⚠️ Unknown PDF backend: {name}")
+            continue
+        func = _BACKENDS[name][0]
+        if name in _UNAVAILABLE:
+            continue
+        try:
+            text = func(filepath, max_pages)
+        except ImportError:
+            _UNAVAILABLE.add(name)
+            logger.info(f"ℹ️ PDF backend '{name}' not installed; falling back")
+            continue
+        except Exception as e:
+            logger.warning(f"⚠️ PDF backend '{name}' failed on {filepath} - {e}")
+            continue
+        if text and text.strip():
+            return text
+    return ""
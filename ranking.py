@@ -0,0 +1,158 @@
+import math
+import heapq
+import logging
+
+import numpy as np
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def top_k_indices(scores, k):
+    """
+    Returns the indices of the k highest scores, best first.
+
+    Uses np.argpartition, so only the k winners are sorted. Ties keep the
+    original order; NaN scores rank last.
+
+    Args:
+        scores (Sequence[float]): One score per item
+        k (Optional[int]): Number of items to keep; None keeps all
+
+    Returns:
+        np.ndarray: Indices into scores
+    """
+    scores = np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=-np.inf)
+    n = len(scores)
+    if k is None or k >= n:
+        top = np.arange(n)
+    elif k <= 0:
+        return np.arange(0)
+    else:
+        # argpartition picks arbitrarily among ties at the cutoff: keep every
+        # score above the k-th, then the earliest ones equal to it
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > cutoff)
+        tied = np.flatnonzero(scores == cutoff)[:k - len(above)]
+        top = np.sort(np.concatenate([above, tied]))  # Index order, so ties stay in order below
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def select_top_candidates(candidates, k, key="ata_score"):
+    """
+    Keeps the k best candidates, one per (email, name), without sorting the rest.
+
+    Args:
+        candidates (Sequence[dict]): Scored candidates
+        k (Optional[int]): Number to keep; None keeps all
+        key (str): Score field to rank by
+
+    Returns:
+        Tuple[List[dict], int]: The kept candidates (best first) and how many
+            distinct candidates fell below the cutoff
+    """
+    # Best entry per person: duplicate CVs must not crowd out the top k
+    best = {}
+    for i, c in enumerate(candidates):
+        person = (c.get("email"), c.get("name"))
+        if person not in best or c[key] > candidates[best[person]][key]:
+            best[person] = i
+    unique = sorted(best.values())
+
+    scores = np.fromiter((candidates[i][key] for i in unique), dtype=np.float64, count=len(unique))
+    top = top_k_indices(scores, k)
+    kept = [candidates[unique[i]] for i in top]
+    return kept, len(unique) - len(kept)
+
+
+class StreamingTopK:
+    """
+    Keeps the k best candidates, one per (email, name), of a stream.
+
+    Memory is bounded by k: a candidate that falls below the cutoff is
+    dropped as soon as k better ones are known. The result is the one
+    select_top_candidates would return for the same sequence (ties keep
+    arrival order).
+    """
+
+    def __init__(self, k, key="ata_score"):
+        self.k = k
+        self.key = key
+        self.seen = 0
+        self.duplicates = 0  # CVs of a person already held
+        self._seq = 0
+        self._best = {}      # person -> (score, seq, candidate)
+        self._heap = []      # (score, -seq, seq, person); lowest, then latest, is evicted first
+
+    def _score(self, candidate):
+        score = candidate[self.key]
+        return -math.inf if score is None or score != score else float(score)
+
+    def _stale(self, entry):
+        held = self._best.get(entry[3])
+        return held is None or held[1] != entry[2]
+
+    def _hold(self, person, score, seq, candidate):
+        self._best[person] = (score, seq, candidate)
+        heapq.heappush(self._heap, (score, -seq, seq, person))
+        if len(self._heap) > 2 * len(self._best) + 16:  # Drop replaced entries
+            self._heap = [e for e in self._heap if not self._stale(e)]
+            heapq.heapify(self._heap)
+
+    def push(self, candidate):
+        self.seen += 1
+        self._seq += 1
+        seq, score = self._seq, self._score(candidate)
+        person = (candidate.get("email"), candidate.get("name"))
+
+        held = self._best.get(person)
+        if held is not None:
+            self.duplicates += 1
+            if score > held[0]:
+                self._hold(person, score, seq, candidate)
+            return
+        if self.k is not None and self.k <= 0:
+            return
+        if self.k is None or len(self._best) < self.k:
+            self._hold(person, score, seq, candidate)
+            return
+
+        while self._stale(self._heap[0]):
+            heapq.heappop(self._heap)
+        if (score, -seq) > self._heap[0][:2]:
+            evicted = heapq.heappop(self._heap)
+            del self._best[evicted[3]]
+            self._hold(person, score, seq, candidate)
+
+    def result(self):
+        """
+        Returns:
+            Tuple[List[dict], int]: The kept candidates (best first) and how
+                many other CVs fell below the cutoff (a person whose CVs were
+                dropped more than once counts more than once)
+        """
+        held = sorted(self._best.values(), key=lambda entry: (-entry[0], entry[1]))
+        kept = [candidate for _, _, candidate in held]
+        return kept, self.seen - self.duplicates - len(kept)
+
+
+def paginate(df, page=1, per_page=50):
+    """
+    Slices one page out of a ranked DataFrame.
+
+    Args:
+        page (int): 1-based page number (clamped to the valid range)
+        per_page (int): Rows per page (at least 1)
+
+    Returns:
+        Tuple[pd.DataFrame, dict]: The rows of the page, and page info
+            {"page", "per_page", "pages", "total"}
+    """
+    per_page = max(1, per_page)
+    total = len(df)
+    pages = max(1, math.ceil(total / per_page))
+    page = min(max(1, page), pages)
+    start = (page - 1) * per_page
+    return df.iloc[start:start + per_page], {
+        "page": page, "per_page": per_page, "pages": pages, "total": total
+    }
@@ -0,0 +1,464 @@
+"""
+results_store.py
+
+Persistent, queryable history of screening results.
+
+Every run's ranked table is saved to SQLite with the run ID, a hash of the
+JD and numeric scores; the runs table holds one row per run. Indexes cover
+reads by run and score, by email, and by skill (one row per candidate
+skill), so results and cross-run questions ("which runs did this email
+pass?") are answered without re-screening. CSV is an export, not the store.
+
+Usage:
+    python results_store.py runs [--limit 20]
+    python results_store.py query [--run latest] [--min-score 40] [--skill python] [--email a@b.c]
+    python results_store.py export filtered.csv [--run latest] [--min-score 40]
+"""
+
+import os
+import csv
+import json
+import time
+import base64
+import sqlite3
+import hashlib
+import logging
+import argparse
+
+from config import RESULTS_DB_PATH
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Stored per candidate, in output order (the ranked table's columns)
+RESULT_FIELDS = (
+    "filename", "name", "email", "skills", "experience", "education",
+    "ata_score", "ml_score", "semantic_score",
+    "matched_count", "total_keywords", "matched_keywords"
+)
+SCORE_FIELDS = ("ata_score", "ml_score", "semantic_score")
+
+# Columns results can be sorted by (rank is the saved ranking); missing
+# values sort as the lowest
+SORT_KEYS = {
+    "rank": "r.rank",
+    "ata_score": "r.ata_score",
+    "ml_score": "COALESCE(r.ml_score, -1e308)",
+    "semantic_score": "COALESCE(r.semantic_score, -1e308)",
+    # experience holds numbers or text such as "N/A"; text counts as missing
+    "experience": "COALESCE(CASE WHEN typeof(r.experience) IN ('integer', 'real') "
+                  "THEN r.experience END, -1e308)",
+    "matched_count": "COALESCE(r.matched_count, -1)",
+    "name": "COALESCE(r.name, '') COLLATE NOCASE",
+}
+
+
+def jd_hash(jd_text=None, jd_keywords=None):
+    """
+    Identifies a JD by its whitespace/case-normalized text, or by its sorted
+    keywords when no text is given.
+    """
+    if jd_text:
+        key = " ".join(jd_text.split()).lower()
+    else:
+        key = "\n".join(sorted(k.lower() for k in jd_keywords or ()))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def encode_cursor(sort, descending, value, rank):
+    """
+    Opaque page cursor: the sort and the position (sort value, rank) of the
+    last row returned.
+    """
+    raw = json.dumps([sort, bool(descending), value, rank], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, sort, descending):
+    """
+    Returns (sort value, rank) from a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: The cursor is malformed or belongs to another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_desc, value, rank = json.loads(raw.decode("utf-8"))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("invalid cursor")
+    if cursor_sort != sort or cursor_desc != bool(descending) or not isinstance(rank, int):
+        raise ValueError("cursor does not match the requested sort")
+    return value, rank
+
+
+def _value(value):
+    """
+    Converts pandas/numpy scalars and NaN to plain SQLite values.
+    """
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+class ResultsStore:
+    """
+    SQLite-backed screening results, one row per ranked candidate per run.
+    """
+
+    def __init__(self, path=RESULTS_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id           TEXT PRIMARY KEY,
+                created          REAL NOT NULL,
+                jd_hash          TEXT,
+                jd_keywords      TEXT,
+                ata_threshold    REAL,
+                total_candidates INTEGER,
+                below_cutoff     INTEGER,
+                rows             INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                run_id           TEXT NOT NULL,
+                rank             INTEGER NOT NULL,
+                filename         TEXT,
+                name             TEXT,
+                email            TEXT,
+                skills           TEXT,
+                experience,
+                education        TEXT,
+                ata_score        REAL,
+                ml_score         REAL,
+                semantic_score   REAL,
+                matched_count    INTEGER,
+                total_keywords   INTEGER,
+                matched_keywords TEXT,
+                PRIMARY KEY (run_id, rank)
+            );
+            CREATE TABLE IF NOT EXISTS result_skills (
+                skill  TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                rank   INTEGER NOT NULL,
+                PRIMARY KEY (skill, run_id, rank)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+            CREATE INDEX IF NOT EXISTS runs_jd_hash ON runs (jd_hash);
+            CREATE INDEX IF NOT EXISTS results_score ON results (run_id, ata_score);
+            CREATE INDEX IF NOT EXISTS results_email ON results (email COLLATE NOCASE);
+        """)
+
+    def save_run(self, df, run_id, jd_text=None, jd_keywords=None, ata_threshold=None):
+        """
+        Saves a ranked results table as one run (replacing a run with the same ID).
+
+        Args:
+            df (pd.DataFrame): Ranked table (RESULT_FIELDS columns); its
+                attrs "total_candidates"/"below_cutoff" are kept when set
+            run_id (str): Run ID, e.g. the metrics run ID
+            jd_text (Optional[str]): JD the run screened against (hashed)
+            jd_keywords (Optional[Iterable[str]]): Its keywords
+
+        Returns:
+            str: The run ID
+        """
+        keywords = sorted(jd_keywords) if jd_keywords else []
+        columns = [field for field in RESULT_FIELDS if field in df.columns]
+        rows = []
+        skills = []
+        for rank, record in enumerate(df[columns].itertuples(index=False, name=None), start=1):
+            values = dict(zip(columns, (_value(v) for v in record)))
+            rows.append([run_id, rank] + [values.get(field) for field in RESULT_FIELDS])
+            for skill in str(values.get("skills") or "").split(","):
+                if skill.strip():
+                    skills.append((skill.strip().lower(), run_id, rank))
+
+        with self.conn:
+            self.delete_run(run_id, commit=False)
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, time.time(), jd_hash(jd_text, keywords), json.dumps(keywords),
+                 ata_threshold, _value(df.attrs.get("total_candidates", len(df))),
+                 _value(df.attrs.get("below_cutoff", 0)), len(rows))
+            )
+            self.conn.executemany(
+                f"INSERT INTO results (run_id, rank, {', '.join(RESULT_FIELDS)}) "
+                f"VALUES ({', '.join('?' for _ in range(len(RESULT_FIELDS) + 2))})",
+                rows
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO result_skills VALUES (?, ?, ?)", skills)
+        logger.info(f"🗂️ Saved {len(rows)} results as run {run_id}")
+        return run_id
+
+    def delete_run(self, run_id, commit=True):
+        for table in ("result_skills", "results", "runs"):
+            self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        if commit:
+            self.conn.commit()
+
+    def runs(self, limit=20, jd=None):
+        """
+        Returns the newest runs first, optionally only those for one JD hash.
+
+        Returns:
+            List[dict]: One dict per run (jd_keywords decoded)
+        """
+        sql = "SELECT * FROM runs"
+        params = []
+        if jd:
+            sql += " WHERE jd_hash = ?"
+            params.append(jd)
+        sql += " ORDER BY created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._run_dicts(self.conn.execute(sql, params))
+
+    def _run_dicts(self, cursor):
+        names = [d[0] for d in cursor.description]
+        runs = [dict(zip(names, row)) for row in cursor]
+        for run in runs:
+            run["jd_keywords"] = json.loads(run["jd_keywords"] or "[]")
+        return runs
+
+    def get_run(self, run_id):
+        """
+        Returns the run's dict (see runs) or None; "latest" is the newest run.
+        """
+        runs = self._run_dicts(self.conn.execute("SELECT * FROM runs WHERE run_id = ?",
+                                                 (self.resolve(run_id),)))
+        return runs[0] if runs else None
+
+    def resolve(self, run_id):
+        """
+        Maps "latest" to the newest run ID; other IDs are returned as is.
+        """
+        if run_id != "latest":
+            return run_id
+        row = self.conn.execute("SELECT run_id FROM runs ORDER BY created DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def _where(self, run_id=None, min_score=None, max_score=None, skill=None, email=None,
+               score="ata_score"):
+        if score not in SCORE_FIELDS:
+            raise ValueError(f"score must be one of {SCORE_FIELDS}")
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("r.run_id = ?")
+            params.append(self.resolve(run_id))
+        if min_score is not None:
+            clauses.append(f"r.{score} >= ?")
+            params.append(float(min_score))
+        if max_score is not None:
+            clauses.append(f"r.{score} <= ?")
+            params.append(float(max_score))
+        if skill:
+            clauses.append("EXISTS (SELECT 1 FROM result_skills s WHERE s.skill = ? "
+                           "AND s.run_id = r.run_id AND s.rank = r.rank)")
+            params.append(skill.strip().lower())
+        if email:
+            clauses.append("r.email = ? COLLATE NOCASE")
+            params.append(email.strip())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_rows(self, limit=None, offset=0, **filters):
+        """
+        Yields matching results as (column names, row tuple), newest run
+        first, then by rank.
+
+        Args:
+            **filters: run_id ("latest" allowed), min_score, max_score,
+                skill, email, and score (the column min/max_score apply to)
+        """
+        where, params = self._where(**filters)
+        sql = (f"SELECT r.run_id, r.rank, {', '.join('r.' + f for f in RESULT_FIELDS)} "
+               f"FROM results r JOIN runs USING (run_id){where} "
+               f"ORDER BY runs.created DESC, r.rank")
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        cursor = self.conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            yield names, row
+
+    def page(self, run_id, sort="rank", descending=None, cursor=None, limit=50, **filters):
+        """
+        Returns one page of a run's results in the given order, using keyset
+        (cursor) pagination so each page costs the same however deep it is.
+
+        Args:
+            run_id (str): Run ID or "latest"
+            sort (str): A SORT_KEYS column; ties keep the saved ranking
+            descending (Optional[bool]): Sort direction; None means ascending
+                for rank/name and descending for scores
+            cursor (Optional[str]): next_cursor of the previous page
+            limit (int): Rows per page
+            **filters: min_score, max_score, score, skill, email (see iter_rows)
+
+        Returns:
+            Tuple[List[dict], Optional[str]]: The rows (with `rank`) and the
+                cursor of the next page, None on the last page
+
+        Raises:
+            ValueError: Unknown sort column or bad cursor
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {tuple(SORT_KEYS)}")
+        if descending is None:
+            descending = sort not in ("rank", "name")
+        key = SORT_KEYS[sort]
+        where, params = self._where(run_id=run_id, **filters)
+
+        after = ""
+        if cursor:
+            value, rank = decode_cursor(cursor, sort, descending)
+            if sort == "rank":
+                after = f"r.rank {'<' if descending else '>'} ?"
+                params.append(rank)
+            else:
+                after = f"({key} {'<' if descending else '>'} ? OR ({key} = ? AND r.rank > ?))"
+                params += [value, value, rank]
+            where = f"{where} AND {after}" if where else f" WHERE {after}"
+
+        direction = "DESC" if descending else "ASC"
+        order = f"r.rank {direction}" if sort == "rank" else f"{key} {direction}, r.rank"
+        cursor_rows = self.conn.execute(
+            f"SELECT {key} AS sort_value, r.rank, {', '.join('r.' + f for f in RESULT_FIELDS)} "
+            f"FROM results r{where} ORDER BY {order} LIMIT ?",
+            params + [limit + 1]
+        )
+        names = [d[0] for d in cursor_rows.description]
+        rows = [dict(zip(names, row)) for row in cursor_rows]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, descending, rows[-1]["sort_value"], rows[-1]["rank"])
+        for row in rows:
+            del row["sort_value"]
+        return rows, next_cursor
+
+    def query(self, limit=None, offset=0, **filters):
+        """
+        Returns matching results as a DataFrame with `run_id` and `rank`
+        columns first (see iter_rows for the filters).
+        """
+        import pandas as pd
+
+        names = ["run_id", "rank", *RESULT_FIELDS]
+        rows = [row for _, row in self.iter_rows(limit=limit, offset=offset, **filters)]
+        return pd.DataFrame.from_records(rows, columns=names)
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results r{where}", params).fetchone()[0]
+
+    def load_run(self, run_id):
+        """
+        Returns a saved run as the ranked table it was saved from (attrs
+        restored), or None if there is no such run.
+        """
+        run = self.get_run(run_id)
+        if run is None:
+            return None
+        df = self.query(run_id=run["run_id"]).drop(columns=["run_id", "rank"])
+        df.attrs["total_candidates"] = run["total_candidates"]
+        df.attrs["below_cutoff"] = run["below_cutoff"]
+        df.attrs["run_id"] = run["run_id"]
+        return df
+
+    def export_csv(self, path, **filters):
+        """
+        Writes matching results to a CSV file (see iter_rows for the filters).
+
+        Returns:
+            int: Rows written
+        """
+        written = 0
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            for names, row in self.iter_rows(**filters):
+                if not written:
+                    writer.writerow(names)
+                writer.writerow(row)
+                written += 1
+            if not written:
+                writer.writerow(["run_id", "rank", *RESULT_FIELDS])
+        return written
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_results(df, run_id, jd_text=None, jd_keywords=None, ata_threshold=None, path=RESULTS_DB_PATH):
+    """
+    Saves a run to the store at path; logs instead of raising on failure.
+
+    Returns:
+        Optional[str]: The run ID, or None if the store is disabled or failed
+    """
+    if not path:
+        return None
+    try:
+        with ResultsStore(path) as store:
+            return store.save_run(df, run_id, jd_text=jd_text, jd_keywords=jd_keywords,
+                                  ata_threshold=ata_threshold)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not save results of run {run_id} - {e}")
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screening results history")
+    sub = parser.add_subparsers(dest="command", required=True)
+    runs_cmd = sub.add_parser("runs", help="List saved runs, newest first")
+    runs_cmd.add_argument("--limit", type=int, default=20)
+    for name, help_text in (("query", "Show matching results"), ("export", "Write matching results to CSV")):
+        cmd = sub.add_parser(name, help=help_text)
+        if name == "export":
+            cmd.add_argument("path", help="CSV file to write")
+        cmd.add_argument("--run", default="latest", help='Run ID, "latest" (default) or "all"')
+        cmd.add_argument("--min-score", type=float)
+        cmd.add_argument("--max-score", type=float)
+        cmd.add_argument("--score", default="ata_score", choices=SCORE_FIELDS)
+        cmd.add_argument("--skill")
+        cmd.add_argument("--email")
+        if name == "query":
+            cmd.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with ResultsStore() as store:
+        if args.command == "runs":
+            for run in store.runs(limit=args.limit):
+                created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["created"]))
+                print(f"{run['run_id']:<36} {created}  {run['rows']:>6} rows  "
+                      f"JD {run['jd_hash'][:12]}  {', '.join(run['jd_keywords'][:8])}")
+            return
+
+        filters = dict(run_id=None if args.run == "all" else args.run, min_score=args.min_score,
+                       max_score=args.max_score, score=args.score, skill=args.skill, email=args.email)
+        if args.command == "query":
+            start = time.perf_counter()
+            df = store.query(limit=args.limit, **filters)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(df[["run_id", "rank", "name", "email", "ata_score", "ml_score"]].to_string(index=False))
+            print(f"🔍 {len(df)} row(s) of {store.count(**filters)} in {elapsed_ms:.1f} ms")
+        elif args.command == "export":
+            print(f"💾 Wrote {store.export_csv(args.path, **filters)} row(s) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import sys
+import time
+import builtins
+from contextlib import contextmanager
+
+# Modules whose presence in sys.modules means a heavy dependency was loaded
+HEAVY_MODULES = ("spacy", "keybert", "sentence_transformers", "torch",
+                 "pandas", "sklearn", "pdfminer", "docx", "fitz")
+
+
+class StartupProfiler:
+    """
+    Records first-time import durations and named stage timings for
+    `main.py --startup-profile`.
+
+    Imports are timed by wrapping builtins.__import__; each module gets its
+    cumulative time and its self time (minus nested first-time imports).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.imports = {}       # name -> (cumulative seconds, self seconds)
+        self.stages = []        # [(name, seconds)]
+        self._stack = []
+        self._original_import = builtins.__import__
+
+    def install(self):
+        self.enabled = True
+        builtins.__import__ = self._timed_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports[name] = (elapsed, elapsed - nested)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.stages.append((name, time.perf_counter() - start))
+
+    def report(self, top=15):
+        """
+        Returns the profile as printable text.
+        """
+        total = time.perf_counter() - self.started
+        lines = [f"⏱️ Startup profile: {total:.3f}s since main.py started"]
+
+        lines.append("   Stages:")
+        for name, seconds in self.stages:
+            lines.append(f"     {name:<20} {seconds:8.3f}s")
+
+        lines.append("   Slowest first-time imports (cumulative / self):")
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, own) in ranked[:top]:
+            lines.append(f"     {name:<30} {cumulative:8.3f}s {own:8.3f}s")
+
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        lines.append(f"   Heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+        return "\n".join(lines)
+
+
+PROFILER = StartupProfiler()
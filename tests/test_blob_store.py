@@ -0,0 +1,75 @@
+import os
+
+from blob_store import BlobStore
+
+
+def _cv(folder, name, content):
+    path = folder / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_gc_keeps_linked_and_manifest_blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    incoming = tmp_path / "CVs"
+    view = tmp_path / "filtered"
+    incoming.mkdir()
+    view.mkdir()
+
+    linked = store.place(_cv(incoming, "a.pdf", b"linked"), str(view))
+    listed = store.put(_cv(incoming, "b.pdf", b"listed"))
+    orphan = store.put(_cv(incoming, "c.pdf", b"orphan!"))
+    store.write_manifest("run-1", {"filtered": {"b.pdf": listed}})
+
+    assert os.stat(store.blob_path(linked)).st_nlink == 2
+    assert os.stat(store.blob_path(listed)).st_nlink == 1
+
+    result = store.gc(keep_manifests=None)
+    assert result == {"manifests_removed": 0, "blobs_removed": 1, "bytes_freed": len(b"orphan!")}
+    assert os.path.exists(store.blob_path(linked))
+    assert os.path.exists(store.blob_path(listed))
+    assert not os.path.exists(store.blob_path(orphan))
+
+
+def test_gc_frees_blob_once_view_link_is_gone(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    incoming = tmp_path / "CVs"
+    view = tmp_path / "filtered"
+    incoming.mkdir()
+    view.mkdir()
+    sha256 = store.place(_cv(incoming, "a.pdf", b"cv"), str(view))
+
+    assert store.gc()["blobs_removed"] == 0
+    os.remove(view / "a.pdf")
+    assert os.stat(store.blob_path(sha256)).st_nlink == 1
+    assert store.gc()["blobs_removed"] == 1
+    assert store.stats()["blobs"] == 0
+
+
+def test_gc_drops_old_manifests_and_their_blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    incoming = tmp_path / "CVs"
+    incoming.mkdir()
+    old = store.put(_cv(incoming, "old.pdf", b"old"))
+    new = store.put(_cv(incoming, "new.pdf", b"new"))
+    store.write_manifest("run-20250101-000000", {"filtered": {"old.pdf": old}})
+    store.write_manifest("run-20250102-000000", {"filtered": {"new.pdf": new}})
+
+    result = store.gc(keep_manifests=1)
+    assert result["manifests_removed"] == 1
+    assert result["blobs_removed"] == 1
+    assert [os.path.basename(p) for p in store.manifests()] == ["run-20250102-000000.json"]
+    assert os.path.exists(store.blob_path(new))
+    assert not os.path.exists(store.blob_path(old))
+
+
+def test_gc_keeps_every_blob_when_a_manifest_is_unreadable(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    incoming = tmp_path / "CVs"
+    incoming.mkdir()
+    sha256 = store.put(_cv(incoming, "a.pdf", b"cv"))
+    with open(os.path.join(store.manifests_dir, "run-broken.json"), "w") as fh:
+        fh.write("{not json")
+
+    assert store.gc(keep_manifests=None)["blobs_removed"] == 0
+    assert os.path.exists(store.blob_path(sha256))
@@ -0,0 +1,72 @@
+import time
+
+from extraction_cache import ExtractionCache
+
+
+def _fill(cache, count, size=10):
+    for i in range(count):
+        cache.put(f"sha{i}", {"email": "x" * size, "text": f"cv {i}"})
+        # Distinct access times, oldest first
+        cache.conn.execute("UPDATE extractions SET accessed = ? WHERE sha256 = ?", (1000.0 + i, f"sha{i}"))
+    cache.conn.commit()
+
+
+def _keys(cache):
+    return sorted(row[0] for row in cache.conn.execute("SELECT sha256 FROM extractions"))
+
+
+def test_evict_by_count_keeps_most_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), "v1", max_entries=3)
+    _fill(cache, 5)
+    cache.conn.execute("UPDATE extractions SET accessed = 5000 WHERE sha256 = 'sha0'")
+
+    assert cache.evict() == 2
+    assert _keys(cache) == ["sha0", "sha3", "sha4"]
+    cache.close()
+
+
+def test_get_refreshes_access_time(tmp_path):
+    cache = ExtractionCache(str(tmp_path), "v1", max_entries=1)
+    _fill(cache, 2)
+    assert cache.get("sha0")["text"] == "cv 0"
+
+    cache.evict()
+    assert _keys(cache) == ["sha0"]
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.close()
+
+
+def test_evict_by_age(tmp_path):
+    cache = ExtractionCache(str(tmp_path), "v1", max_age_days=30)
+    _fill(cache, 2)
+    cache.conn.execute("UPDATE extractions SET accessed = ? WHERE sha256 = 'sha1'", (time.time(),))
+
+    assert cache.evict() == 1
+    assert _keys(cache) == ["sha1"]
+    cache.close()
+
+
+def test_evict_by_bytes_drops_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), "v1")
+    _fill(cache, 4, size=100)
+    size = cache.conn.execute("SELECT size FROM extractions WHERE sha256 = 'sha0'").fetchone()[0]
+    cache.max_bytes = 2 * size
+
+    assert cache.evict() == 2
+    assert _keys(cache) == ["sha2", "sha3"]
+    cache.close()
+
+
+def test_close_evicts_and_new_version_drops_old_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path), "v1", max_entries=2)
+    _fill(cache, 3)
+    cache.close()
+
+    reopened = ExtractionCache(str(tmp_path), "v1")
+    assert len(_keys(reopened)) == 2
+    reopened.close()
+
+    upgraded = ExtractionCache(str(tmp_path), "v2")
+    assert _keys(upgraded) == []
+    assert upgraded.get("sha2") is None
+    upgraded.close()
@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from ranking import StreamingTopK, paginate, select_top_candidates, top_k_indices
+
+
+def _reference_top_k(scores, k):
+    # Full stable sort, NaN last: what top_k_indices must agree with
+    order = sorted(range(len(scores)),
+                   key=lambda i: (scores[i] != scores[i], -scores[i] if scores[i] == scores[i] else 0))
+    return order if k is None else order[:max(k, 0)]
+
+
+@pytest.mark.parametrize("k", [None, 0, 1, 3, 10, 50, 200])
+def test_top_k_indices_matches_full_sort(k):
+    rng = random.Random(k or 0)
+    for _ in range(20):
+        # Few distinct values, so ties straddle the cutoff
+        scores = [rng.choice([0.0, 12.5, 25.0, 50.0, 75.0, float("nan")]) for _ in range(rng.randint(0, 120))]
+        assert list(top_k_indices(scores, k)) == _reference_top_k(scores, k)
+
+
+def _candidates(rng, count, people):
+    return [
+        {"email": f"p{person}@example.com", "name": f"P{person}",
+         "ata_score": rng.choice([10.0, 20.0, 30.0, 40.0]), "i": i}
+        for i, person in enumerate(rng.randrange(people) for _ in range(count))
+    ]
+
+
+@pytest.mark.parametrize("k", [None, 0, 1, 5, 25, 1000])
+def test_streaming_top_k_equals_select_top_candidates(k):
+    rng = random.Random(k or 7)
+    for _ in range(20):
+        candidates = _candidates(rng, rng.randint(0, 300), people=rng.randint(1, 80))
+        expected, expected_below = select_top_candidates(candidates, k)
+
+        top = StreamingTopK(k)
+        for c in candidates:
+            top.push(c)
+        kept, below = top.result()
+
+        assert [c["i"] for c in kept] == [c["i"] for c in expected]
+        if len({c["email"] for c in candidates}) == len(candidates):
+            # Streaming counts CVs below the cutoff; they agree when each
+            # person has one CV
+            assert below == expected_below
+
+
+def test_streaming_top_k_equals_select_top_candidates_for_distinct_people():
+    rng = random.Random(3)
+    candidates = _candidates(rng, 200, people=10**9)
+    for k in (None, 0, 1, 10, 500):
+        top = StreamingTopK(k)
+        for c in candidates:
+            top.push(c)
+        kept, below = top.result()
+        assert (kept, below) == select_top_candidates(candidates, k)
+
+
+def test_streaming_top_k_counts_below_cutoff_without_duplicates():
+    candidates = [{"email": f"{i}@x", "name": str(i), "ata_score": float(i)} for i in range(10)]
+    top = StreamingTopK(3)
+    for c in candidates:
+        top.push(c)
+    kept, below = top.result()
+    assert [c["ata_score"] for c in kept] == [9.0, 8.0, 7.0]
+    assert below == 7
+    assert len(top._best) == 3
+
+
+def test_streaming_top_k_ranks_missing_scores_last():
+    top = StreamingTopK(2)
+    for score in (None, 5.0, float("nan"), 1.0):
+        top.push({"email": str(score), "name": "", "ata_score": score})
+    assert [c["ata_score"] for c in top.result()[0]] == [5.0, 1.0]
+
+
+def test_paginate_clamps_page_and_per_page():
+    import pandas as pd
+
+    df = pd.DataFrame({"n": np.arange(7)})
+    rows, info = paginate(df, page=9, per_page=3)
+    assert list(rows["n"]) == [6]
+    assert info == {"page": 3, "per_page": 3, "pages": 3, "total": 7}
+    assert paginate(df, page=1, per_page=0)[1]["per_page"] == 1
@@ -0,0 +1,99 @@
+import random
+
+import pandas as pd
+import pytest
+
+from results_store import ResultsStore, SORT_KEYS, encode_cursor
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = random.Random(1)
+    rows = [{
+        "filename": f"cv{i}.pdf",
+        "name": rng.choice(["amy", "Bob", "cat", None]),
+        "email": f"a{i}@example.com",
+        "skills": rng.choice(["Python, SQL", "Java", "python"]),
+        "experience": rng.choice([0, 1, 2, None, "N/A"]),
+        "education": "",
+        "ata_score": rng.choice([10.0, 20.0, 30.0, 40.5]),
+        "ml_score": rng.choice([None, 10.0, 50.0]),
+        "semantic_score": None,
+        "matched_count": rng.randint(0, 3),
+        "total_keywords": 5,
+        "matched_keywords": "",
+    } for i in range(137)]
+    with ResultsStore(str(tmp_path / "results.sqlite3")) as store:
+        store.save_run(pd.DataFrame(rows), "run-1")
+        store.save_run(pd.DataFrame(rows[:5]), "run-2")
+        yield store
+
+
+def _walk(store, limit=17, **kwargs):
+    rows, cursor, pages = [], None, 0
+    while True:
+        page, cursor = store.page("run-1", cursor=cursor, limit=limit, **kwargs)
+        rows += page
+        pages += 1
+        assert len(page) <= limit
+        if cursor is None:
+            return rows, pages
+
+
+def _sort_value(row, sort):
+    value = row[sort]
+    if sort == "name":
+        return (value or "").lower()
+    if not isinstance(value, (int, float)):
+        return float("-inf")  # Missing and text values sort as lowest
+    return value
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_KEYS))
+@pytest.mark.parametrize("descending", [None, True, False])
+def test_cursor_pages_cover_run_in_order(store, sort, descending):
+    rows, pages = _walk(store, sort=sort, descending=descending)
+
+    assert sorted(r["rank"] for r in rows) == list(range(1, 138))
+    assert pages == -(-137 // 17)
+    if descending is None:
+        descending = sort not in ("rank", "name")
+    if sort == "rank":
+        expected = sorted(rows, key=lambda r: r["rank"], reverse=descending)
+    else:
+        # Ties keep the saved ranking in either direction
+        by_rank = sorted(rows, key=lambda r: r["rank"])
+        expected = sorted(by_rank, key=lambda r: _sort_value(r, sort), reverse=descending)
+    assert [r["rank"] for r in rows] == [r["rank"] for r in expected]
+
+
+def test_cursor_pages_apply_filters(store):
+    rows, _ = _walk(store, sort="ata_score", min_score=25, skill="python")
+
+    assert rows
+    assert len(rows) == store.count(run_id="run-1", min_score=25, skill="python")
+    assert all(r["ata_score"] >= 25 and "python" in r["skills"].lower() for r in rows)
+
+
+def test_last_page_has_no_cursor(store):
+    rows, cursor = store.page("run-2", limit=5)
+    assert len(rows) == 5 and cursor is None
+    rows, cursor = store.page("run-2", limit=4)
+    assert len(rows) == 4 and cursor is not None
+    rows, cursor = store.page("run-2", cursor=cursor, limit=4)
+    assert [r["rank"] for r in rows] == [5] and cursor is None
+
+
+def test_bad_cursors_are_rejected(store):
+    _, cursor = store.page("run-1", sort="ata_score", limit=3)
+
+    with pytest.raises(ValueError):
+        store.page("run-1", sort="ata_score", cursor="not a cursor")
+    with pytest.raises(ValueError):
+        store.page("run-1", sort="name", cursor=cursor)  # Cursor of another ordering
+    with pytest.raises(ValueError):
+        store.page("run-1", sort="ata_score", descending=False, cursor=cursor)
+    with pytest.raises(ValueError):
+        store.page("run-1", sort="bogus")
+    # A well-formed cursor for the same ordering is accepted
+    assert store.page("run-1", sort="ata_score", cursor=encode_cursor("ata_score", True, 20.0, 3))[0]
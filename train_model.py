@@ -10,6 +10,7 @@ Output:
 """
 
 import os
+import time
 import joblib
 import logging
 import pandas as pd
@@ -23,7 +24,6 @@ from config import CV_FOLDER
 
 # === Setup logging ===
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # === Parameters ===
 ATA_THRESHOLD = 40.0
@@ -68,6 +68,15 @@ def load_cvs_and_labels():
     return texts, labels
 
 
+def _atomic_dump(obj, path):
+    """
+    Dumps an artifact next to its destination, then renames it into place.
+    """
+    tmp_path = path + ".tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
 def train_model():
     """
     Trains the logistic regression model and saves the artifacts.
@@ -98,9 +107,16 @@ def train_model():
     logger.info("📊 Classification Report:\n%s", report)
 
     # === Save Model & Vectorizer ===
-    joblib.dump(model, os.path.join(MODEL_DIR, "ml_model.pkl"))
-    joblib.dump(vectorizer, os.path.join(MODEL_DIR, "tfidf_vectorizer.pkl"))
-    logger.info("✅ Model and vectorizer saved to 'models/' folder.")
+    # Written to temp files and renamed so running apps never see a partial
+    # pickle; VERSION goes last and triggers the reload in ml_model.
+    version = time.strftime("%Y%m%d-%H%M%S")
+    _atomic_dump(model, os.path.join(MODEL_DIR, "ml_model.pkl"))
+    _atomic_dump(vectorizer, os.path.join(MODEL_DIR, "tfidf_vectorizer.pkl"))
+    version_path = os.path.join(MODEL_DIR, "VERSION")
+    with open(version_path + ".tmp", "w", encoding="utf-8") as fh:
+        fh.write(version)
+    os.replace(version_path + ".tmp", version_path)
+    logger.info(f"✅ Model and vectorizer saved to 'models/' folder (version {version}).")
 
 
 if __name__ == "__main__":
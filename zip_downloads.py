@@ -0,0 +1,123 @@
+import io
+import os
+import glob
+import uuid
+import hashlib
+import logging
+import zipfile
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Formats that are already compressed: deflating them again only costs CPU
+STORED_EXTENSIONS = {'.pdf', '.docx', '.zip', '.png', '.jpg', '.jpeg'}
+CHUNK_SIZE = 64 * 1024
+
+
+def list_folder_files(folder):
+    """
+    Returns the sorted names of regular files in the folder (empty if missing).
+    """
+    if not os.path.isdir(folder):
+        return []
+    return sorted(f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f)))
+
+
+def folder_etag(folder, filenames):
+    """
+    Builds an ETag from the names, sizes and modification times of the files.
+    """
+    digest = hashlib.sha1()
+    for filename in filenames:
+        stat = os.stat(os.path.join(folder, filename))
+        digest.update(f"{filename}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink that hands out what ZipFile wrote so far.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(folder, filenames):
+    """
+    Yields a ZIP archive of the files chunk by chunk, as it is written.
+
+    PDF/DOCX and other compressed formats are stored as-is; anything else
+    is deflated.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        for filename in filenames:
+            filepath = os.path.join(folder, filename)
+            zinfo = zipfile.ZipInfo.from_file(filepath, arcname=filename)
+            if os.path.splitext(filename)[1].lower() in STORED_EXTENSIONS:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+
+            with open(filepath, 'rb') as src, zip_file.open(zinfo, 'w') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dst.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    yield buffer.drain()  # Central directory
+
+
+def cached_archive_path(cache_dir, label, etag):
+    return os.path.join(cache_dir, f"{label}-{etag}.zip")
+
+
+def iter_zip_with_cache(folder, filenames, cache_dir, label, etag):
+    """
+    Streams the archive while also writing it to the download cache.
+
+    The cached copy only becomes visible once the stream completes; older
+    archives for the same label are removed at that point. An aborted
+    download leaves nothing behind.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    final_path = cached_archive_path(cache_dir, label, etag)
+    tmp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+
+    completed = False
+    try:
+        with open(tmp_path, 'wb') as cache_file:
+            for chunk in iter_zip(folder, filenames):
+                cache_file.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        if completed:
+            os.replace(tmp_path, final_path)
+            for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(label)}-*.zip")):
+                if stale != final_path:
+                    os.remove(stale)
+            logger.info(f"📦 Cached download archive: {final_path}")
+        elif os.path.exists(tmp_path):
+            os.remove(tmp_path)